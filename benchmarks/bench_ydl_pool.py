@@ -0,0 +1,69 @@
+"""Compare building a YoutubeDL per item with leasing one from YoutubeDLPool.
+
+Usage:
+    python benchmarks/bench_ydl_pool.py [--items 50] [--url URL]
+
+Without --url only the per-item setup cost is measured (no network).
+With --url each item also runs extract_info(download=False) on that URL,
+which includes the HTTP opener and cookie setup a fresh instance pays for.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yt_dlp
+from services.ydl_pool import YoutubeDLPool
+
+BASE_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'nocheckcertificate': True,
+    'socket_timeout': 30,
+    'format': 'bestaudio/best',
+}
+
+
+def run_fresh(items, url):
+    """One YoutubeDL per item, as DownloadService used to do."""
+    start = time.perf_counter()
+    for i in range(items):
+        with yt_dlp.YoutubeDL(dict(BASE_OPTS, outtmpl=f'item_{i}.%(ext)s')) as ydl:
+            if url:
+                ydl.extract_info(url, download=False)
+    return time.perf_counter() - start
+
+
+def run_pooled(items, url):
+    """One warm YoutubeDL leased for every item."""
+    pool = YoutubeDLPool()
+    start = time.perf_counter()
+    for i in range(items):
+        with pool.lease(BASE_OPTS) as downloader:
+            if url:
+                downloader.extract_info(url, outtmpl=f'item_{i}.%(ext)s', download=False)
+    elapsed = time.perf_counter() - start
+    pool.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=50, help="number of simulated playlist items")
+    parser.add_argument('--url', default=None, help="optional video URL to extract for every item")
+    args = parser.parse_args()
+
+    fresh = run_fresh(args.items, args.url)
+    pooled = run_pooled(args.items, args.url)
+
+    print(f"items:  {args.items}")
+    print(f"fresh:  {fresh:.3f}s total, {fresh / args.items * 1000:.1f} ms/item")
+    print(f"pooled: {pooled:.3f}s total, {pooled / args.items * 1000:.1f} ms/item")
+    if pooled:
+        print(f"speedup: {fresh / pooled:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
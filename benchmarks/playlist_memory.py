@@ -0,0 +1,106 @@
+"""Memory footprint of a large playlist preview, per entry representation.
+
+Builds synthetic yt-dlp info dicts (with realistic format tables) and
+measures with tracemalloc what stays allocated once the list is built:
+
+- raw:     info dicts kept next to per-video dicts (the old playlist_info['entries'])
+- dicts:   per-video dicts only, info dropped after parsing
+- entries: PlaylistEntry records, info dropped after parsing
+
+    python benchmarks/playlist_memory.py --entries 5000
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.playlist_entry import PlaylistEntry  # noqa: E402
+from services.preflight import DiskPreflight  # noqa: E402
+
+FORMATS_PER_VIDEO = 24
+
+
+def make_info(i):
+    """A full info dict shaped like yt-dlp's for one video."""
+    video_id = f"v{i:010d}"
+    formats = []
+    for n in range(FORMATS_PER_VIDEO):
+        height = (144, 240, 360, 480, 720, 1080, 1440, 2160)[n % 8]
+        audio_only = n >= 20
+        formats.append({
+            'format_id': str(100 + n),
+            'url': f"https://rr{n}---sn-example.googlevideo.com/videoplayback?id={video_id}&itag={100 + n}"
+                   f"&expire=1700000000&sig={'x' * 120}",
+            'ext': 'm4a' if audio_only else 'mp4',
+            'vcodec': 'none' if audio_only else 'avc1.640028',
+            'acodec': 'mp4a.40.2' if audio_only else 'none',
+            'height': None if audio_only else height,
+            'width': None if audio_only else height * 16 // 9,
+            'tbr': 128.0 if audio_only else height * 3.5,
+            'abr': 128.0 if audio_only else None,
+            'filesize': (2_000_000 if audio_only else height * 40_000) + i,
+            'http_headers': {'User-Agent': 'Mozilla/5.0', 'Accept': '*/*', 'Accept-Language': 'en-us'},
+            'format_note': f"{height}p",
+        })
+    return {
+        'id': video_id,
+        'title': f"Video number {i} with a reasonably long title",
+        'duration': 240 + i % 600,
+        'view_count': 1000 * i,
+        'uploader': "Some Channel",
+        'upload_date': "20240101",
+        'webpage_url': f"https://www.youtube.com/watch?v={video_id}",
+        'thumbnail': f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+        'description': "Lorem ipsum dolor sit amet. " * 20,
+        'tags': [f"tag{t}" for t in range(15)],
+        'formats': formats,
+    }
+
+
+def build_entry(info, index, preflight):
+    return PlaylistEntry(
+        id=info['id'], title=info['title'], duration=info['duration'], view_count=info['view_count'],
+        uploader=info['uploader'], upload_date=info['upload_date'], url=info['webpage_url'],
+        thumbnail=info['thumbnail'], size_estimates=preflight.estimate_all(info), details=True,
+        playlist_index=index,
+    )
+
+
+def build(mode, count):
+    preflight = DiskPreflight()
+    if mode == 'raw':
+        infos = [make_info(i) for i in range(count)]
+        return infos, [build_entry(info, i + 1, preflight).to_dict() for i, info in enumerate(infos)]
+    if mode == 'dicts':
+        return [build_entry(make_info(i), i + 1, preflight).to_dict() for i in range(count)]
+    return [build_entry(make_info(i), i + 1, preflight) for i in range(count)]
+
+
+def measure(mode, count):
+    """Return (retained_bytes, peak_bytes) for building one playlist in the given representation."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = build(mode, count)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained - baseline, peak - baseline
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=5000, help="playlist size (default 5000)")
+    args = parser.parse_args(argv)
+
+    print(f"{args.entries} entries, {FORMATS_PER_VIDEO} formats each")
+    print(f"{'mode':<8} {'retained':>12} {'per entry':>10} {'peak':>12}")
+    for mode in ('raw', 'dicts', 'entries'):
+        retained, peak = measure(mode, args.entries)
+        print(f"{mode:<8} {retained / 1024 ** 2:>9.1f} MB {retained / args.entries:>8.0f} B "
+              f"{peak / 1024 ** 2:>9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+"""Headless command line entry point; runs the download services without any GUI modules."""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from services.download_service import DownloadService
+from services.playlist_info_service import PlaylistInfoService
+from services.video_info_service import VideoInfoService
+from services.bandwidth_limiter import BandwidthLimiter
+from services.job_journal import JobJournal
+from utils.app_paths import AppPaths
+from utils.progress_aggregator import ProgressAggregator
+from utils.validators import URLValidator
+from utils.ssl_setup import setup_ssl
+
+EXIT_OK = 0
+EXIT_FAILED = 1  # At least one URL failed
+EXIT_USAGE = 2  # Bad arguments (argparse uses the same code)
+EXIT_CANCELLED = 130  # Interrupted with Ctrl+C
+
+VIDEO_QUALITIES = {
+    "2160p": "2160p (4K)",
+    "1440p": "1440p (2K)",
+    "1080p": "1080p",
+    "720p": "720p",
+}
+AUDIO_FORMATS = {
+    "mp3-128": "MP3 (128kbps)",
+    "mp3-320": "MP3 (320kbps)",
+    "wav": "WAV",
+    "m4a": "M4A",
+}
+
+
+class ConsoleReporter:
+    """Writes progress either as JSON lines or as plain status lines."""
+
+    MIN_INTERVAL = 0.5  # Seconds between progress lines per key
+
+    def __init__(self, stream, json_lines=False):
+        self.stream = stream
+        self.json_lines = json_lines
+        self._last_emit = {}
+        self._lock = threading.Lock()
+        self.url = None
+
+    def event(self, event, **fields):
+        """Write one event immediately."""
+        with self._lock:
+            if self.json_lines:
+                record = {'event': event, 'time': round(time.time(), 3), 'url': self.url}
+                record.update(fields)
+                self.stream.write(json.dumps(record) + "\n")
+            else:
+                text = fields.get('message') or fields.get('status') or event
+                self.stream.write(f"[{event}] {text}\n")
+            self.stream.flush()
+
+    def progress(self, key, **fields):
+        """Write a progress event, dropping updates that come faster than MIN_INTERVAL.
+
+        A deferred (callable) status is only formatted for updates that are written.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_emit.get(key, 0) < self.MIN_INTERVAL:
+                return
+            self._last_emit[key] = now
+        if 'status' in fields:
+            fields['status'] = ProgressAggregator.resolve_status(fields['status'])
+        self.event('progress', **fields)
+
+
+class HeadlessDownloader:
+    """Runs downloads one URL at a time and waits for each to finish."""
+
+    def __init__(self, args, reporter):
+        self.args = args
+        self.reporter = reporter
+        self._done = threading.Event()
+        self._result = None
+        self.service = DownloadService(
+            progress_callback=self._on_progress,
+            status_callback=self._on_status,
+            completion_callback=self._on_complete,
+            item_progress_callback=self._on_item_progress,
+            max_concurrent_downloads=args.parallel,
+            # Not the GUI's journal, which would offer this run's jobs for resuming while they run
+            job_journal=JobJournal(AppPaths.data_file("cli_jobs.sqlite3"))
+        )
+        self.service.fragment_downloads = args.fragments
+        self.service.bandwidth_limiter.set_rate(args.rate)
+        self.service.postprocess_pipeline.configure(args.transcode_workers, args.ffmpeg_threads)
+        self.service.staging.root = args.staging_dir
+        self._fraction = 0.0
+
+    def run(self, urls):
+        """Download every URL; returns the process exit code."""
+        failed = 0
+        try:
+            for url in urls:
+                self.reporter.url = url
+                if not URLValidator.validate_url(url):
+                    self.reporter.event('complete', status='error', message="Invalid YouTube URL format.")
+                    failed += 1
+                    continue
+
+                status, message = self._download(url)
+                self.reporter.event('complete', status=status, message=message)
+                if status == "cancelled":
+                    return EXIT_CANCELLED
+                if status != "success":
+                    failed += 1
+        finally:
+            self.service.postprocess_pipeline.shutdown()
+        return EXIT_FAILED if failed else EXIT_OK
+
+    def _download(self, url):
+        self._done.clear()
+        self._fraction = 0.0
+        if URLValidator.is_playlist(url):
+            videos = self._fetch_playlist_videos(url)
+            if videos is None:
+                return self._result
+            if not videos:
+                return "success", "Nothing to download: every video is already in the download archive."
+            token = self.service.start_playlist_download(
+                videos, self.args.output, self.args.media_type, self.args.quality_selection,
+                max_concurrent_downloads=self.args.parallel
+            )
+        else:
+            token = self.service.start_download(
+                url, self.args.output, "video", self.args.media_type, self.args.quality_selection
+            )
+
+        try:
+            while not self._done.wait(0.2):
+                pass
+        except KeyboardInterrupt:
+            token.cancel()
+            self._done.wait()
+        return self._result
+
+    def _fetch_playlist_videos(self, url):
+        """List the playlist flat; returns None (with _result set) on error.
+
+        Entries are not resolved here: the download step extracts each one
+        itself, so nothing is extracted twice and the first download starts
+        as soon as the listing is in.
+        """
+        fetched = threading.Event()
+        result = {'status': None, 'error': None, 'videos': []}
+
+        def on_playlist_info(status, error_msg, playlist_info, video_list):
+            if status == 'page':
+                result['videos'].extend(video_list)
+                return
+            if status in ('complete', 'error'):
+                result.update(status=status, error=error_msg)
+                fetched.set()
+
+        self.reporter.event('status', status="Fetching playlist info...")
+        PlaylistInfoService(on_playlist_info, self.args.detail_workers).fetch_playlist_info(
+            url, self.args.output, lazy=True
+        )
+        fetched.wait()
+
+        if result['status'] != 'complete':
+            self._result = ("error", result['error'] or "Could not fetch playlist information")
+            return None
+        videos = result['videos']
+        if self.args.redownload:
+            return [dict(video, redownload=True) if video.get('archived') else dict(video) for video in videos]
+        return [dict(video) for video in videos if not video.get('archived')]
+
+    def _on_progress(self, fraction):
+        self._fraction = fraction
+        self.reporter.progress('overall', fraction=round(fraction, 4))
+
+    def _on_status(self, status):
+        self.reporter.progress('status', fraction=round(self._fraction, 4), status=status)
+
+    def _on_item_progress(self, position, percentage, status):
+        if status is None:
+            return
+        self.reporter.progress(f"item-{position}", position=position, fraction=round(percentage, 4),
+                               status=status)
+
+    def _on_complete(self, status, message):
+        self._result = (status, message)
+        self._done.set()
+
+
+def read_batch_file(path):
+    """Read URLs from a file (one per line; blank lines and # comments ignored; "-" reads stdin)."""
+    handle = sys.stdin if path == "-" else open(path, 'r', encoding='utf-8')
+    try:
+        return [line.strip() for line in handle if line.strip() and not line.strip().startswith('#')]
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def fetch_info(url, detail_workers=None):
+    """Fetch video or playlist metadata; returns (ok, data)."""
+    fetched = threading.Event()
+    result = {}
+
+    if URLValidator.is_playlist(url):
+        def on_playlist_info(status, error_msg, playlist_info, video_list):
+            result.update(ok=status == 'success', data={
+                'title': (playlist_info or {}).get('title'),
+                'uploader': (playlist_info or {}).get('uploader'),
+                'videos': [dict(video) for video in video_list],
+            } if status == 'success' else {'error': error_msg})
+            fetched.set()
+        PlaylistInfoService(on_playlist_info, detail_workers).fetch_playlist_info(url)
+    else:
+        def on_video_info(status, data):
+            result.update(ok=status == 'success', data=data or {'error': "Could not fetch video information"})
+            fetched.set()
+        VideoInfoService(on_video_info).fetch_video_info(url)
+
+    fetched.wait()
+    return result['ok'], result['data']
+
+
+def sync_playlist(url, download_path, detail_workers=None):
+    """Sync a playlist against its last sync; returns (ok, data) with the changes since then."""
+    fetched = threading.Event()
+    result = {}
+
+    def on_synced(status, error_msg, playlist_info, video_list):
+        if status == 'synced':
+            changes = playlist_info['changes']
+            result.update(ok=True, data={
+                'title': playlist_info.get('title'),
+                'entry_count': playlist_info.get('entry_count'),
+                **{key: [dict(video) for video in changes[key]]
+                   for key in ('added', 'removed', 'reordered', 'changed')},
+            })
+        else:
+            result.update(ok=False, data={'error': error_msg})
+        fetched.set()
+
+    PlaylistInfoService(on_synced, detail_workers).sync_playlist(url, download_path)
+    fetched.wait()
+    return result['ok'], result['data']
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="YouTube Downloader Pro (headless)")
+    parser.add_argument("urls", nargs="*", help="video or playlist URLs")
+    parser.add_argument("-a", "--batch-file", help="file with one URL per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", default=os.path.join(os.path.expanduser("~"), "Downloads"),
+                        help="download folder (default: ~/Downloads)")
+    parser.add_argument("-x", "--audio", action="store_true", help="download audio only")
+    parser.add_argument("-q", "--quality",
+                        help=f"video: {', '.join(VIDEO_QUALITIES)} (default 1080p); "
+                             f"audio: {', '.join(AUDIO_FORMATS)} (default mp3-128)")
+    parser.add_argument("-p", "--parallel", type=int, default=DownloadService.DEFAULT_CONCURRENT_DOWNLOADS,
+                        help="playlist videos to download in parallel")
+    parser.add_argument("--fragments", default="auto",
+                        help="concurrent fragment downloads: a number or 'auto'")
+    parser.add_argument("--limit", help="bandwidth limit, e.g. 5M or 500K")
+    parser.add_argument("--transcode-workers", type=int, default=0,
+                        help="parallel FFmpeg conversions (default: one per CPU core)")
+    parser.add_argument("--ffmpeg-threads", type=int, default=1,
+                        help="threads per FFmpeg job (0 lets FFmpeg decide; default 1)")
+    parser.add_argument("--detail-workers", type=int, default=PlaylistInfoService.DETAIL_WORKERS,
+                        help="playlist entries whose details are resolved in parallel")
+    parser.add_argument("--staging-dir",
+                        help="folder for partial and intermediate files (default: hidden folder in the target)")
+    parser.add_argument("--redownload", action="store_true",
+                        help="download playlist videos even if they are in the download archive")
+    parser.add_argument("--info", action="store_true", help="print metadata as JSON instead of downloading")
+    parser.add_argument("--sync", action="store_true",
+                        help="print playlist changes since the last --sync as JSON instead of downloading")
+    parser.add_argument("--json", action="store_true", help="write progress as JSON lines")
+    return parser
+
+
+def parse_args(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.batch_file:
+        try:
+            args.urls = args.urls + read_batch_file(args.batch_file)
+        except OSError as e:
+            parser.error(f"cannot read batch file: {e}")
+    if not args.urls:
+        parser.error("no URLs given")
+
+    choices = AUDIO_FORMATS if args.audio else VIDEO_QUALITIES
+    quality = (args.quality or ("mp3-128" if args.audio else "1080p")).lower()
+    if quality not in choices:
+        parser.error(f"invalid quality '{args.quality}', choose from: {', '.join(choices)}")
+    args.media_type = "Audio Only" if args.audio else "Video"
+    args.quality_selection = choices[quality]
+
+    if args.fragments != "auto":
+        try:
+            args.fragments = int(args.fragments)
+        except ValueError:
+            parser.error("--fragments must be a number or 'auto'")
+        if args.fragments < 1:
+            parser.error("--fragments must be at least 1")
+    try:
+        args.rate = BandwidthLimiter.parse_rate(args.limit)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.parallel < 1:
+        parser.error("--parallel must be at least 1")
+    if args.detail_workers < 1:
+        parser.error("--detail-workers must be at least 1")
+    if args.transcode_workers < 0:
+        parser.error("--transcode-workers must be 0 (one per CPU core) or more")
+    if args.ffmpeg_threads < 0:
+        parser.error("--ffmpeg-threads must be 0 (let FFmpeg decide) or more")
+    return args
+
+
+def main(argv=None):
+    try:
+        args = parse_args(argv)
+    except SystemExit as e:
+        # argparse has printed the usage error (or --help); report it as a return value, not an exit
+        return EXIT_USAGE if e.code else EXIT_OK
+    setup_ssl()
+
+    # Service log lines go to stderr so stdout carries only progress/results
+    stdout = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        if args.info:
+            exit_code = EXIT_OK
+            for url in args.urls:
+                ok, data = fetch_info(url, args.detail_workers)
+                stdout.write(json.dumps({'url': url, 'ok': ok, 'info': data}) + "\n")
+                if not ok:
+                    exit_code = EXIT_FAILED
+            return exit_code
+
+        if args.sync:
+            exit_code = EXIT_OK
+            for url in args.urls:
+                ok, data = sync_playlist(url, args.output, args.detail_workers)
+                stdout.write(json.dumps({'url': url, 'ok': ok, 'sync': data}) + "\n")
+                if not ok:
+                    exit_code = EXIT_FAILED
+            return exit_code
+
+        os.makedirs(args.output, exist_ok=True)
+        reporter = ConsoleReporter(stdout, json_lines=args.json)
+        return HeadlessDownloader(args, reporter).run(args.urls)
+    except KeyboardInterrupt:
+        return EXIT_CANCELLED
+    finally:
+        sys.stdout = stdout
+
+
+if __name__ == "__main__":
+    sys.exit(main())
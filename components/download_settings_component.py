@@ -5,8 +5,11 @@ from tkinter import filedialog
 class DownloadSettingsComponent(ctk.CTkFrame):
     """Download settings component with path selection and options."""
     
-    def __init__(self, parent):
+    SPEED_LIMITS = ["Unlimited", "1 MB/s", "2 MB/s", "5 MB/s", "10 MB/s", "25 MB/s"]
+    
+    def __init__(self, parent, on_speed_limit_change=None):
         super().__init__(parent, fg_color="#252525", corner_radius=10)
+        self.on_speed_limit_change = on_speed_limit_change
         self._setup_ui()
     
     def _setup_ui(self):
@@ -64,6 +67,15 @@ class DownloadSettingsComponent(ctk.CTkFrame):
         
         # Quality/Format
         self._setup_quality_options()
+        
+        # Parallel downloads
+        self._setup_concurrency_options()
+        
+        # Parallel fragments for DASH/HLS streams
+        self._setup_fragment_options()
+        
+        # Bandwidth cap shared by all downloads
+        self._setup_speed_limit_options()
     
     def _setup_download_type(self):
         """Setup download type selection."""
@@ -162,6 +174,91 @@ class DownloadSettingsComponent(ctk.CTkFrame):
         )
         self.quality_menu.pack(anchor="w")
     
+    def _setup_concurrency_options(self):
+        """Setup parallel playlist download selection."""
+        self.concurrency_frame = ctk.CTkFrame(self.options_grid, fg_color="transparent")
+        self.concurrency_frame.grid(row=0, column=3, padx=10, pady=5, sticky="nsew")
+        
+        ctk.CTkLabel(
+            self.concurrency_frame,
+            text="Parallel Downloads:",
+            font=("Arial", 14),
+            text_color="#cccccc"
+        ).pack(anchor="w", pady=(0, 5))
+        
+        self.concurrency_var = ctk.StringVar(value="3")
+        self.concurrency_menu = ctk.CTkOptionMenu(
+            self.concurrency_frame,
+            values=["1", "2", "3", "4", "6", "8"],
+            variable=self.concurrency_var,
+            width=100,
+            height=30,
+            font=("Arial", 12),
+            dropdown_font=("Arial", 12),
+            fg_color="#333333",
+            button_color="#4d90fe",
+            button_hover_color="#3a7bd5",
+            text_color="#ffffff"
+        )
+        self.concurrency_menu.pack(anchor="w")
+    
+    def _setup_fragment_options(self):
+        """Setup concurrent fragment download selection."""
+        self.fragment_frame = ctk.CTkFrame(self.options_grid, fg_color="transparent")
+        self.fragment_frame.grid(row=0, column=4, padx=10, pady=5, sticky="nsew")
+        
+        ctk.CTkLabel(
+            self.fragment_frame,
+            text="Fragments:",
+            font=("Arial", 14),
+            text_color="#cccccc"
+        ).pack(anchor="w", pady=(0, 5))
+        
+        self.fragment_var = ctk.StringVar(value="Auto")
+        self.fragment_menu = ctk.CTkOptionMenu(
+            self.fragment_frame,
+            values=["Auto", "1", "2", "4", "8", "16"],
+            variable=self.fragment_var,
+            width=100,
+            height=30,
+            font=("Arial", 12),
+            dropdown_font=("Arial", 12),
+            fg_color="#333333",
+            button_color="#4d90fe",
+            button_hover_color="#3a7bd5",
+            text_color="#ffffff"
+        )
+        self.fragment_menu.pack(anchor="w")
+    
+    def _setup_speed_limit_options(self):
+        """Setup the global speed limit selection; changes apply to running downloads."""
+        self.speed_frame = ctk.CTkFrame(self.options_grid, fg_color="transparent")
+        self.speed_frame.grid(row=1, column=3, columnspan=2, padx=10, pady=5, sticky="nsew")
+        
+        ctk.CTkLabel(
+            self.speed_frame,
+            text="Speed Limit:",
+            font=("Arial", 14),
+            text_color="#cccccc"
+        ).pack(anchor="w", pady=(0, 5))
+        
+        self.speed_var = ctk.StringVar(value="Unlimited")
+        self.speed_menu = ctk.CTkOptionMenu(
+            self.speed_frame,
+            values=self.SPEED_LIMITS,
+            variable=self.speed_var,
+            width=120,
+            height=30,
+            font=("Arial", 12),
+            dropdown_font=("Arial", 12),
+            command=self._on_speed_limit_change,
+            fg_color="#333333",
+            button_color="#4d90fe",
+            button_hover_color="#3a7bd5",
+            text_color="#ffffff"
+        )
+        self.speed_menu.pack(anchor="w")
+    
     def _browse_download_path(self):
         """Open file dialog to select download directory."""
         folder_selected = filedialog.askdirectory(title="Select Download Location")
@@ -180,6 +277,11 @@ class DownloadSettingsComponent(ctk.CTkFrame):
             self.quality_menu.configure(values=self.video_resolutions)
             self.quality_var.set("1080p")
     
+    def _on_speed_limit_change(self, choice):
+        """Forward speed limit changes immediately so running downloads pick them up."""
+        if self.on_speed_limit_change:
+            self.on_speed_limit_change(self.get_speed_limit())
+    
     def get_download_path(self):
         """Get the selected download path."""
         return self.path_entry.get().strip()
@@ -196,11 +298,21 @@ class DownloadSettingsComponent(ctk.CTkFrame):
         """Get the selected quality/format."""
         return self.quality_var.get()
     
-    def set_controls_state(self, state):
-        """Set the state of all controls."""
-        self.browse_button.configure(state=state)
-        self.quality_menu.configure(state=state)
-        self.media_menu.configure(state=state)
-        self.video_radio.configure(state=state)
-        self.playlist_radio.configure(state=state)
-        self.path_entry.configure(state=state)
\ No newline at end of file
+    def get_concurrent_downloads(self):
+        """Get the number of playlist videos to download in parallel."""
+        return int(self.concurrency_var.get())
+    
+    def get_fragment_downloads(self):
+        """Get concurrent fragment downloads: an int, or "auto" to tune from measured throughput."""
+        value = self.fragment_var.get()
+        return "auto" if value == "Auto" else int(value)
+    
+    def get_speed_limit(self):
+        """Get the speed limit as a rate string like "5M", or None for unlimited."""
+        value = self.speed_var.get()
+        return None if value == "Unlimited" else value.split()[0] + "M"
+    
+    def set_speed_limit(self, limit):
+        """Select the menu entry for a rate string like "5M"; unknown values fall back to unlimited."""
+        label = f"{str(limit).rstrip('M')} MB/s" if limit else "Unlimited"
+        self.speed_var.set(label if label in self.SPEED_LIMITS else "Unlimited")
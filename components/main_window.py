@@ -7,22 +7,31 @@ from components.video_preview_component import VideoPreviewComponent
 from components.playlist_component import PlaylistSelectionComponent
 from components.download_settings_component import DownloadSettingsComponent
 from components.progress_component import ProgressComponent
+from components.queue_component import QueueComponent
 from components.footer_component import FooterComponent
 from services.video_info_service import VideoInfoService
 from services.playlist_info_service import PlaylistInfoService
 from services.download_service import DownloadService
+from services.bandwidth_limiter import BandwidthLimiter, BandwidthWindow
+from utils.app_settings import AppSettings
 from utils.validators import URLValidator
+from utils.progress_aggregator import ProgressAggregator
 
 class MainWindow:
     """Main application window with playlist selection support."""
     
+    PROGRESS_FPS = 10  # Max progress redraws per second
+    OVERALL_PROGRESS_KEY = "overall"
+    
     def __init__(self):
         self.window = ctk.CTk()
         self.current_playlist_url = ""
+        self.current_playlist_title = ""
         self.selected_video_data = []
         self._setup_window()
         self._setup_services()
         self._setup_components()
+        self.download_service.start_queue()
     
     def _setup_window(self):
         """Setup the main window properties."""
@@ -33,13 +42,25 @@ class MainWindow:
     
     def _setup_services(self):
         """Initialize service classes."""
+        self.app_settings = AppSettings()
         self.video_info_service = VideoInfoService(self._on_video_info_received)
-        self.playlist_info_service = PlaylistInfoService(self._on_playlist_info_received)
+        self.playlist_info_service = PlaylistInfoService(
+            self._on_playlist_info_received,
+            detail_workers=self.app_settings.get('detail_workers')
+        )
         self.download_service = DownloadService(
             progress_callback=self._on_progress_update,
             status_callback=self._on_status_update,
-            completion_callback=self._on_download_complete
+            completion_callback=self._on_download_complete,
+            item_progress_callback=self._on_item_progress_update,
+            queue_callback=self._on_queue_job_update
         )
+        self._apply_bandwidth_settings()
+        self.download_service.postprocess_pipeline.configure(
+            max_workers=self.app_settings.get('transcode_workers'),
+            ffmpeg_threads=self.app_settings.get('ffmpeg_threads')
+        )
+        self.download_service.staging.root = self.app_settings.get('staging_dir')
     
     def _setup_components(self):
         """Setup all UI components."""
@@ -62,12 +83,17 @@ class MainWindow:
         self.playlist_selection = PlaylistSelectionComponent(
             self.main_frame,
             self._on_playlist_download,
-            self._on_playlist_cancel
+            self._on_playlist_cancel,
+            on_details_needed=self.playlist_info_service.fetch_details
         )
         
         # Download Settings
-        self.download_settings = DownloadSettingsComponent(self.main_frame)
+        self.download_settings = DownloadSettingsComponent(
+            self.main_frame,
+            on_speed_limit_change=self._on_speed_limit_change
+        )
         self.download_settings.pack(fill="x", pady=(0, 15))
+        self.download_settings.set_speed_limit(self.app_settings.get('speed_limit'))
         
         # Download Button
         self.download_button = ctk.CTkButton(
@@ -83,13 +109,67 @@ class MainWindow:
         )
         self.download_button.pack(pady=20)
         
+        # Resume Button (shown only when an interrupted job exists)
+        self.resume_button = ctk.CTkButton(
+            self.main_frame,
+            text="RESUME JOB",
+            width=200,
+            height=35,
+            command=self._resume_job,
+            font=("Arial", 12, "bold"),
+            fg_color="#666666",
+            hover_color="#555555",
+            corner_radius=8
+        )
+        
+        # Download queue (shown only when it has entries)
+        self.queue_view = QueueComponent(
+            self.main_frame,
+            on_move_callback=self._on_queue_move,
+            on_priority_callback=self._on_queue_priority,
+            on_remove_callback=self._on_queue_remove,
+            on_clear_finished_callback=self._on_queue_clear_finished
+        )
+        
         # Progress
-        self.progress = ProgressComponent(self.main_frame)
+        self.progress = ProgressComponent(
+            self.main_frame,
+            on_pause_callback=self.download_service.pause_download,
+            on_resume_callback=self.download_service.resume_download,
+            on_cancel_callback=self.download_service.cancel_download
+        )
         self.progress.pack(fill="x", pady=(0, 15))
         
         # Footer
         self.footer = FooterComponent(self.main_frame)
         self.footer.pack(fill="x", side="bottom", pady=(10, 0), anchor="s")
+        
+        self._refresh_resume_button()
+        self._refresh_queue()
+        
+        # Coalesce progress updates from download threads into fixed-rate redraws
+        self.progress_aggregator = ProgressAggregator(self.window, self._render_progress, fps=self.PROGRESS_FPS)
+        self.progress_aggregator.start()
+    
+    def _apply_bandwidth_settings(self):
+        """Load the saved speed limit and time-of-day windows into the shared limiter."""
+        limiter = self.download_service.bandwidth_limiter
+        try:
+            limiter.set_rate(BandwidthLimiter.parse_rate(self.app_settings.get('speed_limit')))
+        except ValueError as e:
+            print(f"Ignoring saved speed limit: {e}")
+        windows = []
+        for entry in self.app_settings.get('bandwidth_schedule') or []:
+            try:
+                windows.append(BandwidthWindow.from_dict(entry))
+            except (KeyError, ValueError) as e:
+                print(f"Ignoring invalid bandwidth window {entry}: {e}")
+        limiter.set_windows(windows)
+    
+    def _on_speed_limit_change(self, limit):
+        """Apply a new speed limit to all downloads, including running ones."""
+        self.download_service.bandwidth_limiter.set_rate(BandwidthLimiter.parse_rate(limit))
+        self.app_settings.set('speed_limit', limit)
     
     def _on_url_change(self, url):
         """Handle URL input changes."""
@@ -108,11 +188,14 @@ class MainWindow:
         if URLValidator.is_playlist(url):
             print("Playlist URL detected - fetching playlist info")
             self._hide_video_preview()
-            self.playlist_info_service.fetch_playlist_info(url)
             self.current_playlist_url = url
+            self.playlist_info_service.fetch_playlist_info(
+                url, self.download_settings.get_download_path(), lazy=True
+            )
         elif URLValidator.is_single_video(url):
             print("Single video URL detected - fetching video info")
             self._hide_playlist_selection()
+            self.playlist_info_service.cancel()
             self.video_info_service.fetch_video_info(url)
             self.current_playlist_url = ""
         else:
@@ -138,15 +221,35 @@ class MainWindow:
             self._hide_video_preview()
     
     def _on_playlist_info_received(self, status, error_msg, playlist_info, video_list):
-        """Handle playlist information received from service."""
-        if status == 'success' and playlist_info and video_list:
+        """Handle playlist information received from service (on a worker thread)."""
+        self.window.after(0, lambda: self._show_playlist_info(status, error_msg, playlist_info, video_list))
+    
+    def _show_playlist_info(self, status, error_msg, playlist_info, video_list):
+        """Apply a streamed playlist update: started, page, details, complete or error."""
+        if status == 'details':
+            for video in video_list:
+                self.playlist_selection.update_video_details(video)
+            return
+        if playlist_info and playlist_info.get('url') != self.current_playlist_url:
+            return  # Listing of a URL the user has since replaced
+        
+        if status == 'started':
+            self.current_playlist_title = playlist_info.get('title', '')
+            self.playlist_selection.clear_video_list()
             self.playlist_selection.update_playlist_info(playlist_info)
-            self.playlist_selection.populate_video_list(video_list)
+            self.playlist_selection.set_loading(True, playlist_info.get('entry_count'))
             self._show_playlist_selection()
             
             # Hide download button and settings when playlist is shown
             self.download_button.pack_forget()
             self.download_settings.pack_forget()
+        elif status == 'page':
+            self.playlist_selection.append_videos(video_list)
+        elif status == 'complete':
+            self.playlist_selection.set_loading(False, playlist_info.get('entry_count'))
+            if not playlist_info.get('entry_count'):
+                self._on_playlist_cancel()
+                messagebox.showerror("Playlist Error", "Playlist has no videos")
         else:
             print(f"Playlist fetch error: {error_msg}")
             self._hide_playlist_selection()
@@ -165,8 +268,9 @@ class MainWindow:
         video_count = len(selected_videos)
         self.download_button.configure(text=f"DOWNLOAD {video_count} VIDEOS")
         
-        # Hide playlist selection
+        # Hide playlist selection; entries not listed yet can no longer be picked
         self._hide_playlist_selection()
+        self.playlist_info_service.cancel()
         
         # Auto-start download or show settings
         download_path = self.download_settings.get_download_path()
@@ -175,6 +279,7 @@ class MainWindow:
     
     def _on_playlist_cancel(self):
         """Handle playlist cancel."""
+        self.playlist_info_service.cancel()
         self._hide_playlist_selection()
         self.url_input.url_entry.delete(0, ctk.END)
         self.current_playlist_url = ""
@@ -204,6 +309,7 @@ class MainWindow:
         """Hide all preview components."""
         self._hide_video_preview()
         self._hide_playlist_selection()
+        self.playlist_info_service.cancel()
     
     def _start_download(self):
         """Start the download process."""
@@ -233,57 +339,142 @@ class MainWindow:
             messagebox.showerror("Error", "Invalid YouTube URL format.")
             return
         
-        # Disable UI and start download
-        self._set_ui_state("disabled")
-        self.download_service.start_download(url, download_path, download_type, media_type, quality_selection)
+        # Queue the download; the UI stays usable for more URLs
+        self.download_service.fragment_downloads = self.download_settings.get_fragment_downloads()
+        self.download_service.enqueue_download(url, download_path, download_type, media_type, quality_selection)
+        self._refresh_queue()
     
     def _start_playlist_download(self, selected_videos):
         """Start downloading selected playlist videos."""
         download_path = self.download_settings.get_download_path()
         media_type = self.download_settings.get_media_type()
         quality_selection = self.download_settings.get_quality_selection()
+        concurrent_downloads = self.download_settings.get_concurrent_downloads()
         
         if not download_path:
             messagebox.showerror("Error", "Please select a download location.")
             return
         
-        # Disable UI and start download
-        self._set_ui_state("disabled")
-        
-        # Use custom playlist download method
-        self.download_service.start_playlist_download(
+        # Compare the estimated size with free space before anything is transferred
+        preflight = self.download_service.preflight.check_batch(
             selected_videos, download_path, media_type, quality_selection
         )
+        if not preflight.ok and not messagebox.askyesno(
+            "Low Disk Space",
+            f"This download may not fit on the target drive.\n{preflight.message}\n\nQueue it anyway?"
+        ):
+            return
+        
+        # Queue the playlist download; the UI stays usable for more URLs
+        self.download_service.fragment_downloads = self.download_settings.get_fragment_downloads()
+        title = f"{self.current_playlist_title or 'Playlist'} ({len(selected_videos)} videos)"
+        self.download_service.enqueue_playlist_download(
+            selected_videos, download_path, media_type, quality_selection,
+            max_concurrent_downloads=concurrent_downloads, title=title,
+            check_disk_space=preflight.ok  # The user already accepted the risk
+        )
+        self.selected_video_data = []
+        self.download_button.configure(text="DOWNLOAD")
+        self._refresh_queue()
+    
+    def _resume_job(self):
+        """Resume the most recent interrupted playlist job."""
+        jobs = self.download_service.get_resumable_jobs()
+        if not jobs:
+            self._refresh_resume_button()
+            return
+        
+        self.download_service.fragment_downloads = self.download_settings.get_fragment_downloads()
+        self.download_service.enqueue_resume(
+            jobs[0]['job_id'],
+            max_concurrent_downloads=self.download_settings.get_concurrent_downloads()
+        )
+        self.resume_button.pack_forget()
+        self._refresh_queue()
+    
+    def _refresh_resume_button(self):
+        """Show the resume button only when an interrupted job exists."""
+        jobs = self.download_service.get_resumable_jobs()
+        if jobs:
+            job = jobs[0]
+            self.resume_button.configure(text=f"RESUME JOB ({job['done_count']}/{job['item_count']} done)")
+            self.resume_button.pack(pady=(0, 15), before=self.progress)
+        else:
+            self.resume_button.pack_forget()
+    
+    def _refresh_queue(self):
+        """Redraw the queue list; hide it when the queue is empty."""
+        entries = self.download_service.download_queue.entries()
+        if entries:
+            self.queue_view.refresh(entries)
+            self.queue_view.pack(fill="x", pady=(0, 15), before=self.progress)
+        else:
+            self.queue_view.pack_forget()
+    
+    def _on_queue_move(self, entry_id, offset):
+        self.download_service.download_queue.move(entry_id, offset)
+        self._refresh_queue()
+    
+    def _on_queue_priority(self, entry_id, priority):
+        self.download_service.download_queue.set_priority(entry_id, priority)
+        self._refresh_queue()
+    
+    def _on_queue_remove(self, entry_id):
+        self.download_service.download_queue.remove(entry_id)
+        self._refresh_queue()
+    
+    def _on_queue_clear_finished(self):
+        self.download_service.download_queue.clear_finished()
+        self._refresh_queue()
+    
+    def _on_queue_job_update(self, entry_id, status, message):
+        """Handle queued jobs starting and finishing (called from the queue thread)."""
+        if status == "running":
+            self.window.after(0, self._show_job_started)
+        else:
+            self._on_download_complete(status, message)
+    
+    def _show_job_started(self):
+        self.progress.reset_progress()
+        self.progress.show_download_controls(True)
+        self._refresh_queue()
     
     def _on_progress_update(self, percentage):
         """Handle progress updates from download service."""
-        self.window.after(0, lambda: self.progress.update_progress(percentage))
+        self.progress_aggregator.update(self.OVERALL_PROGRESS_KEY, percentage=percentage)
     
     def _on_status_update(self, status):
         """Handle status updates from download service."""
-        self.window.after(0, lambda: self.progress.update_status(status))
+        self.progress_aggregator.update(self.OVERALL_PROGRESS_KEY, status=status)
     
-    def _on_download_complete(self, status, message):
-        """Handle download completion."""
-        self.window.after(0, lambda: self._reset_ui_after_download())
-        
-        if status == "success":
-            self.window.after(0, lambda: messagebox.showinfo("Success", message))
+    def _on_item_progress_update(self, position, percentage, status):
+        """Handle per-item progress updates for parallel playlist downloads."""
+        if status is None:
+            self.progress_aggregator.remove(position)
+        else:
+            self.progress_aggregator.update(position, percentage=percentage, status=status)
+    
+    def _render_progress(self, key, percentage, status):
+        """Render the latest coalesced progress state (runs on the Tk thread)."""
+        if key == self.OVERALL_PROGRESS_KEY:
+            if percentage is not None:
+                self.progress.update_progress(percentage)
+            if status is not None:
+                self.progress.update_status(status)
         else:
-            self.window.after(0, lambda: messagebox.showerror("Error", message))
+            self.progress.update_item_status(key, status)
     
-    def _set_ui_state(self, state):
-        """Set the state of UI controls."""
-        self.download_button.configure(state=state)
-        self.url_input.set_state(state)
-        self.download_settings.set_controls_state(state)
+    def _on_download_complete(self, status, message):
+        """Handle download completion, queued or not (called from a worker thread)."""
+        self.window.after(0, lambda: self._reset_ui_after_download(status, message))
     
-    def _reset_ui_after_download(self):
-        """Reset UI after download completion."""
-        self._set_ui_state("normal")
+    def _reset_ui_after_download(self, status, message):
+        """Reset the progress display and show the outcome; the queue moves on by itself."""
+        self.progress_aggregator.clear()
         self.progress.reset_progress()
-        self.selected_video_data = []
-        self.download_button.configure(text="DOWNLOAD")
+        self.progress.update_status(message.splitlines()[0] if message else status.capitalize())
+        self._refresh_resume_button()
+        self._refresh_queue()
     
     def run(self):
         """Start the application main loop."""
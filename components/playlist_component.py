@@ -1,5 +1,5 @@
 import customtkinter as ctk
-import threading
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import messagebox
 from PIL import Image
 import requests
@@ -7,14 +7,33 @@ from io import BytesIO
 
 
 class PlaylistSelectionComponent(ctk.CTkFrame):
-    """Playlist selection component with video list and checkboxes."""
+    """Playlist selection component with video list and checkboxes.
     
-    def __init__(self, parent, on_download_callback, on_cancel_callback):
+    Rows can arrive in pages while the playlist is still being listed.
+    Thumbnails and, through on_details_needed, full video details are only
+    loaded for rows that are scrolled into view or selected.
+    """
+    
+    ROWS_PER_TICK = 20  # Rows built per event-loop turn
+    VISIBILITY_INTERVAL_MS = 300
+    VISIBLE_MARGIN = 3  # Rows above/below the viewport that count as visible
+    
+    def __init__(self, parent, on_download_callback, on_cancel_callback, on_details_needed=None):
         super().__init__(parent, fg_color="#252525", corner_radius=10)
         self.on_download_callback = on_download_callback
         self.on_cancel_callback = on_cancel_callback
+        self.on_details_needed = on_details_needed
         self.video_vars = {}  # Store checkbox variables
         self.video_data = []  # Store video information
+        self._rows = []  # Per-row widgets that change after creation
+        self._pending_rows = []
+        self._row_job = None
+        self._visibility_job = None
+        self._thumbnail_requested = set()
+        self._details_requested = set()
+        self._thumbnail_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="thumbnails")
+        self._loading = False
+        self._total_count = None
         self._setup_ui()
     
     def _setup_ui(self):
@@ -166,132 +185,267 @@ class PlaylistSelectionComponent(ctk.CTkFrame):
         """Update playlist information display."""
         self.playlist_title.configure(text=playlist_info.get('title', 'Unknown Playlist'))
         self.channel_label.configure(text=playlist_info.get('uploader', 'Unknown Channel'))
-        self.count_label.configure(text=str(len(playlist_info.get('entries', []))))
+        self._total_count = playlist_info.get('entry_count') or len(playlist_info.get('entries', [])) or None
+        self._update_count_label()
     
     def populate_video_list(self, video_list):
         """Populate the scrollable video list with checkboxes and thumbnails."""
-        # Clear existing widgets
+        self.clear_video_list()
+        self.append_videos(video_list)
+    
+    def clear_video_list(self):
+        """Remove every row, e.g. before a new playlist starts streaming in."""
+        if self._row_job is not None:
+            self.after_cancel(self._row_job)
+            self._row_job = None
         for widget in self.scroll_frame.winfo_children():
             widget.destroy()
         
         self.video_vars.clear()
-        self.video_data = video_list
+        self.video_data = []
+        self._rows = []
+        self._pending_rows = []
+        self._thumbnail_requested = set()
+        self._details_requested = set()
+        self.update_selected_count()
     
-        for i, video in enumerate(video_list):
-            # Create video frame
-            video_frame = ctk.CTkFrame(self.scroll_frame, fg_color="#252525", corner_radius=8)
-            video_frame.pack(fill="x", pady=5, padx=10)
-            
-            # Checkbox and video info frame
-            content_frame = ctk.CTkFrame(video_frame, fg_color="transparent")
-            content_frame.pack(fill="x", padx=10, pady=10)
-            
-            # Checkbox
-            var = ctk.BooleanVar(value=True)  # Default selected
-            self.video_vars[i] = var
-            
-            checkbox = ctk.CTkCheckBox(
-                content_frame,
-                text="",
-                variable=var,
-                width=20,
-                height=20,
-                command=self.update_selected_count,
-                checkbox_width=20,
-                checkbox_height=20,
-                corner_radius=4
-            )
-            checkbox.pack(side="left", padx=(0, 10))
-            
-            # Thumbnail loading
-            thumbnail_url = video.get('thumbnail')
-            thumbnail_image = None
+    def append_videos(self, videos):
+        """Add rows for another page of videos; widgets are built a few at a time to keep the UI responsive."""
+        self._pending_rows.extend(videos)
+        if self._row_job is None:
+            self._row_job = self.after(0, self._build_pending_rows)
     
-            if thumbnail_url:
-                try:
-                    response = requests.get(thumbnail_url, timeout=5)
-                    image_data = Image.open(BytesIO(response.content)).convert("RGB")
-                    image_data = image_data.resize((120, 68))
-                    thumbnail_image = ctk.CTkImage(light_image=image_data, size=(120, 68))
-                except Exception as e:
-                    print(f"[Thumbnail Error] {e}")
-            
-            if thumbnail_image:
-                thumbnail_label = ctk.CTkLabel(content_frame, image=thumbnail_image, text="")
-                thumbnail_label.image = thumbnail_image  # Prevent garbage collection
-                thumbnail_label.pack(side="left", padx=(0, 10))
-            else:
-                ctk.CTkLabel(content_frame, text="", width=120).pack(side="left", padx=(0, 10))
-            
-            # Video info
-            info_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-            info_frame.pack(side="left", fill="x", expand=True)
-            
-            # Video number and title
-            title_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
-            title_frame.pack(fill="x", anchor="w")
-            
-            video_number = ctk.CTkLabel(
-                title_frame,
-                text=f"#{i+1:02d}",
-                font=("Arial", 12, "bold"),
-                text_color="#4d90fe",
-                width=40
-            )
-            video_number.pack(side="left")
-            
-            title_text = video.get('title', f'Video {i+1}')
-            if len(title_text) > 80:
-                title_text = title_text[:80] + "..."
-            
-            video_title = ctk.CTkLabel(
-                title_frame,
-                text=title_text,
-                font=("Arial", 13, "bold"),
-                text_color="#ffffff",
-                anchor="w"
-            )
-            video_title.pack(side="left", fill="x", expand=True, padx=(10, 0))
-            
-            # Video metadata
-            meta_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
-            meta_frame.pack(fill="x", anchor="w", pady=(5, 0))
-            
-            # Duration
-            duration_text = self._format_duration(video.get('duration', 0))
-            duration_label = ctk.CTkLabel(
-                meta_frame,
-                text=f"⏱️ {duration_text}",
-                font=("Arial", 10),
-                text_color="#aaaaaa"
-            )
-            duration_label.pack(side="left", padx=(50, 20))
-            
-            # View count
-            view_count = self._format_view_count(video.get('view_count', 0))
-            views_label = ctk.CTkLabel(
+    def set_loading(self, loading, total=None):
+        """Show how much of the playlist has been listed so far."""
+        self._loading = loading
+        self._total_count = total
+        self._update_count_label()
+    
+    def update_video_details(self, video):
+        """Replace a row's data and labels with fully resolved details."""
+        for i, current in enumerate(self.video_data):
+            if current.get('url') != video.get('url'):
+                continue
+            self.video_data[i] = video
+            if i < len(self._rows):
+                row = self._rows[i]
+                row['duration'].configure(text=f"⏱️ {self._format_duration(video.get('duration', 0))}")
+                row['views'].configure(text=f"👁️ {self._format_view_count(video.get('view_count', 0))}")
+                row['date'].configure(text=self._format_upload_date(video.get('upload_date', '')))
+                if video.get('thumbnail') and i not in self._thumbnail_requested:
+                    self._request_thumbnail(i)
+            return
+    
+    def _build_pending_rows(self):
+        """Build up to ROWS_PER_TICK queued rows, then yield back to the event loop."""
+        self._row_job = None
+        batch = self._pending_rows[:self.ROWS_PER_TICK]
+        del self._pending_rows[:self.ROWS_PER_TICK]
+        for video in batch:
+            self._add_video_row(video)
+        self.update_selected_count()
+        self._update_count_label()
+        if self._pending_rows:
+            self._row_job = self.after(1, self._build_pending_rows)
+        self._schedule_visibility_check()
+    
+    def _add_video_row(self, video):
+        """Create the widgets for one video."""
+        i = len(self.video_data)
+        self.video_data.append(video)
+        
+        # Create video frame
+        video_frame = ctk.CTkFrame(self.scroll_frame, fg_color="#252525", corner_radius=8)
+        video_frame.pack(fill="x", pady=5, padx=10)
+        
+        # Checkbox and video info frame
+        content_frame = ctk.CTkFrame(video_frame, fg_color="transparent")
+        content_frame.pack(fill="x", padx=10, pady=10)
+        
+        # Checkbox (videos already in the download archive start deselected)
+        var = ctk.BooleanVar(value=not video.get('archived'))
+        self.video_vars[i] = var
+        
+        checkbox = ctk.CTkCheckBox(
+            content_frame,
+            text="",
+            variable=var,
+            width=20,
+            height=20,
+            command=lambda index=i: self._on_video_toggled(index),
+            checkbox_width=20,
+            checkbox_height=20,
+            corner_radius=4
+        )
+        checkbox.pack(side="left", padx=(0, 10))
+        
+        # Thumbnail placeholder; the image is loaded once the row scrolls into view
+        thumbnail_label = ctk.CTkLabel(content_frame, text="", width=120, height=68)
+        thumbnail_label.pack(side="left", padx=(0, 10))
+        
+        # Video info
+        info_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        info_frame.pack(side="left", fill="x", expand=True)
+        
+        # Video number and title
+        title_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
+        title_frame.pack(fill="x", anchor="w")
+        
+        video_number = ctk.CTkLabel(
+            title_frame,
+            text=f"#{i+1:02d}",
+            font=("Arial", 12, "bold"),
+            text_color="#4d90fe",
+            width=40
+        )
+        video_number.pack(side="left")
+        
+        title_text = video.get('title', f'Video {i+1}')
+        if len(title_text) > 80:
+            title_text = title_text[:80] + "..."
+        
+        video_title = ctk.CTkLabel(
+            title_frame,
+            text=title_text,
+            font=("Arial", 13, "bold"),
+            text_color="#ffffff",
+            anchor="w"
+        )
+        video_title.pack(side="left", fill="x", expand=True, padx=(10, 0))
+        
+        # Video metadata
+        meta_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
+        meta_frame.pack(fill="x", anchor="w", pady=(5, 0))
+        
+        # Duration
+        duration_text = self._format_duration(video.get('duration', 0))
+        duration_label = ctk.CTkLabel(
+            meta_frame,
+            text=f"⏱️ {duration_text}",
+            font=("Arial", 10),
+            text_color="#aaaaaa"
+        )
+        duration_label.pack(side="left", padx=(50, 20))
+        
+        # View count
+        view_count = self._format_view_count(video.get('view_count', 0))
+        views_label = ctk.CTkLabel(
+            meta_frame,
+            text=f"👁️ {view_count}",
+            font=("Arial", 10),
+            text_color="#aaaaaa"
+        )
+        views_label.pack(side="left", padx=(0, 20))
+        
+        # Upload date (flat listings usually lack it until details arrive)
+        date_label = ctk.CTkLabel(
+            meta_frame,
+            text=self._format_upload_date(video.get('upload_date', '')),
+            font=("Arial", 10),
+            text_color="#aaaaaa"
+        )
+        date_label.pack(side="left", padx=(0, 20))
+        
+        if video.get('archived'):
+            ctk.CTkLabel(
                 meta_frame,
-                text=f"👁️ {view_count}",
-                font=("Arial", 10),
-                text_color="#aaaaaa"
-            )
-            views_label.pack(side="left", padx=(0, 20))
-            
-            # Upload date (if available)
-            if video.get('upload_date'):
-                upload_date = video.get('upload_date', '')
-                if len(upload_date) == 8:  # Format: YYYYMMDD
-                    formatted_date = f"{upload_date[6:8]}/{upload_date[4:6]}/{upload_date[:4]}"
-                    date_label = ctk.CTkLabel(
-                        meta_frame,
-                        text=f"📅 {formatted_date}",
-                        font=("Arial", 10),
-                        text_color="#aaaaaa"
-                    )
-                    date_label.pack(side="left")
+                text="✔ Downloaded",
+                font=("Arial", 10, "bold"),
+                text_color="#44ff44"
+            ).pack(side="left")
+        
+        self._rows.append({
+            'frame': video_frame,
+            'thumbnail': thumbnail_label,
+            'duration': duration_label,
+            'views': views_label,
+            'date': date_label,
+        })
     
+    def _on_video_toggled(self, index):
+        """Selecting a video is a good reason to resolve its details."""
         self.update_selected_count()
-
+        if self.video_vars[index].get():
+            self._request_details([index])
+    
+    def _schedule_visibility_check(self):
+        if self._visibility_job is None:
+            self._visibility_job = self.after(self.VISIBILITY_INTERVAL_MS, self._check_visible_rows)
+    
+    def _check_visible_rows(self):
+        """Load thumbnails and details for the rows currently scrolled into view."""
+        self._visibility_job = None
+        if not self._rows:
+            return
+        if self.winfo_ismapped():
+            first, last = self._visible_range()
+            self._request_details(range(first, last))
+            for i in range(first, last):
+                if i not in self._thumbnail_requested:
+                    self._request_thumbnail(i)
+        # Keep watching for scrolling while the list is on screen
+        self._schedule_visibility_check()
+    
+    def _visible_range(self):
+        """Indices of the rows inside the scrolled viewport, with a little margin."""
+        top, bottom = self.scroll_frame._parent_canvas.yview()
+        count = len(self._rows)
+        first = max(0, int(top * count) - self.VISIBLE_MARGIN)
+        last = min(count, int(bottom * count) + 1 + self.VISIBLE_MARGIN)
+        return first, last
+    
+    def _request_details(self, indices):
+        if not self.on_details_needed:
+            return
+        indices = [i for i in indices if i < len(self.video_data) and i not in self._details_requested
+                   and not self.video_data[i].get('details')]
+        self._details_requested.update(indices)  # Asked once per row, even if resolving fails
+        videos = [self.video_data[i] for i in indices]
+        if videos:
+            self.on_details_needed(videos)
+    
+    def _request_thumbnail(self, index):
+        """Download a row's thumbnail in the background and show it when it arrives."""
+        thumbnail_url = self.video_data[index].get('thumbnail')
+        if not thumbnail_url:
+            return
+        self._thumbnail_requested.add(index)
+        row = self._rows[index]
+        
+        def load():
+            try:
+                response = requests.get(thumbnail_url, timeout=5)
+                image_data = Image.open(BytesIO(response.content)).convert("RGB")
+                image_data = image_data.resize((120, 68))
+            except Exception as e:
+                print(f"[Thumbnail Error] {e}")
+                return
+            self.after(0, lambda: self._show_thumbnail(row, image_data))
+        
+        self._thumbnail_executor.submit(load)
+    
+    @staticmethod
+    def _show_thumbnail(row, image_data):
+        label = row['thumbnail']
+        if not label.winfo_exists():
+            return  # Row was cleared while the image was loading
+        thumbnail_image = ctk.CTkImage(light_image=image_data, size=(120, 68))
+        label.configure(image=thumbnail_image)
+        label.image = thumbnail_image  # Prevent garbage collection
+    
+    def _update_count_label(self):
+        loaded = len(self.video_data)
+        if self._loading:
+            total = f" of {self._total_count}" if self._total_count else ""
+            self.count_label.configure(text=f"{loaded}{total} (loading...)")
+        else:
+            self.count_label.configure(text=str(self._total_count or loaded))
+    
+    def _format_upload_date(self, upload_date):
+        """Format YYYYMMDD as a date label, or nothing."""
+        if upload_date and len(upload_date) == 8:
+            return f"📅 {upload_date[6:8]}/{upload_date[4:6]}/{upload_date[:4]}"
+        return ""
     
     def _format_duration(self, seconds):
         """Format duration from seconds to readable format."""
@@ -353,7 +507,11 @@ class PlaylistSelectionComponent(ctk.CTkFrame):
             if var.get():
                 selected_indices.append(i)
                 if i < len(self.video_data):
-                    selected_videos.append(self.video_data[i])
+                    video = dict(self.video_data[i])  # Plain dicts from here on: they go into the queue as JSON
+                    if video.get('archived'):
+                        # User explicitly re-selected an archived video
+                        video['redownload'] = True
+                    selected_videos.append(video)
         
         return selected_indices, selected_videos
     
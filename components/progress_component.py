@@ -3,8 +3,13 @@ import customtkinter as ctk
 class ProgressComponent(ctk.CTkFrame):
     """Progress component showing download progress and status."""
     
-    def __init__(self, parent):
+    def __init__(self, parent, on_pause_callback=None, on_resume_callback=None, on_cancel_callback=None):
         super().__init__(parent, fg_color="#252525", corner_radius=10)
+        self.on_pause_callback = on_pause_callback
+        self.on_resume_callback = on_resume_callback
+        self.on_cancel_callback = on_cancel_callback
+        self._item_lines = {}  # position -> status text for items in flight
+        self._paused = False
         self._setup_ui()
     
     def _setup_ui(self):
@@ -44,6 +49,66 @@ class ProgressComponent(ctk.CTkFrame):
             text_color="#aaaaaa"
         )
         self.status_label.pack(pady=(0, 15))
+        
+        self.items_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=("Arial", 11),
+            text_color="#888888",
+            justify="left"
+        )
+        
+        # Pause/Cancel controls (shown only while a download is running)
+        self.controls_frame = ctk.CTkFrame(self, fg_color="transparent")
+        
+        self.pause_button = ctk.CTkButton(
+            self.controls_frame,
+            text="Pause",
+            width=100,
+            height=30,
+            command=self._toggle_pause,
+            font=("Arial", 11),
+            fg_color="#666666",
+            hover_color="#555555"
+        )
+        self.pause_button.pack(side="left", padx=5)
+        
+        self.cancel_button = ctk.CTkButton(
+            self.controls_frame,
+            text="Cancel",
+            width=100,
+            height=30,
+            command=self._cancel,
+            font=("Arial", 11),
+            fg_color="#ff4444",
+            hover_color="#cc3333"
+        )
+        self.cancel_button.pack(side="left", padx=5)
+    
+    def show_download_controls(self, visible):
+        """Show or hide the pause/cancel buttons."""
+        if visible:
+            self._paused = False
+            self.pause_button.configure(text="Pause", state="normal")
+            self.cancel_button.configure(state="normal")
+            self.controls_frame.pack(pady=(0, 15), after=self.status_label)
+        else:
+            self.controls_frame.pack_forget()
+    
+    def _toggle_pause(self):
+        """Pause or resume the running download."""
+        self._paused = not self._paused
+        self.pause_button.configure(text="Resume" if self._paused else "Pause")
+        callback = self.on_pause_callback if self._paused else self.on_resume_callback
+        if callback:
+            callback()
+    
+    def _cancel(self):
+        """Cancel the running download."""
+        self.pause_button.configure(state="disabled")
+        self.cancel_button.configure(state="disabled")
+        if self.on_cancel_callback:
+            self.on_cancel_callback()
     
     def update_progress(self, percentage):
         """Update the progress bar and percentage."""
@@ -54,8 +119,27 @@ class ProgressComponent(ctk.CTkFrame):
         """Update the status label."""
         self.status_label.configure(text=status)
     
+    def update_item_status(self, position, status):
+        """Show the status of one in-flight playlist item, or remove it when status is None."""
+        if status is None:
+            self._item_lines.pop(position, None)
+        else:
+            self._item_lines[position] = status
+        
+        if self._item_lines:
+            lines = [self._item_lines[key] for key in sorted(self._item_lines)]
+            self.items_label.configure(text="\n".join(lines))
+            if not self.items_label.winfo_ismapped():
+                self.items_label.pack(fill="x", padx=15, pady=(0, 15))
+        else:
+            self.items_label.pack_forget()
+    
     def reset_progress(self):
         """Reset progress to initial state."""
         self.progress_bar.set(0)
         self.percentage_label.configure(text="0%")
-        self.status_label.configure(text="Ready to download")
\ No newline at end of file
+        self.status_label.configure(text="Ready to download")
+        self._item_lines.clear()
+        self.items_label.configure(text="")
+        self.items_label.pack_forget()
+        self.show_download_controls(False)
\ No newline at end of file
@@ -0,0 +1,143 @@
+import customtkinter as ctk
+
+
+class QueueComponent(ctk.CTkFrame):
+    """Download queue list with priority, reordering and removal controls."""
+
+    PRIORITY_LABELS = {0: "Low", 1: "Normal", 2: "High"}
+    STATE_COLORS = {
+        'running': "#4d90fe",
+        'queued': "#cccccc",
+        'done': "#44bb44",
+        'failed': "#ff4444",
+        'cancelled': "#888888",
+    }
+
+    def __init__(self, parent, on_move_callback, on_priority_callback, on_remove_callback,
+                 on_clear_finished_callback):
+        super().__init__(parent, fg_color="#252525", corner_radius=10)
+        self.on_move_callback = on_move_callback
+        self.on_priority_callback = on_priority_callback
+        self.on_remove_callback = on_remove_callback
+        self.on_clear_finished_callback = on_clear_finished_callback
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Setup the queue UI elements."""
+        self.header_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.header_frame.pack(fill="x", padx=15, pady=(15, 5))
+
+        self.title_label = ctk.CTkLabel(
+            self.header_frame,
+            text="Download Queue",
+            font=("Arial", 14),
+            text_color="#cccccc"
+        )
+        self.title_label.pack(side="left")
+
+        self.clear_button = ctk.CTkButton(
+            self.header_frame,
+            text="Clear Finished",
+            width=110,
+            height=28,
+            command=self.on_clear_finished_callback,
+            font=("Arial", 11),
+            fg_color="#666666",
+            hover_color="#555555"
+        )
+        self.clear_button.pack(side="right")
+
+        self.scroll_frame = ctk.CTkScrollableFrame(
+            self,
+            height=120,
+            fg_color="#1a1a1a",
+            scrollbar_button_color="#555555"
+        )
+        self.scroll_frame.pack(fill="x", padx=15, pady=(0, 15))
+
+    def refresh(self, entries):
+        """Rebuild the list from DownloadQueue.entries()."""
+        for widget in self.scroll_frame.winfo_children():
+            widget.destroy()
+
+        queued_count = sum(1 for entry in entries if entry['state'] == 'queued')
+        self.title_label.configure(text=f"Download Queue ({queued_count} waiting)")
+
+        for entry in entries:
+            self._add_entry_row(entry)
+
+    def _add_entry_row(self, entry):
+        """Add one queue entry row."""
+        entry_id = entry['entry_id']
+        row = ctk.CTkFrame(self.scroll_frame, fg_color="#252525", corner_radius=6)
+        row.pack(fill="x", pady=3, padx=5)
+
+        ctk.CTkLabel(
+            row,
+            text=entry['state'].capitalize(),
+            width=80,
+            font=("Arial", 11, "bold"),
+            text_color=self.STATE_COLORS.get(entry['state'], "#cccccc")
+        ).pack(side="left", padx=(10, 5), pady=5)
+
+        title = entry['title'] if len(entry['title']) <= 60 else entry['title'][:57] + "..."
+        if entry.get('message') and entry['state'] == 'failed':
+            title += f" - {entry['message'].splitlines()[0]}"
+        ctk.CTkLabel(
+            row,
+            text=title,
+            font=("Arial", 11),
+            text_color="#ffffff",
+            anchor="w"
+        ).pack(side="left", fill="x", expand=True, padx=5)
+
+        if entry['state'] == 'running':
+            return
+
+        ctk.CTkButton(
+            row,
+            text="✕",
+            width=28,
+            height=24,
+            command=lambda: self.on_remove_callback(entry_id),
+            font=("Arial", 11),
+            fg_color="#ff4444",
+            hover_color="#cc3333"
+        ).pack(side="right", padx=(2, 10))
+
+        if entry['state'] != 'queued':
+            return
+
+        for text, offset in (("▼", 1), ("▲", -1)):
+            ctk.CTkButton(
+                row,
+                text=text,
+                width=28,
+                height=24,
+                command=lambda offset=offset: self.on_move_callback(entry_id, offset),
+                font=("Arial", 11),
+                fg_color="#666666",
+                hover_color="#555555"
+            ).pack(side="right", padx=2)
+
+        priority_var = ctk.StringVar(value=self.PRIORITY_LABELS.get(entry['priority'], "Normal"))
+        ctk.CTkOptionMenu(
+            row,
+            values=list(self.PRIORITY_LABELS.values()),
+            variable=priority_var,
+            width=90,
+            height=24,
+            font=("Arial", 11),
+            dropdown_font=("Arial", 11),
+            command=lambda choice: self.on_priority_callback(entry_id, self._priority_value(choice)),
+            fg_color="#333333",
+            button_color="#4d90fe",
+            button_hover_color="#3a7bd5",
+            text_color="#ffffff"
+        ).pack(side="right", padx=5)
+
+    def _priority_value(self, label):
+        for value, text in self.PRIORITY_LABELS.items():
+            if text == label:
+                return value
+        return 1
@@ -102,7 +102,3 @@ class URLInputComponent(ctk.CTkFrame):
     def get_url(self):
         """Get the current URL from the entry."""
         return self.url_entry.get().strip()
-    
-    def set_state(self, state):
-        """Set the state of the URL entry."""
-        self.url_entry.configure(state=state)
\ No newline at end of file
@@ -0,0 +1,369 @@
+"""Long-running download daemon with a localhost HTTP/JSON job API.
+
+    POST   /jobs                 queue a job: {"url", "download_path", "media_type",
+                                 "quality_selection", "download_type", "priority"}
+    GET    /jobs                 list jobs
+    GET    /jobs/<id>            one job with live progress
+    GET    /jobs/<id>/events     server-sent events until the job finishes
+    DELETE /jobs/<id>            cancel a running job or remove a queued one
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from services.download_service import DownloadService
+from services.download_queue import DownloadQueue
+from services.job_journal import JobJournal
+from services.bandwidth_limiter import BandwidthLimiter
+from utils.app_paths import AppPaths
+from utils.progress_aggregator import ProgressAggregator
+from utils.validators import URLValidator
+from utils.ssl_setup import setup_ssl
+
+DEFAULT_PORT = 8765
+
+MEDIA_QUALITIES = {
+    "Video": ["2160p (4K)", "1440p (2K)", "1080p", "720p"],
+    "Audio Only": ["MP3 (128kbps)", "MP3 (320kbps)", "WAV", "M4A"],
+}
+DEFAULT_QUALITY = {"Video": "1080p", "Audio Only": "MP3 (128kbps)"}
+
+
+class JobMonitor:
+    """Live progress of the job the download queue is running, for polling and SSE."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._running_id = None
+        self._state = {}
+        self.version = 0
+
+    def job_started(self, entry_id):
+        with self._condition:
+            self._running_id = entry_id
+            self._state = {'fraction': 0.0, 'status': "Starting...", 'items': {}}
+            self._notify()
+
+    def job_finished(self, entry_id, status, message):
+        with self._condition:
+            if self._running_id == entry_id:
+                self._running_id = None
+                self._state = {}
+            self._notify()
+
+    def on_progress(self, fraction):
+        with self._condition:
+            if self._running_id is not None:
+                self._state['fraction'] = fraction
+                self._notify()
+
+    def on_status(self, status):
+        with self._condition:
+            if self._running_id is not None:
+                self._state['status'] = status  # May be a deferred callable; resolved when read
+                self._notify()
+
+    def on_item_progress(self, position, percentage, status):
+        with self._condition:
+            if self._running_id is None:
+                return
+            items = self._state['items']
+            if status is None:
+                items.pop(position, None)
+            else:
+                items[position] = {'fraction': percentage, 'status': status}
+            self._notify()
+
+    def progress_for(self, entry_id):
+        """Snapshot of the live progress of entry_id, or None if it is not running."""
+        with self._condition:
+            if entry_id != self._running_id:
+                return None
+            state = self._state
+            return {
+                'fraction': round(state.get('fraction', 0.0), 4),
+                'status': ProgressAggregator.resolve_status(state.get('status')),
+                'items': {
+                    str(position): {
+                        'fraction': round(item['fraction'], 4),
+                        'status': ProgressAggregator.resolve_status(item['status']),
+                    }
+                    for position, item in sorted(state.get('items', {}).items())
+                },
+            }
+
+    def wait_for_change(self, version, timeout):
+        """Block until the version moves past the given one; returns the current version."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    def _notify(self):
+        self.version += 1
+        self._condition.notify_all()
+
+
+class DownloadDaemon:
+    """Owns the warm DownloadService and turns API calls into queue operations."""
+
+    def __init__(self, default_download_path, queue_path=None, journal_path=None):
+        self.default_download_path = default_download_path
+        self.monitor = JobMonitor()
+        self.queue = DownloadQueue(queue_path or AppPaths.data_file("daemon_queue.sqlite3"))
+        # Own journal too: the GUI would otherwise offer to resume the daemon's running jobs
+        self.journal = JobJournal(journal_path or AppPaths.data_file("daemon_jobs.sqlite3"))
+        self.service = DownloadService(
+            progress_callback=self.monitor.on_progress,
+            status_callback=self.monitor.on_status,
+            completion_callback=lambda status, message: None,
+            item_progress_callback=self.monitor.on_item_progress,
+            job_journal=self.journal,
+            download_queue=self.queue,
+            queue_callback=self._on_queue_update
+        )
+
+    def start(self):
+        self.service.start_queue()
+
+    def _on_queue_update(self, entry_id, status, message):
+        if status == "running":
+            self.monitor.job_started(entry_id)
+        else:
+            self.monitor.job_finished(entry_id, status, message)
+
+    def submit(self, payload):
+        """Validate a job request and queue it; returns the job dict."""
+        url = str(payload.get('url', '')).strip()
+        if not URLValidator.validate_url(url):
+            raise ValueError("Invalid YouTube URL format.")
+
+        media_type = payload.get('media_type', "Video")
+        if media_type not in MEDIA_QUALITIES:
+            raise ValueError(f"media_type must be one of: {', '.join(MEDIA_QUALITIES)}")
+        quality_selection = payload.get('quality_selection') or DEFAULT_QUALITY[media_type]
+        if quality_selection not in MEDIA_QUALITIES[media_type]:
+            raise ValueError(f"quality_selection must be one of: {', '.join(MEDIA_QUALITIES[media_type])}")
+
+        download_type = payload.get('download_type') or ("playlist" if URLValidator.is_playlist(url) else "video")
+        if download_type not in ("video", "playlist"):
+            raise ValueError("download_type must be 'video' or 'playlist'")
+
+        priority = payload.get('priority', DownloadQueue.PRIORITY_NORMAL)
+        if priority not in (DownloadQueue.PRIORITY_LOW, DownloadQueue.PRIORITY_NORMAL, DownloadQueue.PRIORITY_HIGH):
+            raise ValueError("priority must be 0 (low), 1 (normal) or 2 (high)")
+
+        download_path = payload.get('download_path') or self.default_download_path
+        os.makedirs(download_path, exist_ok=True)
+        entry_id = self.service.enqueue_download(
+            url, download_path, download_type, media_type, quality_selection, priority=priority
+        )
+        return self.get_job(entry_id)
+
+    def list_jobs(self):
+        return [self._to_job(entry) for entry in self.queue.entries()]
+
+    def get_job(self, entry_id):
+        entry = self.queue.get(entry_id)
+        return self._to_job(entry) if entry else None
+
+    def cancel(self, entry_id):
+        """Cancel the job if it is running, otherwise drop it from the queue."""
+        job = self.get_job(entry_id)
+        if job is None:
+            return None
+        if job['state'] == DownloadQueue.RUNNING:
+            self.service.cancel_download()
+        else:
+            self.queue.remove(entry_id)
+        return job
+
+    def _to_job(self, entry):
+        request = entry['request']
+        return {
+            'job_id': entry['entry_id'],
+            'state': entry['state'],
+            'priority': entry['priority'],
+            'url': request.get('url'),
+            'download_path': request.get('download_path'),
+            'media_type': request.get('media_type'),
+            'quality_selection': request.get('quality_selection'),
+            'download_type': request.get('download_type'),
+            'message': entry.get('message'),
+            'progress': self.monitor.progress_for(entry['entry_id']),
+        }
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """JSON request handler; the daemon instance is attached to the server.
+
+    Only local, non-browser clients are served: requests carrying an Origin
+    header or a Host other than this machine are refused (cross-site
+    requests from web pages, DNS rebinding), and job submissions must be
+    application/json, which browsers cannot send cross-site without a
+    preflight.
+    """
+
+    JOB_PATH = re.compile(r'^/jobs/(\d+)(/events)?$')
+    SSE_KEEPALIVE = 15  # Seconds between comment lines on an idle event stream
+    SSE_MIN_INTERVAL = 0.25  # Seconds between events on one stream
+    LOCAL_HOSTS = ('127.0.0.1', 'localhost', '[::1]')
+
+    @property
+    def daemon_app(self):
+        return self.server.daemon_app
+
+    def do_GET(self):
+        if not self._check_client():
+            return
+        if self.path == '/jobs':
+            return self._send_json(200, {'jobs': self.daemon_app.list_jobs()})
+        match = self.JOB_PATH.match(self.path)
+        if not match:
+            return self._send_json(404, {'error': "Not found"})
+        entry_id = int(match.group(1))
+        if match.group(2):
+            return self._stream_events(entry_id)
+        job = self.daemon_app.get_job(entry_id)
+        if job is None:
+            return self._send_json(404, {'error': f"Job {entry_id} not found"})
+        self._send_json(200, job)
+
+    def do_POST(self):
+        if not self._check_client():
+            return
+        if self.path != '/jobs':
+            return self._send_json(404, {'error': "Not found"})
+        content_type = (self.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            return self._send_json(415, {'error': "Content-Type must be application/json"})
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(payload, dict):
+                raise ValueError("Request body must be a JSON object")
+            job = self.daemon_app.submit(payload)
+        except (ValueError, OSError) as e:
+            return self._send_json(400, {'error': str(e)})
+        self._send_json(201, job)
+
+    def do_DELETE(self):
+        if not self._check_client():
+            return
+        match = self.JOB_PATH.match(self.path)
+        if not match or match.group(2):
+            return self._send_json(404, {'error': "Not found"})
+        job = self.daemon_app.cancel(int(match.group(1)))
+        if job is None:
+            return self._send_json(404, {'error': f"Job {match.group(1)} not found"})
+        self._send_json(202, job)
+
+    def _stream_events(self, entry_id):
+        """Send the job as a server-sent event whenever it changes, until it has finished.
+
+        Events are rate-limited to one per SSE_MIN_INTERVAL and skipped when
+        nothing visible changed.
+        """
+        job = self.daemon_app.get_job(entry_id)
+        if job is None:
+            return self._send_json(404, {'error': f"Job {entry_id} not found"})
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        monitor = self.daemon_app.monitor
+        version = monitor.version
+        sent = None
+        try:
+            while True:
+                data = json.dumps(job)
+                if data != sent:
+                    self.wfile.write(f"event: job\ndata: {data}\n\n".encode('utf-8'))
+                    self.wfile.flush()
+                    sent = data
+                    sent_at = time.monotonic()
+                if job['state'] not in (DownloadQueue.QUEUED, DownloadQueue.RUNNING):
+                    return
+                new_version = monitor.wait_for_change(version, self.SSE_KEEPALIVE)
+                if new_version == version:
+                    self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+                    continue
+                # Progress notifies per chunk; coalesce into at most one event per interval
+                delay = sent_at + self.SSE_MIN_INTERVAL - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                version = monitor.version
+                job = self.daemon_app.get_job(entry_id)
+                if job is None:
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _check_client(self):
+        """Refuse browser and non-local requests with 403; returns True when the request may proceed."""
+        port = self.server.server_address[1]
+        allowed = {f"{host}:{port}" for host in self.LOCAL_HOSTS}
+        if self.headers.get('Origin') is not None:
+            self._send_json(403, {'error': "Cross-origin requests are not allowed"})
+            return False
+        if (self.headers.get('Host') or '').lower() not in allowed:
+            self._send_json(403, {'error': "Host must be 127.0.0.1 or localhost"})
+            return False
+        return True
+
+    def _send_json(self, code, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        print(f"Daemon: {self.address_string()} {format % args}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="YouTube Downloader Pro job API daemon")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument("-o", "--output", default=os.path.join(os.path.expanduser("~"), "Downloads"),
+                        help="default download folder for jobs that do not give one")
+    parser.add_argument("--limit", help="bandwidth limit shared by all jobs, e.g. 5M")
+    parser.add_argument("--staging-dir",
+                        help="folder for partial and intermediate files (default: hidden folder in the target)")
+    args = parser.parse_args(argv)
+    try:
+        rate = BandwidthLimiter.parse_rate(args.limit)
+    except ValueError as e:
+        parser.error(str(e))
+
+    setup_ssl()
+    app = DownloadDaemon(args.output)
+    app.service.bandwidth_limiter.set_rate(rate)
+    app.service.staging.root = args.staging_dir
+    app.start()
+
+    server = ThreadingHTTPServer((args.host, args.port), ApiHandler)
+    server.daemon_threads = True
+    server.daemon_app = app
+    print(f"Daemon: Listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        app.service.cancel_download()
+        app.service.postprocess_pipeline.shutdown(wait=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
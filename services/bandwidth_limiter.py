@@ -0,0 +1,136 @@
+import re
+import threading
+import time
+from datetime import datetime
+
+
+class BandwidthWindow:
+    """Time-of-day window with its own rate; start > end wraps past midnight."""
+
+    def __init__(self, start, end, rate):
+        self.start = self._parse_time(start)
+        self.end = self._parse_time(end)
+        self.rate = rate or None  # Bytes per second, None = unlimited
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a window from a settings entry like {"start": "09:00", "end": "18:00", "limit": "5M"}."""
+        return cls(data['start'], data['end'], BandwidthLimiter.parse_rate(data.get('limit')))
+
+    def contains(self, moment):
+        minutes = moment.hour * 60 + moment.minute
+        if self.start <= self.end:
+            return self.start <= minutes < self.end
+        return minutes >= self.start or minutes < self.end
+
+    @staticmethod
+    def _parse_time(value):
+        hours, minutes = str(value).split(':')
+        return int(hours) * 60 + int(minutes)
+
+
+class BandwidthLimiter:
+    """Process-wide token bucket that every active download draws from.
+
+    Progress hooks report the bytes each chunk added and consume() blocks the
+    download thread until the bucket has paid them back, so the combined rate
+    of all downloads stays at the configured limit. A time-of-day window, when
+    one matches, overrides the base rate.
+    """
+
+    RATE_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([KMG]?)(?:I?B)?(?:/S)?\s*$')
+    MULTIPLIERS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+    BURST_SECONDS = 1.0  # Bucket capacity in seconds of traffic
+    MAX_SLEEP = 0.25  # Re-check cancellation and rate changes at least this often
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, rate=None, windows=None):
+        self._rate = rate or None
+        self._windows = list(windows or [])
+        self._tokens = 0.0
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """Return the limiter shared by every download in this process."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def parse_rate(value):
+        """Parse "5M", "500K", "1.5 MB/s" or a number of bytes per second; empty/0 means unlimited.
+
+        Raises ValueError with a message fit to show the user for anything else.
+        """
+        if value in (None, '', 0):
+            return None
+        if isinstance(value, (int, float)):
+            return float(value) if value > 0 else None
+
+        text = str(value).strip().upper()
+        if text in ('', 'UNLIMITED'):
+            return None
+        match = BandwidthLimiter.RATE_PATTERN.match(text)
+        if not match:
+            raise ValueError(f"invalid speed limit '{value}', expected e.g. 500K, 5M or 1.5 MB/s")
+        rate = float(match.group(1)) * BandwidthLimiter.MULTIPLIERS[match.group(2)]
+        return rate if rate > 0 else None
+
+    def set_rate(self, rate):
+        """Set the base limit in bytes per second (None = unlimited); applies to running downloads."""
+        with self._lock:
+            self._rate = rate or None
+
+    def set_windows(self, windows):
+        """Replace the time-of-day windows."""
+        with self._lock:
+            self._windows = list(windows or [])
+
+    def current_rate(self):
+        """Limit in effect right now, in bytes per second, or None when unlimited."""
+        with self._lock:
+            return self._current_rate()
+
+    def consume(self, nbytes, token=None):
+        """Charge nbytes against the bucket, sleeping until they are paid back."""
+        if nbytes <= 0:
+            return
+        with self._lock:
+            rate = self._current_rate()
+            if rate is None:
+                return
+            self._refill(rate)
+            self._tokens -= nbytes
+
+        while True:
+            if token is not None and token.is_cancelled:
+                return
+            with self._lock:
+                rate = self._current_rate()
+                if rate is None:
+                    self._tokens = 0.0
+                    return
+                self._refill(rate)
+                if self._tokens >= 0:
+                    return
+                delay = -self._tokens / rate
+            time.sleep(min(delay, self.MAX_SLEEP))
+
+    def _current_rate(self):
+        if self._windows:
+            now = datetime.now()
+            for window in self._windows:
+                if window.contains(now):
+                    return window.rate
+        return self._rate
+
+    def _refill(self, rate):
+        now = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._last_refill) * rate, rate * self.BURST_SECONDS)
+        self._last_refill = now
@@ -0,0 +1,47 @@
+import threading
+
+
+class DownloadCancelled(Exception):
+    """Raised inside a download when the user cancels it."""
+
+    permanent = True  # Never retried by RetryPolicy
+
+    def __init__(self, message="Download cancelled by user"):
+        super().__init__(message)
+
+
+class CancellationToken:
+    """Cooperative cancel/pause flag checked by progress hooks and between playlist items."""
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    @property
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def is_paused(self):
+        return not self._running.is_set()
+
+    def cancel(self):
+        """Request cancellation; paused downloads are released so they can stop."""
+        self._cancelled.set()
+        self._running.set()
+
+    def pause(self):
+        """Block downloads at their next check until resume() or cancel() is called."""
+        if not self.is_cancelled:
+            self._running.clear()
+
+    def resume(self):
+        """Let paused downloads continue."""
+        self._running.set()
+
+    def check(self):
+        """Wait while paused, then raise DownloadCancelled if cancellation was requested."""
+        self._running.wait()
+        if self._cancelled.is_set():
+            raise DownloadCancelled()
@@ -0,0 +1,74 @@
+import os
+import threading
+
+
+class DownloadArchive:
+    """In-memory set of downloaded video ids backed by an archive file in the download folder.
+
+    The file uses yt-dlp's --download-archive format ("youtube <id>" per line),
+    so yt-dlp can read and append to the same file directly.
+    """
+
+    FILE_NAME = ".download_archive.txt"
+    EXTRACTOR = "youtube"
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, download_path):
+        self.path = os.path.join(download_path, self.FILE_NAME)
+        self._video_ids = set()
+        self._offset = 0
+        self._lock = threading.Lock()
+        self.refresh()
+
+    @classmethod
+    def for_path(cls, download_path):
+        """Return the shared archive for a download folder, picking up lines appended by yt-dlp."""
+        key = os.path.normcase(os.path.abspath(download_path))
+        with cls._instances_lock:
+            archive = cls._instances.get(key)
+            if archive is None:
+                archive = cls._instances[key] = cls(download_path)
+                return archive
+        archive.refresh()
+        return archive
+
+    def refresh(self):
+        """Read any lines added to the archive file since the last load."""
+        with self._lock:
+            self._read_new_lines()
+
+    def _read_new_lines(self):
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # Partially written line; read it on the next refresh
+                    parts = line.decode('utf-8', errors='replace').split()
+                    if len(parts) == 2:
+                        self._video_ids.add(parts[1])
+                    self._offset += len(line)
+        except FileNotFoundError:
+            pass
+
+    def __contains__(self, video_id):
+        return bool(video_id) and video_id in self._video_ids
+
+    def __len__(self):
+        return len(self._video_ids)
+
+    def add(self, video_id):
+        """Record a finished download."""
+        if not video_id:
+            return
+        with self._lock:
+            self._read_new_lines()
+            if video_id in self._video_ids:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'ab') as f:
+                f.write(f"{self.EXTRACTOR} {video_id}\n".encode('utf-8'))
+                self._offset = f.tell()
+            self._video_ids.add(video_id)
@@ -0,0 +1,180 @@
+import json
+import sqlite3
+import threading
+import time
+from utils.app_paths import AppPaths
+
+
+class DownloadQueue:
+    """Persistent, prioritized queue of download jobs stored in SQLite.
+
+    Entries are served highest priority first, then in their manual order, and
+    survive restarts; entries that were running when the app closed are put
+    back in the queue on startup.
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    KIND_SINGLE = 'single'
+    KIND_PLAYLIST = 'playlist'
+    KIND_RESUME = 'resume'
+
+    PRIORITY_LOW = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_HIGH = 2
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or AppPaths.data_file("queue.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._setup_schema()
+
+    def _setup_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS queue (
+                    entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    priority INTEGER NOT NULL,
+                    sort_order REAL NOT NULL,
+                    kind TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    request TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    message TEXT
+                )
+            """)
+
+    def add(self, kind, title, request, priority=PRIORITY_NORMAL):
+        """Append a job; request is a JSON-serialisable dict of start arguments. Returns the entry id."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT MAX(sort_order) FROM queue").fetchone()
+            sort_order = (row[0] or 0) + 1
+            cursor = self._conn.execute(
+                "INSERT INTO queue (created_at, updated_at, priority, sort_order, kind, title, request, state) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (now, now, priority, sort_order, kind, title, json.dumps(request), self.QUEUED)
+            )
+        return cursor.lastrowid
+
+    def claim_next(self):
+        """Mark the next queued entry as running and return it, or None when the queue is empty."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT * FROM queue WHERE state = ? ORDER BY priority DESC, sort_order LIMIT 1",
+                (self.QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE queue SET state = ?, updated_at = ? WHERE entry_id = ?",
+                (self.RUNNING, time.time(), row['entry_id'])
+            )
+        entry = self._to_entry(row)
+        entry['state'] = self.RUNNING
+        return entry
+
+    def finish(self, entry_id, state, message=None):
+        """Record the outcome of a running entry (DONE, FAILED or CANCELLED)."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE queue SET state = ?, message = ?, updated_at = ? WHERE entry_id = ?",
+                (state, message, time.time(), entry_id)
+            )
+
+    def set_request(self, entry_id, request):
+        """Replace an entry's start arguments, e.g. to record the journal job a running entry created."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE queue SET request = ?, updated_at = ? WHERE entry_id = ?",
+                (json.dumps(request), time.time(), entry_id)
+            )
+
+    def set_priority(self, entry_id, priority):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE queue SET priority = ?, updated_at = ? WHERE entry_id = ?",
+                (priority, time.time(), entry_id)
+            )
+
+    def move(self, entry_id, offset):
+        """Move a queued entry up (offset < 0) or down within its priority band."""
+        with self._lock, self._conn:
+            current = self._conn.execute(
+                "SELECT priority, sort_order FROM queue WHERE entry_id = ? AND state = ?",
+                (entry_id, self.QUEUED)
+            ).fetchone()
+            if current is None:
+                return
+            if offset < 0:
+                query = ("SELECT entry_id, sort_order FROM queue WHERE state = ? AND priority = ? "
+                         "AND sort_order < ? ORDER BY sort_order DESC LIMIT 1")
+            else:
+                query = ("SELECT entry_id, sort_order FROM queue WHERE state = ? AND priority = ? "
+                         "AND sort_order > ? ORDER BY sort_order LIMIT 1")
+            neighbour = self._conn.execute(
+                query, (self.QUEUED, current['priority'], current['sort_order'])
+            ).fetchone()
+            if neighbour is None:
+                return
+            self._conn.execute("UPDATE queue SET sort_order = ? WHERE entry_id = ?",
+                               (neighbour['sort_order'], entry_id))
+            self._conn.execute("UPDATE queue SET sort_order = ? WHERE entry_id = ?",
+                               (current['sort_order'], neighbour['entry_id']))
+
+    def remove(self, entry_id):
+        """Delete an entry unless it is currently running."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM queue WHERE entry_id = ? AND state != ?", (entry_id, self.RUNNING))
+
+    def clear_finished(self):
+        """Delete every entry that is no longer queued or running."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM queue WHERE state NOT IN (?, ?)", (self.QUEUED, self.RUNNING))
+
+    def requeue_interrupted(self):
+        """Put entries left running by a previous session back in the queue; returns how many."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE queue SET state = ?, updated_at = ? WHERE state = ?",
+                (self.QUEUED, time.time(), self.RUNNING)
+            )
+        return cursor.rowcount
+
+    def get(self, entry_id):
+        """Return one entry, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM queue WHERE entry_id = ?", (entry_id,)).fetchone()
+        return self._to_entry(row) if row else None
+
+    def entries(self):
+        """Return all entries: running first, then queued in serving order, then finished."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM queue ORDER BY "
+                "CASE state WHEN ? THEN 0 WHEN ? THEN 1 ELSE 2 END, "
+                "CASE WHEN state = ? THEN -priority ELSE 0 END, "
+                "CASE WHEN state = ? THEN sort_order ELSE -updated_at END",
+                (self.RUNNING, self.QUEUED, self.QUEUED, self.QUEUED)
+            ).fetchall()
+        return [self._to_entry(row) for row in rows]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _to_entry(row):
+        entry = dict(row)
+        entry['request'] = json.loads(entry['request'])
+        return entry
@@ -1,161 +1,808 @@
 import os
-import time
 import threading
-import yt_dlp
-from tkinter import messagebox
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from services.ydl_pool import YoutubeDLPool
+from services.job_journal import JobJournal
+from services.download_archive import DownloadArchive
+from services.retry_policy import RetryPolicy, RetryStats
+from services.cancellation import CancellationToken
+from services.progress_tracker import AggregateProgressTracker
+from services.fragment_tuner import FragmentTuner
+from services.postprocess_pipeline import PostProcessPipeline, run_ffmpeg_job
+from services.bandwidth_limiter import BandwidthLimiter
+from services.download_queue import DownloadQueue
+from services.preflight import DiskPreflight
+from services.info_store import InfoStore
+from services.staging import StagingArea
+from utils.formatters import Formatter
 
 
 class DownloadService:
     """Enhanced download service with playlist and single video support."""
 
-    def __init__(self, progress_callback, status_callback, completion_callback):
+    DEFAULT_CONCURRENT_DOWNLOADS = 3
+    DEFAULT_PLAYLIST_FOLDER = "Playlist_Download"
+
+    # 'format' prefers sources that can be stream-copied into the target, so only real conversions transcode
+    AUDIO_FORMATS = {
+        "MP3 (128kbps)": {
+            'codec': 'mp3', 'quality': '128', 'ext': 'mp3',
+            'format': 'bestaudio[acodec=mp3]/bestaudio/best'
+        },
+        "MP3 (320kbps)": {
+            'codec': 'mp3', 'quality': '320', 'ext': 'mp3',
+            'format': 'bestaudio[acodec=mp3]/bestaudio/best'
+        },
+        "WAV": {
+            'codec': 'wav', 'ext': 'wav',
+            'format': 'bestaudio/best'
+        },
+        "M4A": {
+            'codec': 'm4a', 'ext': 'm4a',
+            'format': 'bestaudio[ext=m4a]/bestaudio[acodec^=mp4a]/bestaudio/best'
+        }
+    }
+
+    def __init__(self, progress_callback, status_callback, completion_callback,
+                 item_progress_callback=None, max_concurrent_downloads=DEFAULT_CONCURRENT_DOWNLOADS,
+                 job_journal=None, retry_policy=None, bandwidth_limiter=None, download_queue=None,
+                 queue_callback=None):
         self.progress_callback = progress_callback
+        # Status may be a string or a zero-argument callable that formats it on demand
         self.status_callback = status_callback
         self.completion_callback = completion_callback
+        # Called as (position, percentage, status); status is None once the item is done
+        self.item_progress_callback = item_progress_callback
+        self.max_concurrent_downloads = max_concurrent_downloads
+        self.ydl_pool = YoutubeDLPool()
+        self.job_journal = job_journal or JobJournal()
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Fragment parallelism for DASH/HLS: an int, or FragmentTuner.AUTO to tune from throughput
+        self.fragment_downloads = FragmentTuner.AUTO
+        self.fragment_tuner = FragmentTuner()
+        self.postprocess_pipeline = PostProcessPipeline()
+        self.preflight = DiskPreflight()
+        # Info extracted by the preview services; reused so a video is not extracted twice
+        self.info_store = InfoStore.shared()
+        # Intermediate files live here; finished files are published into the download folder
+        self.staging = StagingArea()
+        # Shared by every download so the combined rate stays under the configured limit
+        self.bandwidth_limiter = bandwidth_limiter or BandwidthLimiter.shared()
+        self.download_queue = download_queue or DownloadQueue()
+        # Called as (entry_id, status, message) when a queued job starts ("running") and finishes
+        self.queue_callback = queue_callback
+        self._queue_wakeup = threading.Event()
+        self._queue_thread = None
         self.current_video_index = 0
         self.total_playlist_videos = 0
+        self._active_tokens = set()
+        self._active_jobs = set()  # Journal job ids being downloaded right now
+        self._tokens_lock = threading.Lock()
 
     def start_download(self, url, download_path, download_type, media_type, quality_selection):
-        """Start regular download in a separate thread."""
+        """Start regular download in a separate thread; returns its cancellation token."""
+        token = self._register_token()
         thread = threading.Thread(
             target=self._download_worker,
-            args=(url, download_path, download_type, media_type, quality_selection),
+            args=(url, download_path, download_type, media_type, quality_selection, token),
             daemon=True
         )
         thread.start()
+        return token
 
-    def start_playlist_download(self, selected_videos, download_path, media_type, quality_selection):
-        """Start playlist download for selected videos."""
+    def start_playlist_download(self, selected_videos, download_path, media_type, quality_selection,
+                                max_concurrent_downloads=None, check_disk_space=True):
+        """Start playlist download for selected videos; returns its cancellation token."""
+        token = self._register_token()
+        thread = threading.Thread(
+            target=self._playlist_download_worker,
+            args=(selected_videos, download_path, media_type, quality_selection, max_concurrent_downloads,
+                  None, token, None, check_disk_space),
+            daemon=True
+        )
+        thread.start()
+        return token
+
+    def cancel_download(self):
+        """Cancel every running download at its next progress update or item boundary."""
+        for token in self._snapshot_tokens():
+            token.cancel()
+        self.status_callback("Cancelling...")
+
+    def pause_download(self):
+        """Pause every running download until resume_download() is called."""
+        for token in self._snapshot_tokens():
+            token.pause()
+        self.status_callback("Paused")
+
+    def resume_download(self):
+        """Resume paused downloads."""
+        for token in self._snapshot_tokens():
+            token.resume()
+        self.status_callback("Resuming...")
+
+    def _register_token(self):
+        token = CancellationToken()
+        with self._tokens_lock:
+            self._active_tokens.add(token)
+        return token
+
+    def _release_token(self, token):
+        with self._tokens_lock:
+            self._active_tokens.discard(token)
+
+    def _snapshot_tokens(self):
+        with self._tokens_lock:
+            return list(self._active_tokens)
+
+    def get_resumable_jobs(self):
+        """Return journaled playlist jobs that were interrupted before finishing.
+
+        Jobs downloading right now or still held by a queue entry (queued,
+        running, or re-queued after a restart) are left out.
+        """
+        with self._tokens_lock:
+            claimed = set(self._active_jobs)
+        for entry in self.download_queue.entries():
+            if entry['state'] in (DownloadQueue.QUEUED, DownloadQueue.RUNNING):
+                claimed.add(entry['request'].get('job_id'))
+        return [job for job in self.job_journal.unfinished_jobs() if job['job_id'] not in claimed]
+
+    def resume_playlist_download(self, job_id, max_concurrent_downloads=None):
+        """Resume an interrupted playlist job, skipping finished items and continuing .part files."""
+        kwargs = self._resume_args(job_id, max_concurrent_downloads)
+        if kwargs is None:
+            self.completion_callback("error", f"Download job {job_id} not found.")
+            return
+
+        token = self._register_token()
         thread = threading.Thread(
             target=self._playlist_download_worker,
-            args=(selected_videos, download_path, media_type, quality_selection),
+            kwargs=dict(kwargs, token=token),
             daemon=True
         )
         thread.start()
+        return token
+
+    def _resume_args(self, job_id, max_concurrent_downloads):
+        """Playlist worker keyword arguments (without the token) that continue a journaled job."""
+        job = self.job_journal.get_job(job_id)
+        if not job:
+            return None
+        videos = [
+            {'id': item['video_id'], 'url': item['url'], 'title': item['title']}
+            for item in self.job_journal.get_items(job_id)
+        ]
+        return {
+            'selected_videos': videos,
+            'download_path': job['download_path'],
+            'media_type': job['media_type'],
+            'quality_selection': job['quality_selection'],
+            'max_concurrent_downloads': max_concurrent_downloads,
+            'job_id': job_id,
+            'folder_name': job.get('folder_name'),
+        }
+
+    def enqueue_download(self, url, download_path, download_type, media_type, quality_selection,
+                         priority=DownloadQueue.PRIORITY_NORMAL, title=None):
+        """Queue a regular download; returns the queue entry id."""
+        request = {
+            'url': url, 'download_path': download_path, 'download_type': download_type,
+            'media_type': media_type, 'quality_selection': quality_selection,
+            'fragment_downloads': self.fragment_downloads,
+        }
+        return self._enqueue(DownloadQueue.KIND_SINGLE, title or url, request, priority)
+
+    def enqueue_playlist_download(self, selected_videos, download_path, media_type, quality_selection,
+                                  max_concurrent_downloads=None, priority=DownloadQueue.PRIORITY_NORMAL,
+                                  title=None, check_disk_space=True):
+        """Queue a download of selected playlist videos; returns the queue entry id."""
+        request = {
+            'selected_videos': selected_videos, 'download_path': download_path, 'media_type': media_type,
+            'quality_selection': quality_selection, 'max_concurrent_downloads': max_concurrent_downloads,
+            'fragment_downloads': self.fragment_downloads, 'check_disk_space': check_disk_space,
+        }
+        title = title or f"Playlist: {len(selected_videos)} videos"
+        return self._enqueue(DownloadQueue.KIND_PLAYLIST, title, request, priority)
+
+    def enqueue_resume(self, job_id, max_concurrent_downloads=None, priority=DownloadQueue.PRIORITY_HIGH):
+        """Queue the continuation of an interrupted playlist job; returns the queue entry id."""
+        request = {
+            'job_id': job_id, 'max_concurrent_downloads': max_concurrent_downloads,
+            'fragment_downloads': self.fragment_downloads,
+        }
+        return self._enqueue(DownloadQueue.KIND_RESUME, f"Resume job {job_id}", request, priority)
+
+    def _enqueue(self, kind, title, request, priority):
+        entry_id = self.download_queue.add(kind, title, request, priority)
+        self._queue_wakeup.set()
+        return entry_id
+
+    def start_queue(self):
+        """Start draining the queue in the background, one job at a time."""
+        if self._queue_thread is not None:
+            return
+        requeued = self.download_queue.requeue_interrupted()
+        if requeued:
+            print(f"DownloadService: Re-queued {requeued} job(s) interrupted in a previous session")
+        self._queue_thread = threading.Thread(target=self._queue_worker, name="download-queue", daemon=True)
+        self._queue_thread.start()
+
+    def wake_queue(self):
+        """Re-check the queue, e.g. after entries were reprioritised."""
+        self._queue_wakeup.set()
+
+    def _queue_worker(self):
+        while True:
+            self._queue_wakeup.clear()
+            entry = self.download_queue.claim_next()
+            if entry is None:
+                self._queue_wakeup.wait()
+                continue
+            try:
+                self._run_queue_entry(entry)
+            except Exception as e:
+                # A broken entry (e.g. a malformed request) must not stop the queue thread
+                message = f"Queued download failed: {str(e)}"
+                print(f"DownloadService: Queue entry {entry['entry_id']} failed: {e}")
+                self.download_queue.finish(entry['entry_id'], DownloadQueue.FAILED, message)
+                if self.queue_callback:
+                    self.queue_callback(entry['entry_id'], "error", message)
+
+    def _run_queue_entry(self, entry):
+        """Run one queued job to completion on the queue thread."""
+        request = entry['request']
+        outcome = []
+
+        def on_complete(status, message):
+            outcome.append((status, message))
+
+        token = self._register_token()
+        fragment_downloads = request.get('fragment_downloads', self.fragment_downloads)
+        if self.queue_callback:
+            self.queue_callback(entry['entry_id'], "running", None)
 
-    def _playlist_download_worker(self, selected_videos, download_path, media_type, quality_selection):
-        """Worker method for downloading selected playlist videos."""
+        try:
+            if entry['kind'] == DownloadQueue.KIND_SINGLE:
+                self._download_worker(
+                    request['url'], request['download_path'], request['download_type'], request['media_type'],
+                    request['quality_selection'], token, on_complete, fragment_downloads
+                )
+            elif entry['kind'] == DownloadQueue.KIND_PLAYLIST:
+                job_id = request.get('job_id')
+                if job_id is None or not self.job_journal.get_job(job_id):
+                    job_id = self.job_journal.create_job(
+                        request['download_path'], request['media_type'], request['quality_selection'],
+                        request['selected_videos']
+                    )
+                    # Kept with the entry so a run interrupted by a restart continues this job
+                    self.download_queue.set_request(entry['entry_id'], dict(request, job_id=job_id))
+                self._playlist_download_worker(
+                    request['selected_videos'], request['download_path'], request['media_type'],
+                    request['quality_selection'], request.get('max_concurrent_downloads'), job_id, token,
+                    on_complete, request.get('check_disk_space', True), fragment_downloads=fragment_downloads
+                )
+            else:
+                kwargs = self._resume_args(request['job_id'], request.get('max_concurrent_downloads'))
+                if kwargs is None:
+                    on_complete("error", f"Download job {request['job_id']} not found.")
+                else:
+                    self._playlist_download_worker(token=token, on_complete=on_complete,
+                                                   fragment_downloads=fragment_downloads, **kwargs)
+        finally:
+            self._release_token(token)
+
+        status, message = outcome[-1] if outcome else ("error", "Download ended without a result.")
+        state = {
+            "success": DownloadQueue.DONE,
+            "cancelled": DownloadQueue.CANCELLED,
+        }.get(status, DownloadQueue.FAILED)
+        self.download_queue.finish(entry['entry_id'], state, message)
+
+        if self.queue_callback:
+            self.queue_callback(entry['entry_id'], status, message)
+        else:
+            self.completion_callback(status, message)
+
+    def _playlist_download_worker(self, selected_videos, download_path, media_type, quality_selection,
+                                  max_concurrent_downloads=None, job_id=None, token=None, on_complete=None,
+                                  check_disk_space=True, folder_name=None, fragment_downloads=None):
+        """Worker method for downloading selected playlist videos with N downloads in flight.
+
+        Unless check_disk_space is False, the batch is refused up front when its
+        estimated size does not fit on the target volume; each item is checked
+        again when it starts either way.
+
+        When ffmpeg is available, merging/conversion is handed to the post-processing
+        pipeline so the next download starts while earlier items are transcoded.
+        """
+        token = token or CancellationToken()
+        complete = on_complete or self.completion_callback
         try:
             self.status_callback("Preparing playlist download...")
             self.total_playlist_videos = len(selected_videos)
             self.current_video_index = 0
-            format_options = self._get_format_options(media_type, quality_selection)
+            pipelined = self.postprocess_pipeline.is_available()
+            format_options = self._get_format_options(media_type, quality_selection, pipelined=pipelined)
+            postprocess_spec = self._get_postprocess_spec(media_type, quality_selection) if pipelined else None
+            ydl_opts = self._build_ydl_opts(format_options)
 
-            playlist_folder = os.path.join(download_path, "Playlist_Download")
+            playlist_folder = os.path.join(download_path, folder_name or self.DEFAULT_PLAYLIST_FOLDER)
             os.makedirs(playlist_folder, exist_ok=True)
+            staging_folder = self.staging.staging_dir(playlist_folder)
+
+            max_workers = max(1, min(max_concurrent_downloads or self.max_concurrent_downloads,
+                                     self.total_playlist_videos or 1))
+            progress = AggregateProgressTracker()
 
-            successful_downloads = 0
+            if job_id is None:
+                job_id = self.job_journal.create_job(
+                    download_path, media_type, quality_selection, selected_videos, folder_name
+                )
+                finished_positions = set()
+            else:
+                finished_positions = {
+                    item['position'] for item in self.job_journal.get_items(job_id)
+                    if item['state'] == JobJournal.DONE
+                }
+            with self._tokens_lock:
+                self._active_jobs.add(job_id)
+            for position in finished_positions:
+                progress.skip_item(position)
+
+            archive = DownloadArchive.for_path(download_path)
+            archived_positions = set()
+
+            successful_downloads = len(finished_positions)
             failed_downloads = []
+            cancelled_count = 0
+            item_retries = []
 
+            pending_items = []
             for i, video in enumerate(selected_videos):
-                self.current_video_index = i + 1
-                video_url = video.get('url', '')
-                video_title = video.get('title', f'Video_{i+1}')
-                file_ext = format_options.get('outtmpl_ext', 'mp4')
-                outtmpl = os.path.join(playlist_folder, f"{video_title}.{file_ext}")
-                format_options['outtmpl'] = outtmpl
-
-                try:
-                    self.status_callback(f"Downloading: {video_title} ({self.current_video_index}/{self.total_playlist_videos})")
-                    self._perform_download(video_url, format_options)
-                    successful_downloads += 1
-                except Exception as e:
-                    failed_downloads.append(f"{video_title} - {str(e)}")
+                position = i + 1
+                if position in finished_positions:
+                    continue
+                if not video.get('redownload') and video.get('id') in archive:
+                    # Already on disk from an earlier run; no extraction needed
+                    archived_positions.add(position)
+                    self.job_journal.mark_item(job_id, position, JobJournal.DONE)
+                    progress.skip_item(position)
+                    continue
+                estimate = (video.get('size_estimates') or {}).get(quality_selection) or video.get('filesize_approx')
+                progress.add_item(position, estimate)
+                pending_items.append((position, video))
+
+            if check_disk_space and pending_items:
+                preflight = self.preflight.check_batch(
+                    [video for _, video in pending_items], download_path, media_type, quality_selection
+                )
+                if not preflight.ok:
+                    self.job_journal.finish_job(job_id, cancelled=True)
+                    self.status_callback("Not enough disk space")
+                    complete("error", f"Not enough disk space for this download.\n{preflight.message}")
+                    return
+
+            def check_space(info):
+                self.preflight.check_item(info, staging_folder, media_type, quality_selection)
+
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="playlist-download") as executor:
+                # future -> (position, video, stage); stage is "download", "postprocess" or "publish"
+                pending = {}
+                for position, video in pending_items:
+                    future = executor.submit(
+                        self._download_playlist_item, job_id, position, video, playlist_folder, staging_folder,
+                        ydl_opts, postprocess_spec, progress, token, check_space, fragment_downloads
+                    )
+                    pending[future] = (position, video, "download")
+
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        position, video, stage = pending.pop(future)
+                        video_title = video.get('title', f'Video_{position}')
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            retries = getattr(e, 'retries', 0)
+                            if retries:
+                                item_retries.append((position, f"{video_title} - {retries} retries"))
+                            if token.is_cancelled and stage == "download":
+                                # Leave it pending so the partial file can be continued later
+                                cancelled_count += 1
+                                self.job_journal.mark_item(job_id, position, JobJournal.PENDING)
+                            else:
+                                failed_downloads.append((position, f"{video_title} - {str(e)}"))
+                                self.job_journal.mark_item(job_id, position, JobJournal.FAILED, str(e))
+                            self._finish_playlist_item(position, progress, max_workers)
+                            continue
+
+                        if stage == "download":
+                            retries, info, post_future = result
+                            if retries:
+                                item_retries.append((position, f"{video_title} - {retries} retries"))
+                            video = dict(video, id=video.get('id') or (info or {}).get('id'))
+                            if post_future is not None:
+                                pending[post_future] = (position, video, "postprocess")
+                                if self.item_progress_callback:
+                                    self.item_progress_callback(
+                                        position, 1.0,
+                                        f"[{position}/{self.total_playlist_videos}] {video_title}: Converting..."
+                                    )
+                                continue
+                        elif stage == "postprocess":
+                            # Converted in the staging folder; move it into place off the main loop
+                            publish_future = executor.submit(self.staging.publish, result, playlist_folder)
+                            pending[publish_future] = (position, video, "publish")
+                            continue
+
+                        archive.add(video.get('id'))
+                        self.job_journal.mark_item(job_id, position, JobJournal.DONE)
+                        successful_downloads += 1
+                        self._finish_playlist_item(position, progress, max_workers)
+
+            self.job_journal.finish_job(job_id, cancelled=token.is_cancelled)
+            self.staging.cleanup(playlist_folder)
 
             summary = f"Downloaded: {successful_downloads} / {self.total_playlist_videos}"
+            if archived_positions:
+                summary += f"\nSkipped: {len(archived_positions)} already in download archive"
+            if finished_positions:
+                summary += f"\nResumed: {len(finished_positions)} already downloaded before"
             if failed_downloads:
-                summary += f"\nFailed: {len(failed_downloads)}\n" + "\n".join(failed_downloads)
-
-            self.completion_callback("success", summary)
+                failed_downloads.sort()
+                summary += f"\nFailed: {len(failed_downloads)}\n" + "\n".join(text for _, text in failed_downloads)
+            if item_retries:
+                item_retries.sort()
+                summary += f"\nRetried: {len(item_retries)}\n" + "\n".join(text for _, text in item_retries)
+
+            if token.is_cancelled:
+                summary += f"\nCancelled: {cancelled_count} not downloaded"
+                self.status_callback("Download cancelled")
+                complete("cancelled", summary)
+            else:
+                complete("success", summary)
 
         except Exception as e:
             self.status_callback("Error occurred!")
-            self.completion_callback("error", f"Playlist download failed: {str(e)}")
+            complete("error", f"Playlist download failed: {str(e)}")
+        finally:
+            self._release_token(token)
+            with self._tokens_lock:
+                self._active_jobs.discard(job_id)
+
+    def _finish_playlist_item(self, position, progress, max_workers):
+        """Report an item as finished, whether it succeeded or failed."""
+        progress.finish_item(position)
+        self.progress_callback(progress.fraction())
+        if self.item_progress_callback:
+            self.item_progress_callback(position, 1.0, None)
+        self.status_callback(lambda: self._format_job_status(progress, max_workers))
+
+    def _download_playlist_item(self, job_id, position, video, playlist_folder, staging_folder, ydl_opts,
+                                postprocess_spec, progress, token, check_space=None, fragment_downloads=None):
+        """Download a single selected playlist item into the staging folder.
+
+        Returns (retries, info, post_future). When post_future is None the file
+        is already finished and published into playlist_folder; otherwise it
+        resolves to the converted file, still in the staging folder.
+        """
+        token.check()  # Honour pause/cancel between items
+
+        video_url = video.get('url', '')
+        video_title = video.get('title', f'Video_{position}')
+        # Titles repeat within a playlist; the id keeps concurrent items from sharing staging files
+        video_id = video.get('id') or f"item{position}"
+        file_name = Formatter.safe_filename(f"{video_title} [{video_id}]")
+        file_ext = ydl_opts.get('outtmpl_ext', 'mp4')
+        if postprocess_spec:
+            # Keep each stream in its own file; the pipeline merges/converts into the final name
+            outtmpl = os.path.join(staging_folder, file_name.replace('%', '%%') + ".f%(format_id)s.%(ext)s")
+        else:
+            outtmpl = os.path.join(staging_folder, f"{file_name.replace('%', '%%')}.{file_ext}")
+        progress_hook = self._make_item_progress_hook(position, video_title, progress, token)
+
+        if self.item_progress_callback:
+            self.item_progress_callback(position, 0.0, f"[{position}/{self.total_playlist_videos}] Starting: {video_title}")
 
-    def _download_worker(self, url, download_path, download_type, media_type, quality_selection):
+        self.job_journal.mark_item(job_id, position, JobJournal.DOWNLOADING)
+        stats = RetryStats()
+        self.postprocess_pipeline.download_started()
+        try:
+            info = self._perform_download(video_url, ydl_opts, outtmpl, progress_hook, stats, token, check_space,
+                                          fragment_downloads)
+        finally:
+            self.postprocess_pipeline.download_finished()
+
+        post_future = None
+        staged_path = StagingArea.downloaded_file(info)
+        if postprocess_spec and info:
+            staged_path = os.path.join(staging_folder, f"{file_name}.{file_ext}")
+            job = PostProcessPipeline.build_job(info, staged_path, postprocess_spec)
+            if job['args'] is None:
+                run_ffmpeg_job(job)  # Plain rename; not worth a trip to the process pool
+            else:
+                post_future = self.postprocess_pipeline.submit(job)
+        if post_future is None:
+            staged_path = staged_path or os.path.join(staging_folder, f"{file_name}.{file_ext}")
+            self.staging.publish(staged_path, playlist_folder)
+        return stats.retries, info, post_future
+
+    def _make_item_progress_hook(self, position, video_title, progress, token):
+        """Create a progress hook that reports one playlist item independently."""
+        prefix = f"[{position}/{self.total_playlist_videos}] {video_title}: "
+
+        def hook(d):
+            token.check()
+            if d['status'] == 'downloading':
+                try:
+                    total_bytes = d.get('total_bytes', 0) or d.get('total_bytes_estimate', 0)
+                    downloaded = d.get('downloaded_bytes', 0)
+                    percentage = downloaded / total_bytes if total_bytes else 0
+
+                    progress.update_item(position, d.get('filename'), downloaded, total_bytes)
+                    self.progress_callback(progress.fraction())
+                    self.status_callback(lambda: self._format_job_status(progress))
+                    if self.item_progress_callback:
+                        self.item_progress_callback(
+                            position, percentage,
+                            lambda: prefix + self._format_bytes_status(d, percentage, total_bytes)
+                        )
+                except Exception:
+                    pass
+            elif d['status'] == 'finished' and self.item_progress_callback:
+                self.item_progress_callback(position, 1.0, prefix + "Processing...")
+
+        return hook
+
+    def _download_worker(self, url, download_path, download_type, media_type, quality_selection, token=None,
+                         on_complete=None, fragment_downloads=None):
         """Worker method for downloading content."""
+        token = token or CancellationToken()
+        complete = on_complete or self.completion_callback
         try:
+            if download_type == "playlist":
+                self._download_whole_playlist(url, download_path, media_type, quality_selection, token, complete,
+                                              fragment_downloads)
+                return
+
             self.status_callback("Fetching information...")
 
             format_options = self._get_format_options(media_type, quality_selection)
-            ydl_opts = {
-                'progress_hooks': [self._progress_hook],
-                'quiet': True,
-                'no_warnings': True,
-                'nocheckcertificate': True,
-                'http_headers': {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                },
-                'socket_timeout': 30,
-                'retries': 5,
-                'fragment_retries': 5,
-                'extractor_retries': 5,
-            }
-            ydl_opts.update(format_options)
+            ydl_opts = self._build_ydl_opts(format_options)
 
             file_ext = format_options.get('outtmpl_ext', 'mp4')
-            if download_type == "playlist":
-                self._setup_playlist_download(url, download_path, file_ext, ydl_opts)
-            else:
-                self._setup_single_download(download_path, file_ext, ydl_opts)
-
-            self._perform_download(url, ydl_opts)
+            archive = DownloadArchive.for_path(download_path)
+            staging_folder = self.staging.staging_dir(download_path)
+            self._setup_single_download(staging_folder, file_ext, ydl_opts)
+
+            outtmpl = ydl_opts.pop('outtmpl')
+            progress_hook = self._make_cancellable_hook(self._progress_hook, token)
+            self.status_callback("Downloading...")
+
+            def check_space(info):
+                self.preflight.check_item(info, staging_folder, media_type, quality_selection)
+
+            info = self._perform_download(url, ydl_opts, outtmpl, progress_hook, token=token,
+                                          before_download=check_space, fragment_downloads=fragment_downloads)
+            staged_path = StagingArea.downloaded_file(info)
+            if not staged_path or not os.path.exists(staged_path):
+                raise RuntimeError("Downloaded file not found in the staging folder")
+            self.staging.publish(staged_path, download_path)
+            self.staging.cleanup(download_path)
+            if info:
+                archive.add(info.get('id'))
 
             self.status_callback("Download Complete!")
-            self.completion_callback("success", f"Downloaded to:\n{download_path}")
+            complete("success", f"Downloaded to:\n{download_path}")
 
         except Exception as e:
-            self.status_callback("Error occurred!")
-            self.completion_callback("error", f"Download failed: {str(e)}")
-
-    def _setup_playlist_download(self, url, download_path, file_ext, ydl_opts):
+            if token.is_cancelled:
+                self.status_callback("Download cancelled")
+                complete("cancelled", "Download cancelled.")
+            else:
+                self.status_callback("Error occurred!")
+                complete("error", f"Download failed: {str(e)}")
+        finally:
+            self._release_token(token)
+
+    def _download_whole_playlist(self, url, download_path, media_type, quality_selection, token, complete,
+                                 fragment_downloads=None):
+        """Resolve the playlist listing once and download its entries through the playlist item pipeline."""
         self.status_callback("Fetching playlist info...")
-        try:
-            with yt_dlp.YoutubeDL({'quiet': True, 'extract_flat': True, 'force_generic_extractor': True, 'nocheckcertificate': True}) as ydl_info:
-                info_dict = ydl_info.extract_info(url, download=False)
-                if info_dict and info_dict.get('_type') == 'playlist':
-                    self.total_playlist_videos = len(info_dict.get('entries', []))
-                else:
-                    self.total_playlist_videos = 1
-        except Exception as e:
-            print(f"Error fetching playlist info: {str(e)}")
-            self.total_playlist_videos = 1
+        title, videos = self._resolve_playlist(url)
+        if not videos:
+            complete("error", "Playlist has no downloadable videos.")
+            return
+        self._playlist_download_worker(
+            videos, download_path, media_type, quality_selection, None, None, token, complete,
+            folder_name=Formatter.safe_filename(title), fragment_downloads=fragment_downloads
+        )
 
-        ydl_opts['outtmpl'] = os.path.join(download_path, '%(playlist)s', f'%(title)s.{file_ext}')
-        ydl_opts['extract_flat'] = False
+    def _resolve_playlist(self, url):
+        """Return (title, videos) from one flat listing of the playlist; a plain video is a list of one."""
+        flat_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'nocheckcertificate': True,
+            'extract_flat': 'in_playlist',
+            'socket_timeout': 30,
+        }
+        with self.ydl_pool.lease(flat_opts) as downloader:
+            info = self.retry_policy.run(
+                lambda: downloader.extract_info(url, download=False), on_retry=self._on_retry
+            )
+
+        if not info:
+            return self.DEFAULT_PLAYLIST_FOLDER, []
+        if info.get('_type') != 'playlist':
+            return info.get('title') or self.DEFAULT_PLAYLIST_FOLDER, [
+                {'id': info.get('id', ''), 'title': info.get('title', 'Video_1'), 'url': url,
+                 'duration': info.get('duration')}
+            ]
+
+        videos = []
+        for i, entry in enumerate(info.get('entries') or []):
+            if not entry:
+                continue
+            video_id = entry.get('id', '')
+            entry_url = entry.get('webpage_url') or entry.get('url') or ''
+            if video_id and not entry_url.startswith('http'):
+                entry_url = f"https://www.youtube.com/watch?v={video_id}"
+            videos.append({
+                'id': video_id,
+                'title': entry.get('title') or f'Video_{i + 1}',
+                'url': entry_url,
+                'duration': entry.get('duration'),
+                'playlist_index': entry.get('playlist_index') or i + 1,
+            })
+        return info.get('title') or self.DEFAULT_PLAYLIST_FOLDER, videos
+
+    def _make_cancellable_hook(self, progress_hook, token):
+        """Wrap a progress hook so pause/cancel take effect on every chunk."""
+        def hook(d):
+            token.check()
+            progress_hook(d)
+        return hook
 
     def _setup_single_download(self, download_path, file_ext, ydl_opts):
         ydl_opts['outtmpl'] = os.path.join(download_path, f'%(title)s.{file_ext}')
         self.total_playlist_videos = 1
         self.current_video_index = 0
 
-    def _perform_download(self, url, ydl_opts):
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    self.status_callback("Downloading...")
-                    ydl.extract_info(url, download=True)
-                    break
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    raise Exception(f"Download failed after {max_retries} attempts: {str(e)}")
-                time.sleep(2)
-
-    def _get_format_options(self, media_type, quality_selection):
-        if media_type == "Audio Only":
-            return self._get_audio_format_options(quality_selection)
-        return self._get_video_format_options(quality_selection)
-
-    def _get_audio_format_options(self, quality_selection):
-        format_map = {
-            "MP3 (128kbps)": {'codec': 'mp3', 'quality': '128', 'ext': 'mp3'},
-            "MP3 (320kbps)": {'codec': 'mp3', 'quality': '320', 'ext': 'mp3'},
-            "WAV": {'codec': 'wav', 'ext': 'wav'},
-            "M4A": {'codec': 'm4a', 'ext': 'm4a'}
+    def _build_ydl_opts(self, format_options):
+        """Build the shared yt-dlp options; per-item settings are passed to _perform_download."""
+        ydl_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'nocheckcertificate': True,
+            'http_headers': {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            },
+            'socket_timeout': 30,
+            # RetryPolicy owns the retry budget; yt-dlp only gets one quick retry of its own per
+            # request, and a few per fragment so one bad fragment does not restart a long stream
+            'retries': 1,
+            'fragment_retries': 3,
+            'extractor_retries': 1,
+            'continuedl': True,  # Pick up existing .part files when a job is resumed
+            'retry_sleep_functions': {
+                'http': self.retry_policy.quick_backoff,
+                'fragment': self.retry_policy.quick_backoff,
+                'extractor': self.retry_policy.quick_backoff,
+            },
         }
+        ydl_opts.update(format_options)
+        return ydl_opts
+
+    def _perform_download(self, url, ydl_opts, outtmpl, progress_hook, stats=None, token=None,
+                          before_download=None, fragment_downloads=None):
+        """Extract once, then download; each phase is retried on its own and only for transient errors.
+
+        before_download, if given, is called with the extracted info and may raise to skip the download.
+        A download that fails with an expired stream URL (HTTP 403) is retried on a fresh extraction.
+        fragment_downloads overrides the service setting for this download (e.g. from a queued request).
+        """
+        stats = stats or RetryStats()
+        token = token or CancellationToken()
+        fragment_level, progress_hook = self._apply_fragment_tuning(progress_hook, fragment_downloads)
+        progress_hook = self._make_throttled_hook(progress_hook, token)
+        params = {'concurrent_fragment_downloads': fragment_level}
+        with self.ydl_pool.lease(ydl_opts) as downloader:
+            cached = self.info_store.get(url)
+            if cached is not None:
+                token.check()
+                if before_download:
+                    before_download(cached)
+                try:
+                    return downloader.process(cached, outtmpl=outtmpl, progress_hook=progress_hook, params=params)
+                except Exception as e:
+                    if token.is_cancelled:
+                        raise
+                    # Stream URLs in the cached info may have expired; fall back to a fresh extraction
+                    print(f"DownloadService: Cached info for {url} failed ({e}), extracting again")
+                    self.info_store.discard(url)
+
+            current = [self.retry_policy.run(lambda: downloader.extract(url), stats, self._on_retry)]
+            self.info_store.put(url, current[0])
+            token.check()
+            if before_download:
+                before_download(current[0])
+
+            def download():
+                if current[0] is None:
+                    current[0] = downloader.extract(url)
+                    self.info_store.put(url, current[0])
+                try:
+                    return downloader.process(current[0], outtmpl=outtmpl, progress_hook=progress_hook, params=params)
+                except Exception as e:
+                    if self.retry_policy.is_expired_url(e):
+                        # Retrying with the same stream URLs would fail again; extract afresh next attempt
+                        self.info_store.discard(url)
+                        current[0] = None
+                    raise
+            return self.retry_policy.run(download, stats, self._on_retry)
+
+    def _apply_fragment_tuning(self, progress_hook, fragment_downloads=None):
+        """Return the fragment concurrency for this download and a hook that feeds the auto tuner."""
+        if fragment_downloads is None:
+            fragment_downloads = self.fragment_downloads
+        if fragment_downloads != FragmentTuner.AUTO:
+            return int(fragment_downloads), progress_hook
+
+        level = self.fragment_tuner.level
+        throttled = []
+
+        def hook(d):
+            # Under a bandwidth limit the rate is the limit's, whatever the level; don't learn from it
+            if not throttled and self.bandwidth_limiter.current_rate() is not None:
+                throttled.append(True)
+            self.fragment_tuner.observe(d, level, throttled=bool(throttled))
+            progress_hook(d)
+        return level, hook
+
+    def _make_throttled_hook(self, progress_hook, token):
+        """Wrap a progress hook so each chunk is charged against the shared bandwidth limiter."""
+        downloaded_by_file = {}
+
+        def hook(d):
+            progress_hook(d)
+            if d.get('status') != 'downloading':
+                return
+            filename = d.get('filename') or ''
+            downloaded = d.get('downloaded_bytes') or 0
+            # A retried file restarts from a lower count; only charge growth
+            delta = downloaded - downloaded_by_file.get(filename, downloaded)
+            downloaded_by_file[filename] = downloaded
+            if delta > 0:
+                self.bandwidth_limiter.consume(delta, token)
+        return hook
+
+    def _on_retry(self, error, attempt, delay):
+        print(f"DownloadService: Transient error (attempt {attempt}), retrying in {delay:.1f}s: {error}")
+
+    def _get_format_options(self, media_type, quality_selection, pipelined=False):
+        """yt-dlp format options; pipelined options leave merging/conversion to PostProcessPipeline."""
+        if media_type == "Audio Only":
+            return self._get_audio_format_options(quality_selection, pipelined)
+        return self._get_video_format_options(quality_selection, pipelined)
 
-        format_info = format_map.get(quality_selection, format_map["MP3 (128kbps)"])
+    def _get_postprocess_spec(self, media_type, quality_selection):
+        """Describe the FFmpeg step the pipeline runs after a pipelined download."""
+        if media_type == "Audio Only":
+            format_info = self.AUDIO_FORMATS.get(quality_selection, self.AUDIO_FORMATS["MP3 (128kbps)"])
+            spec = {'kind': 'audio', 'codec': format_info['codec']}
+            if 'quality' in format_info:
+                spec['quality'] = format_info['quality']
+            return spec
+        return {'kind': 'merge'}
+
+    def _get_audio_format_options(self, quality_selection, pipelined=False):
+        format_info = self.AUDIO_FORMATS.get(quality_selection, self.AUDIO_FORMATS["MP3 (128kbps)"])
+        if pipelined:
+            return {'format': format_info['format'], 'outtmpl_ext': format_info['ext']}
+
+        # FFmpegExtractAudio copies the stream instead of transcoding when the source codec already matches
         postprocessor = {
             'key': 'FFmpegExtractAudio',
             'preferredcodec': format_info['codec'],
@@ -164,13 +811,20 @@ class DownloadService:
             postprocessor['preferredquality'] = format_info['quality']
 
         return {
-            'format': 'bestaudio/best',
+            'format': format_info['format'],
             'postprocessors': [postprocessor],
             'outtmpl_ext': format_info['ext']
         }
 
-    def _get_video_format_options(self, quality_selection):
+    def _get_video_format_options(self, quality_selection, pipelined=False):
         selected_quality = quality_selection.split()[0][:-1]  # "2160" from "2160p (4K)"
+        if pipelined:
+            # "," downloads video and audio as separate files for the pipeline to merge
+            return {
+                'format': f'bestvideo[height<={selected_quality}]/best,bestaudio',
+                'format_sort': ['res:2160', 'res:1440', 'res:1080', 'res:720', 'fps'],
+                'outtmpl_ext': 'mp4'
+            }
         return {
             'format': f'bestvideo[height<={selected_quality}]+bestaudio/best',
             'format_sort': ['res:2160', 'res:1440', 'res:1080', 'res:720', 'fps'],
@@ -187,8 +841,7 @@ class DownloadService:
                 percentage = downloaded / total_bytes if total_bytes else 0
                 self.progress_callback(percentage)
 
-                status_text = self._get_download_status_text(d, percentage, total_bytes)
-                self.status_callback(status_text)
+                self.status_callback(lambda: self._get_download_status_text(d, percentage, total_bytes))
 
             except Exception:
                 self.status_callback("Downloading... (progress update error)")
@@ -207,8 +860,23 @@ class DownloadService:
             if playlist_index is not None:
                 self.current_video_index = playlist_index
             status_text += f"Downloading item {self.current_video_index} of {self.total_playlist_videos}: "
+        return status_text + self._format_bytes_status(d, percentage, total_bytes)
+
+    def _format_bytes_status(self, d, percentage, total_bytes):
         if total_bytes:
-            status_text += f"Downloaded: {percentage:.1%} of {d.get('_total_bytes_str', 'N/A')}"
-        else:
-            status_text += f"Downloaded: {d.get('_downloaded_bytes_str', 'N/A')}"
+            return f"Downloaded: {percentage:.1%} of {d.get('_total_bytes_str', 'N/A')}"
+        return f"Downloaded: {d.get('_downloaded_bytes_str', 'N/A')}"
+
+    def _format_job_status(self, progress, max_workers=None):
+        """Describe the whole job: items finished, bytes, smoothed speed and ETA."""
+        status_text = f"Finished {progress.finished_count} of {self.total_playlist_videos}"
+        if max_workers:
+            status_text += f" ({max_workers} parallel)"
+        total_bytes = progress.total_bytes
+        if total_bytes:
+            status_text += (
+                f" | {Formatter.format_bytes(progress.bytes_done)} of ~{Formatter.format_bytes(total_bytes)}"
+                f" | {Formatter.format_bytes(progress.throughput)}/s"
+                f" | ETA {Formatter.format_eta(progress.eta())}"
+            )
         return status_text
@@ -0,0 +1,81 @@
+import threading
+
+
+class FragmentTuner:
+    """Picks concurrent_fragment_downloads for DASH/HLS streams from measured throughput.
+
+    Each finished fragmented download is one throughput sample for the level
+    it ran at. The tuner hill-climbs: it doubles the level while doubling still
+    buys at least MIN_GAIN more throughput, and falls back to the lower level
+    once extra fragment connections stop paying off (the link is saturated).
+    Non-fragmented and bandwidth-limited downloads are ignored.
+    """
+
+    AUTO = "auto"
+
+    MIN_GAIN = 0.15  # Doubling the level must add at least 15% throughput
+    SMOOTHING = 0.5  # EWMA weight of the newest sample for a level
+
+    def __init__(self, initial=4, minimum=1, maximum=16):
+        self.minimum = minimum
+        self.maximum = maximum
+        self._level = initial
+        self._samples = {}  # level -> smoothed throughput in bytes per second
+        self._fragmented = set()
+        self._lock = threading.Lock()
+
+    @property
+    def level(self):
+        """Concurrency to use for the next download."""
+        with self._lock:
+            return self._level
+
+    def observe(self, d, level, throttled=False):
+        """Feed a yt-dlp progress dict from a download that ran with the given level.
+
+        throttled marks a download that ran under a bandwidth limit at some
+        point; its throughput says nothing about the level and is not recorded.
+        """
+        filename = d.get('filename') or ''
+        if d.get('status') == 'downloading':
+            if d.get('fragment_count'):
+                with self._lock:
+                    self._fragmented.add(filename)
+            return
+
+        if d.get('status') != 'finished':
+            return
+
+        with self._lock:
+            if filename not in self._fragmented:
+                return
+            self._fragmented.discard(filename)
+        if throttled:
+            return
+
+        elapsed = d.get('elapsed') or 0
+        total_bytes = d.get('total_bytes') or d.get('downloaded_bytes') or 0
+        if elapsed > 0 and total_bytes:
+            self.record(level, total_bytes / elapsed)
+
+    def record(self, level, throughput):
+        """Adjust the level from one finished download's throughput in bytes per second."""
+        with self._lock:
+            previous = self._samples.get(level)
+            if previous:
+                throughput = self.SMOOTHING * throughput + (1 - self.SMOOTHING) * previous
+            self._samples[level] = throughput
+
+            if level != self._level:
+                return  # Measured at an older level; the next sample will tell
+
+            lower, higher = level // 2, level * 2
+            lower_sample = self._samples.get(lower)
+            higher_sample = self._samples.get(higher)
+
+            if lower >= self.minimum and lower_sample and throughput < lower_sample * (1 + self.MIN_GAIN):
+                self._level = lower  # More fragment connections did not pay off
+            elif higher <= self.maximum and (
+                higher_sample is None or higher_sample > throughput * (1 + self.MIN_GAIN)
+            ):
+                self._level = higher
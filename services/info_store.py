@@ -0,0 +1,78 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+class InfoStore:
+    """Bounded, in-memory store of recently extracted yt-dlp info dicts.
+
+    Previews put the info they extracted here so the download step can feed it
+    straight to process_ie_result instead of extracting the video again.
+    Entries expire after ttl seconds because the stream URLs inside them do;
+    the least recently used entry is dropped once max_entries is reached.
+    """
+
+    YOUTUBE_ID = re.compile(r'(?:[?&]v=|youtu\.be/|/shorts/|/embed/)([A-Za-z0-9_-]{11})')
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_entries=256, ttl=1800):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (stored_at, info)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """Return the store shared by the info services and the download service."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @classmethod
+    def key_for(cls, url_or_id):
+        """Normalise a YouTube URL (any form) or bare video id to one cache key."""
+        text = str(url_or_id or '').strip()
+        match = cls.YOUTUBE_ID.search(text)
+        if match:
+            return f"youtube:{match.group(1)}"
+        if re.fullmatch(r'[A-Za-z0-9_-]{11}', text):
+            return f"youtube:{text}"
+        return text
+
+    def get(self, url_or_id):
+        """Return a fresh info dict, or None if it is missing or expired."""
+        key = self.key_for(url_or_id)
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            stored_at, info = item
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return info
+
+    def put(self, url_or_id, info):
+        """Store a single-video info dict; playlists and empty results are ignored."""
+        if not info or info.get('_type') in ('playlist', 'multi_video', 'url', 'url_transparent'):
+            return
+        key = self.key_for(url_or_id)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), info)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, url_or_id):
+        """Forget an entry, e.g. after its stream URLs turned out to be stale."""
+        with self._lock:
+            self._entries.pop(self.key_for(url_or_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
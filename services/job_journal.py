@@ -0,0 +1,123 @@
+import sqlite3
+import threading
+import time
+from utils.app_paths import AppPaths
+
+
+class JobJournal:
+    """Crash-safe SQLite journal of playlist download jobs and the state of each item."""
+
+    PENDING = 'pending'
+    DOWNLOADING = 'downloading'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    JOB_RUNNING = 'running'
+    JOB_COMPLETED = 'completed'
+    JOB_CANCELLED = 'cancelled'
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or AppPaths.data_file("jobs.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._setup_schema()
+
+    def _setup_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at REAL NOT NULL,
+                    download_path TEXT NOT NULL,
+                    media_type TEXT NOT NULL,
+                    quality_selection TEXT NOT NULL,
+                    status TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS items (
+                    job_id INTEGER NOT NULL REFERENCES jobs(job_id) ON DELETE CASCADE,
+                    position INTEGER NOT NULL,
+                    video_id TEXT,
+                    url TEXT NOT NULL,
+                    title TEXT,
+                    state TEXT NOT NULL,
+                    error TEXT,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (job_id, position)
+                )
+            """)
+            columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if 'folder_name' not in columns:
+                # Added later; journals from older versions get the column on open
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN folder_name TEXT")
+
+    def create_job(self, download_path, media_type, quality_selection, videos, folder_name=None):
+        """Record a new job with every selected video pending; returns the job id."""
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (created_at, download_path, media_type, quality_selection, status, folder_name) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (now, download_path, media_type, quality_selection, self.JOB_RUNNING, folder_name)
+            )
+            job_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO items (job_id, position, video_id, url, title, state, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (job_id, i + 1, video.get('id', ''), video.get('url', ''),
+                     video.get('title', f'Video_{i+1}'), self.PENDING, now)
+                    for i, video in enumerate(videos)
+                ]
+            )
+        return job_id
+
+    def mark_item(self, job_id, position, state, error=None):
+        """Persist the state of one item."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE items SET state = ?, error = ?, updated_at = ? WHERE job_id = ? AND position = ?",
+                (state, error, time.time(), job_id, position)
+            )
+
+    def finish_job(self, job_id, cancelled=False):
+        """Mark the job as completed (or cancelled); failed items stay recorded as failed."""
+        status = self.JOB_CANCELLED if cancelled else self.JOB_COMPLETED
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET status = ? WHERE job_id = ?", (status, job_id))
+
+    def get_job(self, job_id):
+        """Return the job row as a dict, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_items(self, job_id):
+        """Return all items of a job ordered by position."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM items WHERE job_id = ? ORDER BY position", (job_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def unfinished_jobs(self):
+        """Return jobs that never completed (e.g. the app was closed or crashed), newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT jobs.*, "
+                "SUM(CASE WHEN items.state = ? THEN 1 ELSE 0 END) AS done_count, "
+                "COUNT(items.position) AS item_count "
+                "FROM jobs LEFT JOIN items ON items.job_id = jobs.job_id "
+                "WHERE jobs.status = ? GROUP BY jobs.job_id ORDER BY jobs.created_at DESC",
+                (self.DONE, self.JOB_RUNNING)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,137 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from utils.app_paths import AppPaths
+from services.info_store import InfoStore
+
+
+class MetadataCache:
+    """Persistent SQLite cache of the metadata shown in previews and playlist lists.
+
+    Only display metadata is kept (titles, durations, view counts, playlist
+    listings), never stream URLs, so downloads still extract fresh info.
+    Each kind of entry has its own time to live; once the stored data grows
+    past max_bytes the least recently used entries are evicted.
+    """
+
+    VIDEO = 'video'  # Single-video preview data
+    PLAYLIST = 'playlist'  # Playlist metadata and its video list
+    ENTRY = 'entry'  # Full details of one playlist entry
+    SYNC = 'sync'  # Listing a playlist was last synced to; losing it only costs a full walk
+
+    TTLS = {
+        VIDEO: 6 * 3600,
+        PLAYLIST: 3600,  # Playlists change; keep listings short-lived
+        ENTRY: 24 * 3600,
+        SYNC: 30 * 24 * 3600,
+    }
+
+    PLAYLIST_ID = re.compile(r'[?&]list=([A-Za-z0-9_-]+)')
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db_path=None, max_bytes=32 * 1024 ** 2, ttls=None):
+        self.db_path = db_path or AppPaths.data_file("metadata_cache.sqlite3")
+        self.max_bytes = max_bytes
+        self.ttls = dict(self.TTLS, **(ttls or {}))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._setup_schema()
+
+    @classmethod
+    def shared(cls):
+        """Return the cache shared by the info services."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _setup_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS metadata (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (kind, key)
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS metadata_lru ON metadata (accessed_at)")
+
+    @classmethod
+    def key_for(cls, kind, url_or_id):
+        """Cache key: the playlist id for playlists, the video id (see InfoStore.key_for) otherwise."""
+        if kind in (cls.PLAYLIST, cls.SYNC):
+            match = cls.PLAYLIST_ID.search(str(url_or_id or ''))
+            if match:
+                return f"youtube:{match.group(1)}"
+        return InfoStore.key_for(url_or_id)
+
+    def get(self, kind, url_or_id):
+        """Return the cached data, or None if it is missing or older than the kind's TTL."""
+        key = self.key_for(kind, url_or_id)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT stored_at, data FROM metadata WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[0] > self.ttls.get(kind, 0):
+                self._conn.execute("DELETE FROM metadata WHERE kind = ? AND key = ?", (kind, key))
+                return None
+            self._conn.execute(
+                "UPDATE metadata SET accessed_at = ? WHERE kind = ? AND key = ?", (now, kind, key)
+            )
+        return json.loads(row[1])
+
+    def put(self, kind, url_or_id, data):
+        """Store JSON-serialisable data, then evict expired and least recently used entries."""
+        key = self.key_for(kind, url_or_id)
+        text = json.dumps(data)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metadata (kind, key, stored_at, accessed_at, size, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, key, now, now, len(text), text)
+            )
+            self._evict(now)
+
+    def discard(self, kind, url_or_id):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM metadata WHERE kind = ? AND key = ?", (kind, self.key_for(kind, url_or_id))
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM metadata")
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self, now):
+        for kind, ttl in self.ttls.items():
+            self._conn.execute("DELETE FROM metadata WHERE kind = ? AND stored_at < ?", (kind, now - ttl))
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM metadata").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for rowid, size in self._conn.execute("SELECT rowid, size FROM metadata ORDER BY accessed_at"):
+            stale.append((rowid,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        self._conn.executemany("DELETE FROM metadata WHERE rowid = ?", stale)
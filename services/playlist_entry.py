@@ -0,0 +1,85 @@
+from services.preflight import DiskPreflight
+
+
+class PlaylistEntry:
+    """Compact record of one playlist video, as listed and shown in the selection list.
+
+    Playlists with thousands of videos keep one of these per entry instead of
+    the extracted info dict (with its format tables) or a per-video dict.
+    Size estimates are kept as a tuple in QUALITIES order. Read access
+    mirrors a dict (entry['title'], entry.get('id'), dict(entry)), so code
+    that takes video dicts accepts entries unchanged. to_dict() gives the
+    JSON form used for queue requests and caches.
+    """
+
+    # Every quality selection, in a fixed order for the size estimate tuple
+    QUALITIES = tuple(quality for qualities in DiskPreflight.QUALITY_OPTIONS.values() for quality in qualities)
+
+    FIELDS = ('id', 'title', 'duration', 'view_count', 'uploader', 'upload_date', 'url', 'thumbnail',
+              'filesize_approx', 'size_estimates', 'details', 'playlist_index', 'archived')
+
+    __slots__ = ('id', 'title', 'duration', 'view_count', 'uploader', 'upload_date', 'url', 'thumbnail',
+                 'filesize_approx', '_sizes', 'details', 'playlist_index', 'archived')
+
+    def __init__(self, id='', title='', duration=0, view_count=0, uploader='', upload_date='', url='',
+                 thumbnail='', filesize_approx=None, size_estimates=None, details=False, playlist_index=0,
+                 archived=False):
+        self.id = id
+        self.title = title
+        self.duration = duration
+        self.view_count = view_count
+        self.uploader = uploader
+        self.upload_date = upload_date
+        self.url = url
+        self.thumbnail = thumbnail
+        self.filesize_approx = filesize_approx
+        self.size_estimates = size_estimates
+        self.details = details
+        self.playlist_index = playlist_index
+        self.archived = archived
+
+    @property
+    def size_estimates(self):
+        """Estimated output bytes keyed by quality selection (built on access)."""
+        if not self._sizes:
+            return {}
+        return {quality: size for quality, size in zip(self.QUALITIES, self._sizes) if size}
+
+    @size_estimates.setter
+    def size_estimates(self, estimates):
+        estimates = estimates or {}
+        self._sizes = tuple(estimates.get(quality) for quality in self.QUALITIES) if estimates else None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build an entry from its dict form; unknown keys (e.g. 'redownload') are ignored."""
+        return cls(**{key: data[key] for key in cls.FIELDS if key in data})
+
+    def to_dict(self):
+        """Plain dict form; 'archived' is only present when set, like in listing dicts."""
+        data = {key: getattr(self, key) for key in self.FIELDS}
+        if not self.archived:
+            del data['archived']
+        return data
+
+    def copy(self, **changes):
+        entry = PlaylistEntry.from_dict(self.to_dict())
+        for key, value in changes.items():
+            setattr(entry, key, value)
+        return entry
+
+    # Read-only mapping interface for code written against video dicts
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def __repr__(self):
+        return f"PlaylistEntry(#{self.playlist_index} {self.id!r} {self.title!r})"
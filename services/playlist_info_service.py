@@ -1,74 +1,486 @@
+import bisect
 import threading
-import yt_dlp
+import time
+from concurrent.futures import ThreadPoolExecutor
 from utils.validators import URLValidator
+from services.download_archive import DownloadArchive
+from services.preflight import DiskPreflight
+from services.info_store import InfoStore
+from services.metadata_cache import MetadataCache
+from services.playlist_entry import PlaylistEntry
+from services.ydl_pool import YoutubeDLPool
 
 class PlaylistInfoService:
-    """Service for fetching playlist information and video lists."""
+    """Service for fetching playlist information and video lists.
     
-    def __init__(self, callback):
+    The default mode lists the playlist flat, resolves the videos on a
+    bounded pool of detail_workers threads and reports once with 'success'.
+    The lazy mode lists the playlist flat and streams it instead:
+    'started' (playlist metadata), one 'page' per batch of entries as the
+    listing arrives, then 'complete'. Full details for single entries are
+    fetched on demand with fetch_details() and reported as 'details'.
+    """
+    
+    PAGE_SIZE = 50
+    PAGE_INTERVAL = 0.5  # Seconds; flush a partial page rather than hold rows back
+    DETAIL_WORKERS = 8  # Entries resolved in parallel; extraction is latency-bound, not CPU-bound
+    
+    SYNC_STOP_RUN = 3  # Known entries in their stored order that end a sync walk
+    
+    FLAT_OPTS = {
+        'quiet': True,
+        'no_warnings': True,
+        'nocheckcertificate': True,
+        'extract_flat': 'in_playlist',
+    }
+    
+    DETAIL_OPTS = {
+        'quiet': True,
+        'no_warnings': True,
+        'extract_flat': False,
+        'nocheckcertificate': True,
+    }
+    
+    def __init__(self, callback, detail_workers=None):
         self.callback = callback
+        self.detail_workers = max(1, detail_workers or self.DETAIL_WORKERS)
+        self.preflight = DiskPreflight()
+        self.info_store = InfoStore.shared()
+        self.metadata_cache = MetadataCache.shared()
+        self.ydl_pool = YoutubeDLPool(max_idle_per_key=max(8, self.detail_workers))
+        self._current_request_url = None  # Lazy listing in progress; others stop at their next entry
+        self._detail_executor = None
+        self._detail_pending = set()
+        self._detail_lock = threading.Lock()
     
-    def fetch_playlist_info(self, url):
-        """Fetch playlist information in a separate thread."""
+    def fetch_playlist_info(self, url, download_path=None, lazy=False):
+        """Fetch playlist information in a separate thread.
+        
+        When download_path is given, videos already in its download archive are
+        not extracted again and come back flagged as archived.
+        """
         if not URLValidator.is_playlist(url):
             self.callback('error', "Not a playlist URL", None, None)
             return
         
-        thread = threading.Thread(target=self._fetch_playlist_worker, args=(url,), daemon=True)
+        self._current_request_url = url
+        worker = self._list_playlist_worker if lazy else self._fetch_playlist_worker
+        thread = threading.Thread(target=worker, args=(url, download_path), daemon=True)
         thread.start()
     
-    def _fetch_playlist_worker(self, url):
-        """Worker method to fetch playlist information."""
+    def cancel(self):
+        """Stop a lazy listing in progress; pages already delivered stay valid."""
+        self._current_request_url = None
+    
+    def fetch_details(self, videos):
+        """Resolve full details for flat entries in the background; each one is reported as 'details'."""
+        with self._detail_lock:
+            if self._detail_executor is None:
+                self._detail_executor = ThreadPoolExecutor(
+                    max_workers=self.detail_workers, thread_name_prefix="playlist-details"
+                )
+            for video in videos:
+                if video.get('details') or not video.get('url') or video['url'] in self._detail_pending:
+                    continue
+                self._detail_pending.add(video['url'])
+                self._detail_executor.submit(self._fetch_details_worker, video)
+    
+    def _list_playlist_worker(self, url, download_path=None):
+        """Worker method for lazy mode: stream the flat listing page by page."""
         try:
-            print(f"PlaylistInfoService: Fetching playlist info for {url}")
+            print(f"PlaylistInfoService: Listing playlist {url}")
+            archive = DownloadArchive.for_path(download_path) if download_path else None
             
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': False,  # Get detailed info for each video
-                'nocheckcertificate': True,
-                'ignoreerrors': True,  # Skip unavailable videos
-            }
+            cached = self._get_cached_playlist(url, archive)
+            if cached:
+                playlist_info, videos = cached
+                print(f"PlaylistInfoService: Using cached listing for {url}")
+                self.callback('started', None, playlist_info, [])
+                if self._stream_pages(url, playlist_info, videos) is not None:
+                    self.callback('complete', None, playlist_info, None)
+                return
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                
-                if not info:
-                    self.callback('error', "Could not fetch playlist information", None, None)
-                    return
-                
-                if info.get('_type') != 'playlist':
-                    self.callback('error', "URL is not a playlist", None, None)
+            with self.ydl_pool.lease(self.FLAT_OPTS) as downloader:
+                info = self._extract_flat(downloader, url)
+                if not self._is_playlist_result(info):
                     return
                 
-                # Extract playlist metadata
-                playlist_info = {
-                    'title': info.get('title', 'Unknown Playlist'),
-                    'uploader': info.get('uploader', 'Unknown Channel'),
-                    'description': info.get('description', ''),
-                    'entries': info.get('entries', [])
-                }
+                playlist_info = self._playlist_metadata(url, info)
+                self.callback('started', None, playlist_info, [])
                 
-                # Process video entries
-                video_list = []
-                for i, entry in enumerate(playlist_info['entries']):
-                    if entry:  # Skip None entries (unavailable videos)
-                        video_data = {
-                            'id': entry.get('id', ''),
-                            'title': entry.get('title', f'Video {i+1}'),
-                            'duration': entry.get('duration', 0),
-                            'view_count': entry.get('view_count', 0),
-                            'uploader': entry.get('uploader', ''),
-                            'upload_date': entry.get('upload_date', ''),
-                            'url': entry.get('webpage_url', entry.get('url', '')),
-                            'thumbnail': entry.get('thumbnail', ''),
-                            'playlist_index': i + 1
-                        }
-                        video_list.append(video_data)
-                
-                print(f"PlaylistInfoService: Found {len(video_list)} videos in playlist")
-                self.callback('success', None, playlist_info, video_list)
+                videos = (
+                    self._mark_archived(self._build_video_data(entry, entry.get('playlist_index') or i + 1), archive)
+                    for i, entry in enumerate(info.get('entries') or []) if entry
+                )
+                videos = self._stream_pages(url, playlist_info, videos)
+                if videos is None:
+                    return
+            
+            playlist_info['entry_count'] = len(videos)
+            print(f"PlaylistInfoService: Listed {len(videos)} videos in playlist")
+            self._cache_playlist(url, playlist_info, videos, detailed=False)
+            self.callback('complete', None, dict(playlist_info), None)
+        
+        except Exception as e:
+            print(f"PlaylistInfoService: Error listing playlist: {e}")
+            self.callback('error', f"Error fetching playlist: {str(e)}", None, None)
+        finally:
+            if self._current_request_url == url:
+                self._current_request_url = None
+    
+    def sync_playlist(self, url, download_path=None):
+        """Refresh a playlist against its last sync in a separate thread; reported once as 'synced'.
+        
+        Only the head of the listing is walked, until it lines up with the
+        entries known from last time, and only new or retitled entries are
+        resolved in full. playlist_info['changes'] holds the 'added',
+        'removed', 'reordered' and 'changed' videos.
+        """
+        if not URLValidator.is_playlist(url):
+            self.callback('error', "Not a playlist URL", None, None)
+            return
+        
+        thread = threading.Thread(target=self._sync_playlist_worker, args=(url, download_path), daemon=True)
+        thread.start()
+    
+    def _sync_playlist_worker(self, url, download_path=None):
+        """Worker method for incremental sync."""
+        try:
+            print(f"PlaylistInfoService: Syncing playlist {url}")
+            archive = DownloadArchive.for_path(download_path) if download_path else None
+            state = self.metadata_cache.get(MetadataCache.SYNC, url) or {}
+            known = [PlaylistEntry.from_dict(video) for video in state.get('videos') or []]
+            
+            with self.ydl_pool.lease(self.FLAT_OPTS) as downloader:
+                info = self._extract_flat(downloader, url)
+                if not self._is_playlist_result(info):
+                    return
+                playlist_info = self._playlist_metadata(url, info)
+                videos, walked = self._walk_until_known(info.get('entries') or [], known, info.get('playlist_count'))
+            
+            changes = self._diff_listings(known, videos)
+            # Compare listing titles with listing titles; resolved details may spell them differently
+            known_titles = state.get('listed_titles') or {}
+            changes['changed'] = [
+                video for video in walked
+                if video['id'] in known_titles and video.get('title') != known_titles[video['id']]
+            ]
+            
+            # Full details only for what is new or retitled; the rest keeps last sync's data
+            for video in changes['changed']:
+                self.metadata_cache.discard(MetadataCache.ENTRY, video['url'])
+                self.info_store.discard(video['url'])
+            stale = changes['added'] + changes['changed']
+            resolved = {
+                video.id: detailed.copy(id=video.id)
+                for video, detailed in zip(stale, self._resolve_entries(stale)) if detailed
+            }
+            known_by_id = {video['id']: video for video in known}
+            changed_ids = {video['id'] for video in changes['changed']}
+            videos = [
+                resolved.get(video['id'])
+                or (known_by_id[video['id']] if video['id'] in known_by_id and video['id'] not in changed_ids
+                    else video)
+                for video in videos
+            ]
+            for position, video in enumerate(videos, start=1):
+                video.playlist_index = position
+            
+            listed_titles = {video['id']: known_titles.get(video['id']) for video in videos}
+            listed_titles.update((video['id'], video.get('title')) for video in walked)
+            self.metadata_cache.put(MetadataCache.SYNC, url, {
+                'videos': [self._cacheable(video) for video in videos],
+                'listed_titles': listed_titles,
+            })
+            videos = [self._mark_archived(video, archive) for video in videos]
+            
+            by_id = {video['id']: video for video in videos}
+            for key in ('added', 'reordered', 'changed'):
+                changes[key] = [by_id[video['id']] for video in changes[key]]
+            playlist_info.update(entry_count=len(videos), changes=changes)
+            print(f"PlaylistInfoService: Synced {len(videos)} videos after walking {len(walked)}: "
+                  f"{len(changes['added'])} added, {len(changes['removed'])} removed, "
+                  f"{len(changes['reordered'])} reordered")
+            self.callback('synced', None, playlist_info, videos)
+        
+        except Exception as e:
+            print(f"PlaylistInfoService: Error syncing playlist: {e}")
+            self.callback('error', f"Error syncing playlist: {str(e)}", None, None)
+    
+    def _walk_until_known(self, entries, known, expected_count=None):
+        """Walk a flat listing until SYNC_STOP_RUN entries match the stored order.
+        
+        The unwalked rest is taken from the known listing. That shortcut is
+        only used when it accounts for the playlist's reported size, so
+        entries appended at the end or removed further down force a full
+        walk, as does a listing that reports no size. Returns (listing,
+        walked entries).
+        """
+        known_positions = {video['id']: i for i, video in enumerate(known)}
+        walked = []
+        walked_ids = set()
+        run = 0
+        previous = None
+        for i, entry in enumerate(entries):
+            if not entry:
+                continue
+            video = self._build_video_data(entry, entry.get('playlist_index') or i + 1)
+            walked.append(video)
+            walked_ids.add(video['id'])
+            
+            position = known_positions.get(video['id'])
+            if position is None:
+                run = 0
+            elif run and position == previous + 1:
+                run += 1
+            else:
+                run = 1
+            previous = position
+            
+            if run >= self.SYNC_STOP_RUN:
+                tail = [video for video in known[position + 1:] if video['id'] not in walked_ids]
+                if expected_count is not None and len(walked) + len(tail) == expected_count:
+                    return walked + tail, walked
+        return walked, walked
+    
+    @staticmethod
+    def _diff_listings(old, new):
+        """Added, removed and reordered videos between two listings.
+        
+        Reordered are the common entries outside the longest run that kept
+        its relative order, i.e. the fewest moves that explain the change.
+        """
+        old_positions = {video['id']: i for i, video in enumerate(old)}
+        new_ids = {video['id'] for video in new}
+        common = [video for video in new if video['id'] in old_positions]
+        
+        # Longest increasing subsequence of old positions (patience sorting)
+        tails = []
+        tail_indices = []
+        parents = [None] * len(common)
+        for i, video in enumerate(common):
+            position = old_positions[video['id']]
+            slot = bisect.bisect_left(tails, position)
+            if slot == len(tails):
+                tails.append(position)
+                tail_indices.append(i)
+            else:
+                tails[slot] = position
+                tail_indices[slot] = i
+            parents[i] = tail_indices[slot - 1] if slot else None
+        in_order = set()
+        i = tail_indices[-1] if tail_indices else None
+        while i is not None:
+            in_order.add(i)
+            i = parents[i]
+        
+        return {
+            'added': [video for video in new if video['id'] not in old_positions],
+            'removed': [video for video in old if video['id'] not in new_ids],
+            'reordered': [video for i, video in enumerate(common) if i not in in_order],
+        }
+    
+    def _extract_flat(self, downloader, url):
+        """Extract a listing without resolving its entries, following redirects to the playlist."""
+        # process=False leaves 'entries' as the extractor's generator, so each
+        # continuation page of the listing is only requested when iterated
+        info = downloader.extract(url)
+        for _ in range(3):
+            if not info or info.get('_type') not in ('url', 'url_transparent'):
+                break
+            info = downloader.extract(info['url'])
+        return info
+    
+    def _is_playlist_result(self, info):
+        """Report an error and return False unless info is a playlist."""
+        if not info:
+            self.callback('error', "Could not fetch playlist information", None, None)
+            return False
+        if info.get('_type') != 'playlist':
+            self.callback('error', "URL is not a playlist", None, None)
+            return False
+        return True
+    
+    @staticmethod
+    def _playlist_metadata(url, info):
+        return {
+            'url': url,
+            'title': info.get('title', 'Unknown Playlist'),
+            'uploader': info.get('uploader', 'Unknown Channel'),
+            'description': info.get('description', ''),
+            'entry_count': info.get('playlist_count'),
+        }
+    
+    def _stream_pages(self, url, playlist_info, videos):
+        """Report videos as 'page' callbacks while they arrive; returns them all, or None if cancelled."""
+        listed = []
+        page = []
+        flushed_at = time.monotonic()
+        for video_data in videos:
+            if self._current_request_url != url:
+                print(f"PlaylistInfoService: Listing of {url} cancelled (superseded)")
+                return None
+            page.append(video_data)
+            if len(page) >= self.PAGE_SIZE or time.monotonic() - flushed_at >= self.PAGE_INTERVAL:
+                listed.extend(page)
+                self.callback('page', None, playlist_info, page)
+                page = []
+                flushed_at = time.monotonic()
+        
+        if page:
+            listed.extend(page)
+            self.callback('page', None, playlist_info, page)
+        return listed
+    
+    def _get_cached_playlist(self, url, archive, detailed=False):
+        """Return (playlist_info, videos) from the metadata cache, with archive flags for today's archive."""
+        cached = self.metadata_cache.get(MetadataCache.PLAYLIST, url)
+        if not cached or (detailed and not cached.get('detailed')):
+            return None
+        playlist_info = dict(cached['playlist_info'], url=url, entry_count=len(cached['videos']))
+        videos = [self._mark_archived(PlaylistEntry.from_dict(video), archive) for video in cached['videos']]
+        return playlist_info, videos
+    
+    def _cache_playlist(self, url, playlist_info, videos, detailed):
+        """Store the display metadata of a playlist; detailed listings can also answer full-mode requests."""
+        self.metadata_cache.put(MetadataCache.PLAYLIST, url, {
+            'playlist_info': {key: playlist_info.get(key) for key in ('title', 'uploader', 'description')},
+            'videos': [self._cacheable(video) for video in videos],
+            'detailed': detailed,
+        })
+    
+    @staticmethod
+    def _mark_archived(entry, archive):
+        entry.archived = archive is not None and entry.id in archive
+        return entry
+    
+    @staticmethod
+    def _cacheable(entry):
+        """Dict form of an entry without its archive flag, which depends on the download folder."""
+        data = entry.to_dict()
+        data.pop('archived', None)
+        return data
+    
+    def _fetch_details_worker(self, video):
+        """Resolve one entry and report it."""
+        try:
+            detailed = self._resolve_entry(video)
+            if detailed:
+                self.callback('details', None, None, [detailed])
+        finally:
+            with self._detail_lock:
+                self._detail_pending.discard(video['url'])
+    
+    def _resolve_entry(self, video):
+        """Full video data for a flat entry, from the metadata cache, the info store or yt-dlp; None on failure."""
+        url = video['url']
+        try:
+            cached = self.metadata_cache.get(MetadataCache.ENTRY, url)
+            detailed = PlaylistEntry.from_dict(cached) if cached else None
+            if not detailed:
+                info = self.info_store.get(url)
+                if not info:
+                    with self.ydl_pool.lease(self.DETAIL_OPTS) as downloader:
+                        info = downloader.extract_info(url, download=False)
+                        if info:
+                            info = downloader.ydl.sanitize_info(info, remove_private_keys=True)
+                            self.info_store.put(url, info)
+                if not info:
+                    return None
+                detailed = self._build_video_data(info, 0)
+                detailed.details = True
+                self.metadata_cache.put(MetadataCache.ENTRY, url, self._cacheable(detailed))
+            
+            # Keep the listing URL as the identity of the row
+            detailed.url = url
+            detailed.playlist_index = video.get('playlist_index') or 0
+            detailed.archived = bool(video.get('archived'))
+            return detailed
+        except Exception as e:
+            print(f"PlaylistInfoService: Error fetching details for {url}: {e}")
+            return None
+    
+    def _fetch_playlist_worker(self, url, download_path=None):
+        """Worker method to fetch playlist information."""
+        try:
+            print(f"PlaylistInfoService: Fetching playlist info for {url}")
+            
+            archive = DownloadArchive.for_path(download_path) if download_path else None
+            
+            cached = self._get_cached_playlist(url, archive, detailed=True)
+            if cached:
+                print(f"PlaylistInfoService: Using cached playlist info for {url}")
+                self.callback('success', None, *cached)
+                return
+            
+            # One flat listing first; resolving every video inside extract_info would be serial
+            with self.ydl_pool.lease(self.FLAT_OPTS) as downloader:
+                info = self._extract_flat(downloader, url)
+                if not self._is_playlist_result(info):
+                    return
+                playlist_info = self._playlist_metadata(url, info)
+                videos = [
+                    self._mark_archived(self._build_video_data(entry, entry.get('playlist_index') or i + 1), archive)
+                    for i, entry in enumerate(info.get('entries') or []) if entry
+                ]
+            
+            # Videos already in the download archive are not extracted again
+            archived_count = sum(1 for video in videos if video.get('archived'))
+            resolved = iter(self._resolve_entries([video for video in videos if not video.get('archived')]))
+            video_list = [video if video.get('archived') else next(resolved) for video in videos]
+            video_list = [video for video in video_list if video]  # Skip unavailable videos
+            if archived_count:
+                print(f"PlaylistInfoService: {archived_count} videos already in download archive")
+            
+            playlist_info['entry_count'] = len(video_list)
+            print(f"PlaylistInfoService: Found {len(video_list)} videos in playlist")
+            self._cache_playlist(url, playlist_info, video_list, detailed=True)
+            self.callback('success', None, playlist_info, video_list)
                 
         except Exception as e:
             print(f"PlaylistInfoService: Error fetching playlist info: {e}")
-            self.callback('error', f"Error fetching playlist: {str(e)}", None, None)
\ No newline at end of file
+            self.callback('error', f"Error fetching playlist: {str(e)}", None, None)
+    
+    def _resolve_entries(self, videos):
+        """Resolve flat entries on up to detail_workers threads; results (None for failures) keep input order."""
+        if not videos:
+            return []
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=min(self.detail_workers, len(videos)),
+                                thread_name_prefix="playlist-resolve") as executor:
+            # map() yields in submission order, so playlist_index order survives any completion order
+            resolved = list(executor.map(self._resolve_entry, videos))
+        print(f"PlaylistInfoService: Resolved {len(videos)} entries in {time.monotonic() - started:.1f}s "
+              f"({self.detail_workers} workers)")
+        return resolved
+    
+    def _build_video_data(self, entry, playlist_index):
+        """Build the compact record used by the selection list from a full or flat entry.
+        
+        Only the listed fields are copied, so the caller can drop the (much
+        larger) info dict, format tables included, right after this call.
+        """
+        thumbnail = entry.get('thumbnail', '')
+        if not thumbnail and entry.get('thumbnails'):
+            thumbnail = entry['thumbnails'][-1].get('url', '')
+        
+        video_id = entry.get('id', '')
+        url = entry.get('webpage_url', entry.get('url', ''))
+        if video_id and not url.startswith('http'):
+            url = f"https://www.youtube.com/watch?v={video_id}"
+        
+        return PlaylistEntry(
+            id=video_id,
+            title=entry.get('title', f'Video {playlist_index}'),
+            duration=entry.get('duration', 0),
+            view_count=entry.get('view_count', 0),
+            uploader=entry.get('uploader', ''),
+            upload_date=entry.get('upload_date', ''),
+            url=url,
+            thumbnail=thumbnail,
+            filesize_approx=entry.get('filesize') or entry.get('filesize_approx'),
+            # Output size per quality selection, from the entry's format metadata
+            size_estimates=self.preflight.estimate_all(entry) if entry.get('formats') else None,
+            details=bool(entry.get('formats')),  # False for flat entries: fetch_details() fills them in
+            playlist_index=playlist_index
+        )
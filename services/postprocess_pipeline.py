@@ -0,0 +1,214 @@
+import functools
+import os
+import shutil
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+def _lower_priority():
+    """Pool initializer: run conversions below the download threads' priority where supported."""
+    if hasattr(os, 'nice'):
+        try:
+            os.nice(5)
+        except OSError:
+            pass
+
+
+def run_ffmpeg_job(job):
+    """Run one FFmpeg post-processing job in a worker process; returns the output path.
+
+    Kept at module level so the process pool can pickle it. Where workers
+    are spawned (Windows, macOS) each one re-imports the entry script, GUI
+    toolkit included; the pool is created once and its workers are reused,
+    so that start-up cost is paid once per worker, not per job.
+    """
+    output = job['output']
+    if job['args'] is None:
+        # Source already has the target codec and container: just move it into place
+        os.replace(job['inputs'][0], output)
+        return output
+
+    temp_output = output + ".pp-tmp" + os.path.splitext(output)[1]
+
+    command = [job['ffmpeg'], '-y', '-hide_banner', '-loglevel', 'error']
+    for path in job['inputs']:
+        command += ['-i', path]
+    command += job['args']
+    if job.get('threads'):
+        command += ['-threads', str(job['threads'])]
+    command += [temp_output]
+
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        if os.path.exists(temp_output):
+            os.remove(temp_output)
+        error = result.stderr.decode('utf-8', errors='replace').strip().splitlines()
+        raise RuntimeError(f"FFmpeg failed: {error[-1] if error else result.returncode}")
+
+    os.replace(temp_output, output)
+    for path in job['inputs']:
+        if os.path.abspath(path) != os.path.abspath(output) and os.path.exists(path):
+            os.remove(path)
+    return output
+
+
+class PostProcessPipeline:
+    """Second pipeline stage: FFmpeg merges/conversions served by a process pool.
+
+    Download threads hand finished files to submit() and immediately move on
+    to the next item, so the network stays busy while earlier items are
+    being converted. The pool is sized to the CPU count, but fewer jobs run
+    at once while downloads are active so they keep the CPU time they need;
+    queued jobs are dispatched as soon as capacity frees up.
+    """
+
+    def __init__(self, max_workers=None, ffmpeg_threads=1):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.ffmpeg_threads = ffmpeg_threads  # Per job; 0 lets ffmpeg decide
+        self.ffmpeg_path = shutil.which('ffmpeg')
+        self._executor = None
+        self._pending = deque()  # (job, future) waiting for capacity
+        self._running = 0
+        self._active_downloads = 0
+        self._lock = threading.RLock()
+
+    def is_available(self):
+        """True when an ffmpeg binary was found; otherwise yt-dlp post-processes inline."""
+        return self.ffmpeg_path is not None
+
+    def configure(self, max_workers=None, ffmpeg_threads=None):
+        """Change the pool size (0/None = CPU count) and the per-job ffmpeg thread count."""
+        with self._lock:
+            if ffmpeg_threads is not None:
+                self.ffmpeg_threads = ffmpeg_threads
+            max_workers = max_workers or os.cpu_count() or 1
+            if max_workers != self.max_workers:
+                self.max_workers = max_workers
+                if self._executor is not None:
+                    # Running jobs finish in the old pool; new ones start in a pool of the new size
+                    self._executor.shutdown(wait=False)
+                    self._executor = None
+        self._dispatch()
+
+    def download_started(self):
+        """Tell the scheduler a download is using CPU (network, muxing, progress hooks)."""
+        with self._lock:
+            self._active_downloads += 1
+
+    def download_finished(self):
+        with self._lock:
+            self._active_downloads = max(0, self._active_downloads - 1)
+        self._dispatch()
+
+    def concurrency_limit(self):
+        """How many jobs may run right now: one core is left per two active downloads."""
+        with self._lock:
+            reserved = (self._active_downloads + 1) // 2
+            return max(1, self.max_workers - reserved)
+
+    def submit(self, job):
+        """Queue a job built by build_job(); returns a Future resolving to the output path."""
+        future = Future()
+        job = dict(job, ffmpeg=self.ffmpeg_path, threads=job.get('threads', self.ffmpeg_threads))
+        with self._lock:
+            self._pending.append((job, future))
+        self._dispatch()
+        return future
+
+    def shutdown(self, wait=True):
+        """Stop the worker processes; jobs that never started are cancelled."""
+        with self._lock:
+            while self._pending:
+                _, future = self._pending.popleft()
+                future.cancel()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _dispatch(self):
+        failed = []
+        with self._lock:
+            while self._pending and self._running < self.concurrency_limit():
+                job, future = self._pending.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self._running += 1
+                try:
+                    if self._executor is None:
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                             initializer=_lower_priority)
+                    pool_future = self._executor.submit(run_ffmpeg_job, job)
+                except Exception as e:
+                    # Broken pool (e.g. a worker was killed): fail this job, start a fresh pool for the next
+                    self._running -= 1
+                    self._executor = None
+                    failed.append((future, e))
+                    continue
+                pool_future.add_done_callback(functools.partial(self._on_job_done, future, self._executor))
+        # Resolved outside the lock; the waiting download worker must never hang on these
+        for future, error in failed:
+            future.set_exception(error)
+
+    def _on_job_done(self, future, executor, pool_future):
+        error = pool_future.exception() if not pool_future.cancelled() else RuntimeError("Post-processing cancelled")
+        with self._lock:
+            self._running -= 1
+            if isinstance(error, BrokenProcessPool) and self._executor is executor:
+                executor.shutdown(wait=False)
+                self._executor = None
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(pool_future.result())
+        self._dispatch()
+
+    @staticmethod
+    def build_job(info, output, spec):
+        """Build a job from a downloaded info dict and a spec from DownloadService.
+
+        spec is {'kind': 'merge'} for video or
+        {'kind': 'audio', 'codec': ..., 'quality': ...} for audio-only downloads.
+        """
+        inputs = [d['filepath'] for d in info.get('requested_downloads') or [] if d.get('filepath')]
+        if not inputs and info.get('filepath'):
+            inputs = [info['filepath']]
+        if not inputs:
+            raise RuntimeError("Downloaded file not found for post-processing")
+
+        if spec['kind'] == 'merge':
+            if len(inputs) > 1:
+                args = ['-map', '0:v:0', '-map', '1:a:0', '-c', 'copy']
+            else:
+                args = ['-c', 'copy']
+            return {'inputs': inputs, 'output': output, 'args': args + ['-movflags', '+faststart']}
+
+        source = (info.get('requested_downloads') or [info])[0]
+        source_codec = (source.get('acodec') or info.get('acodec') or '').lower()
+        if PostProcessPipeline._can_copy_audio(source_codec, spec['codec']):
+            if os.path.splitext(inputs[0])[1].lstrip('.').lower() == os.path.splitext(output)[1].lstrip('.').lower():
+                return {'inputs': inputs[:1], 'output': output, 'args': None}
+            # Same codec, different container: remux without re-encoding
+            return {'inputs': inputs[:1], 'output': output, 'args': ['-vn', '-c:a', 'copy']}
+
+        return {'inputs': inputs[:1], 'output': output, 'args': PostProcessPipeline._audio_args(spec)}
+
+    @staticmethod
+    def _can_copy_audio(source_codec, target_codec):
+        """True when the source stream can go into the target format as-is."""
+        if target_codec == 'm4a':
+            return source_codec.startswith('mp4a') or source_codec == 'aac'
+        if target_codec == 'mp3':
+            return source_codec == 'mp3'
+        return False
+
+    @staticmethod
+    def _audio_args(spec):
+        codec = spec['codec']
+        if codec == 'mp3':
+            return ['-vn', '-c:a', 'libmp3lame', '-b:a', f"{spec.get('quality') or '192'}k"]
+        if codec == 'wav':
+            return ['-vn', '-c:a', 'pcm_s16le']
+        return ['-vn', '-c:a', 'aac', '-b:a', f"{spec.get('quality') or '192'}k"]
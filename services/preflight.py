@@ -0,0 +1,173 @@
+import os
+import shutil
+from utils.formatters import Formatter
+
+
+class DiskSpaceError(Exception):
+    """Raised when the target volume cannot hold a download; never worth retrying."""
+
+    permanent = True
+
+
+class PreflightResult:
+    """Outcome of comparing estimated output size with free space on the target volume."""
+
+    def __init__(self, required_bytes, free_bytes, unknown_count=0):
+        self.required_bytes = required_bytes
+        self.free_bytes = free_bytes
+        self.unknown_count = unknown_count
+
+    @property
+    def ok(self):
+        return self.free_bytes is None or self.required_bytes <= self.free_bytes
+
+    @property
+    def message(self):
+        text = (f"Estimated size {Formatter.format_bytes(self.required_bytes)}, "
+                f"free space {Formatter.format_bytes(self.free_bytes)}")
+        if self.unknown_count:
+            text += f" ({self.unknown_count} items without size information)"
+        return text
+
+
+class DiskPreflight:
+    """Estimates output sizes from yt-dlp format metadata and checks them against free disk space.
+
+    Sizes come from the formats the quality selection would pick: filesize,
+    then filesize_approx, then bitrate x duration. Audio conversions are sized
+    from the target bitrate. Entries without formats fall back to their own
+    size fields or a typical bitrate for the requested quality.
+    """
+
+    QUALITY_OPTIONS = {
+        "Video": ["2160p (4K)", "1440p (2K)", "1080p", "720p"],
+        "Audio Only": ["MP3 (128kbps)", "MP3 (320kbps)", "WAV", "M4A"],
+    }
+
+    SAFETY_MARGIN = 1.05  # Container overhead and estimate error
+    MIN_FREE_BYTES = 256 * 1024 ** 2  # Always leave this much free on the volume
+    WAV_BYTES_PER_SECOND = 44100 * 2 * 2  # 16-bit stereo PCM
+
+    # Typical total bitrates (kbps) when an entry has no format metadata
+    TYPICAL_VIDEO_KBPS = {'2160': 20000, '1440': 10000, '1080': 5000, '720': 2500}
+    TYPICAL_AUDIO_KBPS = 160
+
+    def estimate(self, info, media_type, quality_selection):
+        """Estimated output bytes for one entry (full info dict or playlist video dict), or None."""
+        duration = info.get('duration') or 0
+        formats = info.get('formats') or []
+
+        if media_type == "Audio Only":
+            target_kbps = self._target_audio_kbps(quality_selection)
+            if target_kbps and duration:
+                return int(duration * target_kbps * 1000 / 8)
+            if quality_selection == "WAV" and duration:
+                return int(duration * self.WAV_BYTES_PER_SECOND)
+            audio = self._best_audio(formats)
+            size = self._format_size(audio, duration) if audio else None
+            return size or (int(duration * self.TYPICAL_AUDIO_KBPS * 1000 / 8) if duration else None)
+
+        height = self._height_limit(quality_selection)
+        video = self._best_video(formats, height)
+        if video:
+            size = self._format_size(video, duration)
+            if size and video.get('acodec') in (None, 'none'):
+                audio = self._best_audio(formats)  # Video-only stream gets merged with the best audio
+                if audio:
+                    size += self._format_size(audio, duration) or 0
+            if size:
+                return size
+
+        size = info.get('filesize') or info.get('filesize_approx')
+        if size:
+            return int(size)
+        kbps = self.TYPICAL_VIDEO_KBPS.get(str(height), 5000) + self.TYPICAL_AUDIO_KBPS
+        return int(duration * kbps * 1000 / 8) if duration else None
+
+    def estimate_all(self, info):
+        """Estimates for every quality option, keyed by quality selection; unknown sizes are left out."""
+        estimates = {}
+        for media_type, qualities in self.QUALITY_OPTIONS.items():
+            for quality_selection in qualities:
+                size = self.estimate(info, media_type, quality_selection)
+                if size:
+                    estimates[quality_selection] = size
+        return estimates
+
+    def estimate_total(self, entries, media_type, quality_selection):
+        """Return (total_bytes, largest_item_bytes, unknown_count); unknown items count as the average."""
+        sizes = []
+        unknown_count = 0
+        for entry in entries:
+            size = ((entry.get('size_estimates') or {}).get(quality_selection)
+                    or self.estimate(entry, media_type, quality_selection))
+            if size:
+                sizes.append(size)
+            else:
+                unknown_count += 1
+        average = sum(sizes) / len(sizes) if sizes else 0
+        return int(sum(sizes) + average * unknown_count), max(sizes, default=0), unknown_count
+
+    def check_batch(self, entries, download_path, media_type, quality_selection):
+        """Preflight a whole batch; the largest item counts twice for merge/convert headroom."""
+        total, largest, unknown_count = self.estimate_total(entries, media_type, quality_selection)
+        required = int((total + largest) * self.SAFETY_MARGIN) + self.MIN_FREE_BYTES
+        return PreflightResult(required, self.free_space(download_path), unknown_count)
+
+    def check_item(self, info, download_path, media_type, quality_selection):
+        """Raise DiskSpaceError if one item (with its intermediate files) will not fit."""
+        size = self.estimate(info, media_type, quality_selection)
+        if not size:
+            return
+        result = PreflightResult(int(size * 2 * self.SAFETY_MARGIN) + self.MIN_FREE_BYTES,
+                                 self.free_space(download_path))
+        if not result.ok:
+            raise DiskSpaceError(f"Not enough disk space: {result.message}")
+
+    @staticmethod
+    def free_space(path):
+        """Free bytes on the volume holding path (or its nearest existing parent), or None."""
+        path = os.path.abspath(path)
+        while not os.path.exists(path):
+            parent = os.path.dirname(path)
+            if parent == path:
+                return None
+            path = parent
+        try:
+            return shutil.disk_usage(path).free
+        except OSError:
+            return None
+
+    @staticmethod
+    def _format_size(fmt, duration):
+        size = fmt.get('filesize') or fmt.get('filesize_approx')
+        if size:
+            return int(size)
+        bitrate = fmt.get('tbr') or ((fmt.get('vbr') or 0) + (fmt.get('abr') or 0))
+        return int(bitrate * 1000 / 8 * duration) if bitrate and duration else None
+
+    @staticmethod
+    def _best_video(formats, height):
+        candidates = [
+            f for f in formats
+            if f.get('vcodec') not in (None, 'none') and (not height or (f.get('height') or 0) <= height)
+        ]
+        return max(candidates, key=lambda f: (f.get('height') or 0, f.get('tbr') or 0), default=None)
+
+    @staticmethod
+    def _best_audio(formats):
+        candidates = [f for f in formats if f.get('acodec') not in (None, 'none') and f.get('vcodec') in (None, 'none')]
+        return max(candidates, key=lambda f: f.get('abr') or f.get('tbr') or 0, default=None)
+
+    @staticmethod
+    def _height_limit(quality_selection):
+        try:
+            return int(quality_selection.split()[0][:-1])  # 2160 from "2160p (4K)"
+        except (ValueError, IndexError):
+            return None
+
+    @staticmethod
+    def _target_audio_kbps(quality_selection):
+        if quality_selection.startswith("MP3"):
+            return int(quality_selection.split('(')[1].split('kbps')[0])
+        return None
@@ -0,0 +1,168 @@
+import threading
+import time
+
+
+class AggregateProgressTracker:
+    """Byte-weighted progress, smoothed throughput and ETA for a whole multi-item job.
+
+    Items report bytes through update_item() from yt-dlp progress hooks. Until an
+    item starts, its size comes from a per-entry estimate, or from the average
+    size of items seen so far when no estimate exists.
+    """
+
+    SAMPLE_INTERVAL = 0.5  # Seconds between throughput samples
+    SMOOTHING = 0.3  # EWMA weight of the newest throughput sample
+
+    def __init__(self, size_estimates=None):
+        self._items = {}  # position -> {'files': {filename: [downloaded, total]}, 'estimate': bytes or None}
+        self._finished = set()
+        self._skipped = set()
+        self._lock = threading.Lock()
+        self._bytes_done_at_sample = 0
+        self._sample_time = None
+        self._throughput = 0.0
+        self.finished_count = 0
+
+        # Running totals, adjusted per item so a progress hook never rescans the job
+        self._done = 0
+        self._sized_total = 0  # Items whose size is known or estimated
+        self._unsized_count = 0  # Items with neither; they count as the average size
+        self._estimate_sum = 0
+        self._estimate_count = 0
+        self._reported_sum = 0
+        self._reported_count = 0
+
+        for position, estimated_bytes in (size_estimates or {}).items():
+            self.add_item(position, estimated_bytes)
+
+    def add_item(self, position, estimated_bytes=None):
+        """Register an item that will be downloaded."""
+        with self._lock:
+            self._contribute(position, -1)
+            item = self._item(position)
+            if estimated_bytes:
+                item['estimate'] = estimated_bytes
+            self._contribute(position, 1)
+
+    def skip_item(self, position):
+        """Exclude an item that needs no download (archived or finished in an earlier run)."""
+        with self._lock:
+            self._contribute(position, -1)
+            self._skipped.add(position)
+            self._items.pop(position, None)
+
+    def update_item(self, position, filename, downloaded_bytes, total_bytes):
+        """Record progress of one file of an item (video and audio streams are separate files)."""
+        with self._lock:
+            if position in self._skipped:
+                return
+            self._contribute(position, -1)
+            self._item(position)['files'][filename or ''] = [downloaded_bytes or 0, total_bytes or 0]
+            self._contribute(position, 1)
+            self._sample_throughput()
+
+    def finish_item(self, position):
+        """Mark an item as done; its known file sizes become its final size."""
+        with self._lock:
+            if position in self._finished or position in self._skipped:
+                return
+            self._contribute(position, -1)
+            self._finished.add(position)
+            self.finished_count += 1
+            for sizes in self._item(position)['files'].values():
+                sizes[0] = max(sizes[0], sizes[1])
+            self._contribute(position, 1)
+
+    @property
+    def bytes_done(self):
+        with self._lock:
+            return self._done
+
+    @property
+    def total_bytes(self):
+        with self._lock:
+            return self._total_bytes()
+
+    @property
+    def throughput(self):
+        """Smoothed throughput in bytes per second."""
+        with self._lock:
+            return self._throughput
+
+    def fraction(self):
+        """Overall completion between 0.0 and 1.0."""
+        with self._lock:
+            total = self._total_bytes()
+            if not total:
+                return min(self.finished_count / len(self._items), 1.0) if self._items else 1.0
+            return min(self._done / total, 1.0)
+
+    def eta(self):
+        """Estimated seconds until the whole job finishes, or None if unknown."""
+        with self._lock:
+            if self._throughput <= 0:
+                return None
+            remaining = self._total_bytes() - self._done
+            return max(remaining, 0) / self._throughput
+
+    def _item(self, position):
+        return self._items.setdefault(position, {'files': {}, 'estimate': None})
+
+    def _contribute(self, position, sign):
+        """Add (sign=1) or remove (sign=-1) one item's share of the running totals."""
+        item = self._items.get(position)
+        if item is None or position in self._skipped:
+            return
+        files = item['files'].values()
+        done = sum(sizes[0] for sizes in files)
+        known = sum(sizes[1] or sizes[0] for sizes in files)
+        reported = sum(sizes[1] for sizes in files)
+        estimate = item['estimate']
+
+        self._done += sign * done
+        if estimate:
+            self._estimate_sum += sign * estimate
+            self._estimate_count += sign
+        if reported:
+            self._reported_sum += sign * reported
+            self._reported_count += sign
+
+        if position in self._finished:
+            self._sized_total += sign * known
+        elif estimate:
+            # Separate video/audio streams report one at a time, so never shrink below the estimate
+            self._sized_total += sign * max(known, estimate)
+        elif known:
+            self._sized_total += sign * known
+        else:
+            self._unsized_count += sign
+
+    def _total_bytes(self):
+        if self._estimate_count:
+            fallback = self._estimate_sum / self._estimate_count
+        elif self._reported_count:
+            # No per-entry estimates: project from the sizes reported so far
+            fallback = self._reported_sum / self._reported_count
+        else:
+            fallback = 0
+        return self._sized_total + self._unsized_count * fallback
+
+    def _sample_throughput(self):
+        now = time.monotonic()
+        if self._sample_time is None:
+            self._sample_time = now
+            self._bytes_done_at_sample = self._done
+            return
+
+        elapsed = now - self._sample_time
+        if elapsed < self.SAMPLE_INTERVAL:
+            return
+
+        done = self._done
+        rate = max(done - self._bytes_done_at_sample, 0) / elapsed
+        if self._throughput:
+            self._throughput = self.SMOOTHING * rate + (1 - self.SMOOTHING) * self._throughput
+        else:
+            self._throughput = rate
+        self._sample_time = now
+        self._bytes_done_at_sample = done
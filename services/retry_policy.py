@@ -0,0 +1,171 @@
+import http.client
+import random
+import socket
+import ssl
+import time
+import urllib.error
+
+
+class RetryError(Exception):
+    """Raised when an operation fails for good; carries how many retries were spent."""
+
+    def __init__(self, message, retries=0, permanent=False):
+        super().__init__(message)
+        self.retries = retries
+        self.permanent = permanent
+
+
+class RetryStats:
+    """Per-item retry counter shared by all phases of one download."""
+
+    def __init__(self):
+        self.retries = 0
+
+
+class RetryPolicy:
+    """Classifies download errors and retries transient ones with exponential backoff and jitter."""
+
+    PERMANENT = 'permanent'
+    TRANSIENT = 'transient'
+
+    PERMANENT_MARKERS = (
+        "private video",
+        "video unavailable",
+        "this video has been removed",
+        "this video is no longer available",
+        "account associated with this video has been terminated",
+        "members-only",
+        "join this channel",
+        "sign in to confirm your age",
+        "not available in your country",
+        "blocked it in your country",
+        "copyright",
+        "unsupported url",
+        "is not a valid url",
+        "requested format is not available",
+        "http error 404",
+        "http error 410",
+        "no space left on device",
+        "permission denied",
+    )
+
+    TRANSIENT_MARKERS = (
+        "timed out",
+        "timeout",
+        "connection reset",
+        "connection aborted",
+        "connection refused",
+        "remote end closed",
+        "temporary failure in name resolution",
+        "getaddrinfo failed",
+        "incompleteread",
+        "http error 429",
+        "http error 500",
+        "http error 502",
+        "http error 503",
+        "http error 504",
+        "unable to download webpage",
+        "unable to download json metadata",
+    )
+
+    # Also transient, but only a fresh extraction helps; see is_expired_url()
+    EXPIRED_URL_MARKERS = (
+        "http error 403",
+    )
+
+    NETWORK_ERRORS = (
+        socket.timeout, socket.gaierror, ConnectionError, TimeoutError,
+        ssl.SSLError, urllib.error.URLError, http.client.HTTPException,
+    )
+
+    def __init__(self, max_attempts=5, base_delay=1.0, max_delay=30.0, time_budget=180.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.time_budget = time_budget
+
+    def classify(self, error):
+        """Return PERMANENT or TRANSIENT for an exception raised by yt-dlp or the network stack.
+
+        Network failures and the listed messages are transient. So are other
+        yt-dlp errors, unless yt-dlp marked them as expected (its user-facing
+        errors, e.g. premieres or bot checks) or they wrap a plain Python
+        exception. Everything else is a bug or a local problem that a retry
+        cannot fix.
+        """
+        causes = self._causes(error)
+        if any(getattr(cause, 'permanent', False) for cause in causes):
+            return self.PERMANENT
+        if any(isinstance(cause, self.NETWORK_ERRORS) for cause in causes):
+            return self.TRANSIENT
+
+        message = str(error).lower()
+        if any(marker in message for marker in self.PERMANENT_MARKERS):
+            return self.PERMANENT
+        if any(marker in message for marker in self.TRANSIENT_MARKERS) or self.is_expired_url(error):
+            return self.TRANSIENT
+        if any(getattr(cause, 'expected', False) for cause in causes):
+            return self.PERMANENT
+        if type(causes[-1]).__module__.startswith('yt_dlp'):
+            # Unrecognised yt-dlp failures are retried, but only within the attempt and time budget
+            return self.TRANSIENT
+        return self.PERMANENT
+
+    @staticmethod
+    def _causes(error):
+        """error followed by the exceptions it wraps (yt-dlp's exc_info and cause, Python's __cause__)."""
+        causes = []
+        while isinstance(error, BaseException) and error not in causes and len(causes) < 5:
+            causes.append(error)
+            exc_info = getattr(error, 'exc_info', None)
+            if exc_info and len(exc_info) > 1 and exc_info[1] is not None:
+                error = exc_info[1]
+            else:
+                error = getattr(error, 'cause', None) or error.__cause__ or error.__context__
+        return causes
+
+    def is_expired_url(self, error):
+        """True if error looks like a stale stream URL, which only a fresh extraction can fix."""
+        return any(marker in str(error).lower() for marker in self.EXPIRED_URL_MARKERS)
+
+    def backoff(self, attempt):
+        """Full-jitter exponential backoff delay in seconds for the given retry number (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def quick_backoff(self, attempt):
+        """Short delay for yt-dlp's own retries inside one attempt; run() owns the long waits."""
+        return self.backoff(min(attempt, 1))
+
+    def run(self, operation, stats=None, on_retry=None):
+        """Run operation(), retrying transient failures until attempts or the time budget run out.
+
+        Only the given operation is repeated, so callers retry a single phase
+        (extraction or download) rather than the whole pipeline.
+        """
+        stats = stats or RetryStats()
+        deadline = time.monotonic() + self.time_budget
+        attempt = 0
+
+        while True:
+            try:
+                return operation()
+            except Exception as e:
+                if self.classify(e) == self.PERMANENT:
+                    raise RetryError(self._clean_message(e), stats.retries, permanent=True) from e
+
+                attempt += 1
+                delay = self.backoff(attempt - 1)
+                if attempt >= self.max_attempts or time.monotonic() + delay > deadline:
+                    raise RetryError(
+                        f"Gave up after {attempt} attempts: {self._clean_message(e)}", stats.retries
+                    ) from e
+
+                stats.retries += 1
+                if on_retry:
+                    on_retry(e, attempt, delay)
+                time.sleep(delay)
+
+    @staticmethod
+    def _clean_message(error):
+        message = str(error)
+        return message[len("ERROR: "):] if message.startswith("ERROR: ") else message
@@ -0,0 +1,66 @@
+import hashlib
+import os
+import shutil
+
+
+class StagingArea:
+    """Where downloads, merges and conversions happen before files are published.
+
+    Intermediate files (.part files, separate video/audio streams, conversion
+    temp files) never appear in the target folder; only finished files are
+    moved there, atomically. With no root configured each target folder gets
+    a hidden staging folder of its own, so publishing is a rename on the same
+    volume. A configured root (e.g. a local SSD or tmpfs) keeps all that I/O
+    off slow network shares; finished files are then copied next to their
+    destination under a temporary name and renamed into place.
+    """
+
+    DEFAULT_DIR_NAME = ".staging"
+
+    def __init__(self, root=None):
+        self.root = root or None
+
+    def staging_dir(self, target_dir):
+        """Return (and create) the staging folder for a target folder; stable across runs for resume."""
+        target_dir = os.path.abspath(target_dir)
+        if self.root:
+            digest = hashlib.sha1(target_dir.encode('utf-8')).hexdigest()[:16]
+            path = os.path.join(self.root, digest)
+        else:
+            path = os.path.join(target_dir, self.DEFAULT_DIR_NAME)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def publish(self, staged_path, target_dir):
+        """Move a finished file into target_dir so it appears complete or not at all; returns its new path."""
+        os.makedirs(target_dir, exist_ok=True)
+        target_path = os.path.join(target_dir, os.path.basename(staged_path))
+        try:
+            os.replace(staged_path, target_path)
+        except OSError:
+            # Different volume: copy under a temporary name on the target volume, then rename
+            temp_path = target_path + ".publish-tmp"
+            try:
+                shutil.copyfile(staged_path, temp_path)
+                os.replace(temp_path, target_path)
+            except OSError:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            os.remove(staged_path)
+        return target_path
+
+    def cleanup(self, target_dir):
+        """Remove the staging folder of target_dir if nothing is left in it."""
+        try:
+            os.rmdir(self.staging_dir(target_dir))
+        except OSError:
+            pass  # Still holds partial downloads (e.g. a cancelled job to resume later)
+
+    @staticmethod
+    def downloaded_file(info):
+        """Final file path of a processed yt-dlp info dict, or None."""
+        for download in (info or {}).get('requested_downloads') or []:
+            if download.get('filepath'):
+                return download['filepath']
+        return (info or {}).get('filepath') or (info or {}).get('_filename')
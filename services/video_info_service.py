@@ -1,10 +1,12 @@
 import threading
 import yt_dlp
 import requests
-from PIL import Image, ImageTk
+from PIL import Image
 from io import BytesIO
 from utils.formatters import Formatter
 from utils.validators import URLValidator
+from services.info_store import InfoStore
+from services.metadata_cache import MetadataCache
 
 class VideoInfoService:
     """Service class for fetching video information and thumbnails."""
@@ -12,6 +14,8 @@ class VideoInfoService:
     def __init__(self, callback):
         self.callback = callback
         self._current_request_url = None  # Track current request
+        self.info_store = InfoStore.shared()
+        self.metadata_cache = MetadataCache.shared()
     
     def fetch_video_info(self, url):
         """Fetch video information and thumbnail in a separate thread."""
@@ -35,6 +39,13 @@ class VideoInfoService:
             return
         
         try:
+            video_data = self.metadata_cache.get(MetadataCache.VIDEO, url)
+            if video_data:
+                print(f"VideoInfoService: Using cached info for {url}")
+                if self._current_request_url == url:
+                    self.callback('success', video_data)
+                return
+            
             print(f"VideoInfoService: Fetching info for {url}")
             
             ydl_opts = {
@@ -56,6 +67,8 @@ class VideoInfoService:
                 
                 if info:
                     print(f"VideoInfoService: Successfully got info for: {info.get('title', 'Unknown')}")
+                    # Let the download reuse this extraction instead of repeating it
+                    self.info_store.put(url, ydl.sanitize_info(info, remove_private_keys=True))
                     
                     video_data = {
                         'title': info.get('title', 'Unknown Title'),
@@ -64,6 +77,7 @@ class VideoInfoService:
                         'view_count': Formatter.format_view_count(info.get('view_count', 0)),
                         'thumbnail_url': info.get('thumbnail')
                     }
+                    self.metadata_cache.put(MetadataCache.VIDEO, url, video_data)
                     
                     # Final check that this request is still current
                     if self._current_request_url == url:
@@ -78,6 +92,7 @@ class VideoInfoService:
     
     def load_thumbnail(self, url):
         """Load thumbnail image from URL."""
+        from PIL import ImageTk  # Imports tkinter; keep it out of headless use of this service
         try:
             response = requests.get(url, timeout=10)
             if response.status_code == 200:
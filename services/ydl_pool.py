@@ -0,0 +1,124 @@
+import copy
+import json
+import threading
+from contextlib import contextmanager
+import yt_dlp
+
+_MISSING = object()
+
+
+class PooledDownloader:
+    """Long-lived YoutubeDL instance that takes per-call output template and progress hook."""
+
+    def __init__(self, base_opts):
+        opts = dict(base_opts)
+        opts.pop('outtmpl', None)
+        opts.pop('progress_hooks', None)
+        self.ydl = yt_dlp.YoutubeDL(opts)
+        self.ydl.add_progress_hook(self._dispatch_progress)
+        self._progress_hook = None
+
+    def extract_info(self, url, outtmpl=None, progress_hook=None, download=True):
+        """Run one extraction/download with options that only apply to this call."""
+        with self._call_options(outtmpl, progress_hook):
+            return self.ydl.extract_info(url, download=download)
+
+    def extract(self, url):
+        """Run only the extraction phase: resolve url without selecting formats or downloading."""
+        return self.ydl.extract_info(url, download=False, process=False)
+
+    def process(self, ie_result, outtmpl=None, progress_hook=None, params=None):
+        """Run only the download phase on a result from extract(); safe to call again on failure.
+
+        params holds per-call yt-dlp options (e.g. concurrent_fragment_downloads)
+        that are restored afterwards.
+        """
+        if ie_result.get('_type') not in ('playlist', 'multi_video'):
+            # process_ie_result mutates the dict, so keep the extracted copy pristine for retries
+            ie_result = copy.deepcopy(ie_result)
+        with self._call_options(outtmpl, progress_hook, params):
+            return self.ydl.process_ie_result(ie_result, download=True)
+
+    def close(self):
+        """Release the HTTP opener and persist cookies."""
+        self.ydl.close()
+
+    @contextmanager
+    def _call_options(self, outtmpl, progress_hook, params=None):
+        outtmpl_dict = self.ydl.params.setdefault('outtmpl', {})
+        previous_outtmpl = outtmpl_dict.get('default')
+        if outtmpl:
+            outtmpl_dict['default'] = outtmpl
+        previous_params = {key: self.ydl.params.get(key, _MISSING) for key in (params or {})}
+        self.ydl.params.update(params or {})
+        self._progress_hook = progress_hook
+        try:
+            yield
+        finally:
+            self._progress_hook = None
+            for key, value in previous_params.items():
+                if value is _MISSING:
+                    self.ydl.params.pop(key, None)
+                else:
+                    self.ydl.params[key] = value
+            if previous_outtmpl is None:
+                outtmpl_dict.pop('default', None)
+            else:
+                outtmpl_dict['default'] = previous_outtmpl
+
+    def _dispatch_progress(self, d):
+        if self._progress_hook:
+            self._progress_hook(d)
+
+
+class YoutubeDLPool:
+    """Pool of warm YoutubeDL instances keyed by their shared options.
+
+    Building a YoutubeDL loads every extractor and sets up the HTTP opener and
+    cookie jar, so instances are leased to one thread at a time and reused
+    for the rest of the session instead of being rebuilt per item.
+    """
+
+    def __init__(self, max_idle_per_key=8):
+        self.max_idle_per_key = max_idle_per_key
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def lease(self, base_opts):
+        """Borrow a downloader for base_opts, creating one only if none is idle."""
+        key = self._make_key(base_opts)
+        with self._lock:
+            idle = self._idle.get(key)
+            downloader = idle.pop() if idle else None
+
+        if downloader is None:
+            downloader = PooledDownloader(base_opts)
+
+        try:
+            yield downloader
+        finally:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle_per_key:
+                    idle.append(downloader)
+                    downloader = None
+            if downloader is not None:
+                downloader.close()
+
+    def close(self):
+        """Close every idle downloader."""
+        with self._lock:
+            idle_lists = list(self._idle.values())
+            self._idle.clear()
+        for idle in idle_lists:
+            for downloader in idle:
+                try:
+                    downloader.close()
+                except Exception as e:
+                    print(f"YoutubeDLPool: Error closing downloader: {e}")
+
+    @staticmethod
+    def _make_key(base_opts):
+        shared = {k: v for k, v in base_opts.items() if k not in ('outtmpl', 'progress_hooks')}
+        return json.dumps(shared, sort_keys=True, default=repr)
@@ -0,0 +1,30 @@
+import unittest
+from services.bandwidth_limiter import BandwidthLimiter
+
+
+class ParseRateTest(unittest.TestCase):
+    """Speed limit strings from the CLI, the daemon and saved settings."""
+
+    def test_valid_rates(self):
+        cases = {
+            "500": 500.0, "500K": 500 * 1024.0, "5M": 5 * 1024.0 ** 2, "1.5 MB/s": 1.5 * 1024.0 ** 2,
+            "10KiB/s": 10 * 1024.0, "2g": 2 * 1024.0 ** 3, " 1 MB/s ": 1024.0 ** 2,
+        }
+        for text, rate in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(BandwidthLimiter.parse_rate(text), rate)
+
+    def test_unlimited(self):
+        for value in (None, '', 0, '0', '0M', 'Unlimited', 'unlimited'):
+            with self.subTest(value=value):
+                self.assertIsNone(BandwidthLimiter.parse_rate(value))
+
+    def test_invalid_rates_raise_readable_error(self):
+        for text in ("abc", "5X", "1..5M", "-5M", "5 M B", "M"):
+            with self.subTest(text=text):
+                with self.assertRaisesRegex(ValueError, "invalid speed limit"):
+                    BandwidthLimiter.parse_rate(text)
+
+
+if __name__ == '__main__':
+    unittest.main()
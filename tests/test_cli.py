@@ -0,0 +1,45 @@
+import contextlib
+import io
+import unittest
+import cli
+
+
+class CliUsageTest(unittest.TestCase):
+    """Argument and validation errors return EXIT_USAGE from main()."""
+
+    def main(self, argv):
+        with contextlib.redirect_stderr(io.StringIO()), contextlib.redirect_stdout(io.StringIO()):
+            return cli.main(argv)
+
+    def test_usage_errors(self):
+        for argv in ([], ["--bogus", "URL"], ["-q", "4k", "URL"], ["--fragments", "many", "URL"],
+                     ["--parallel", "0", "URL"], ["--detail-workers", "0", "URL"],
+                     ["-a", "/nonexistent/batch.txt"], ["--limit", "abc", "URL"], ["--fragments", "0", "URL"],
+                     ["--transcode-workers", "-1", "URL"], ["--ffmpeg-threads", "-1", "URL"]):
+            with self.subTest(argv=argv):
+                self.assertEqual(self.main(argv), cli.EXIT_USAGE)
+
+    def test_help_is_not_an_error(self):
+        self.assertEqual(self.main(["--help"]), cli.EXIT_OK)
+
+
+class ConsoleReporterTest(unittest.TestCase):
+    """Deferred status text is only formatted for progress lines that are written."""
+
+    def test_dropped_updates_are_not_formatted(self):
+        stream = io.StringIO()
+        reporter = cli.ConsoleReporter(stream, json_lines=True)
+        formatted = []
+
+        def status():
+            formatted.append(1)
+            return "Downloading 1 of 2"
+
+        for _ in range(100):
+            reporter.progress('status', fraction=0.5, status=status)
+        self.assertEqual(len(formatted), 1)
+        self.assertIn('"status": "Downloading 1 of 2"', stream.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
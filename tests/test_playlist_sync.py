@@ -0,0 +1,116 @@
+import unittest
+from services.playlist_info_service import PlaylistInfoService
+from services.preflight import DiskPreflight
+
+
+def flat(ids):
+    """Flat listing entries as yt-dlp's extract_flat yields them."""
+    return [{'id': video_id, 'title': f"Title {video_id}", 'url': video_id, 'playlist_index': i + 1}
+            for i, video_id in enumerate(ids)]
+
+
+class PlaylistSyncTest(unittest.TestCase):
+    """Sync walk and listing diff for appended, removed and reordered entries."""
+
+    KNOWN = [f"v{i}" for i in range(10)]
+
+    def setUp(self):
+        # The walk only builds entry records; skip the service's pool and caches
+        self.service = PlaylistInfoService.__new__(PlaylistInfoService)
+        self.service.preflight = DiskPreflight()
+        self.known = [self.service._build_video_data(entry, entry['playlist_index']) for entry in flat(self.KNOWN)]
+
+    def sync(self, ids, expected_count):
+        entries = flat(ids)
+        consumed = []
+
+        def listing():
+            # Record how far the walk pulls the (lazily paged) listing
+            for entry in entries:
+                consumed.append(entry['id'])
+                yield entry
+
+        videos, walked = self.service._walk_until_known(listing(), self.known, expected_count)
+        return [video['id'] for video in videos], walked, consumed, self.service._diff_listings(self.known, videos)
+
+    @staticmethod
+    def ids(videos):
+        return [video['id'] for video in videos]
+
+    def test_unchanged_listing_stops_early_with_count(self):
+        listing, walked, consumed, changes = self.sync(self.KNOWN, len(self.KNOWN))
+        self.assertEqual(listing, self.KNOWN)
+        self.assertEqual(len(walked), PlaylistInfoService.SYNC_STOP_RUN)
+        self.assertEqual(len(consumed), PlaylistInfoService.SYNC_STOP_RUN)
+        self.assertEqual(changes, {'added': [], 'removed': [], 'reordered': []})
+
+    def test_prepended_entries_with_count(self):
+        ids = ['new1', 'new2'] + self.KNOWN
+        listing, walked, consumed, changes = self.sync(ids, len(ids))
+        self.assertEqual(listing, ids)
+        self.assertEqual(len(consumed), 2 + PlaylistInfoService.SYNC_STOP_RUN)
+        self.assertEqual(self.ids(changes['added']), ['new1', 'new2'])
+        self.assertEqual(changes['removed'], [])
+        self.assertEqual(changes['reordered'], [])
+
+    def test_appended_entries(self):
+        ids = self.KNOWN + ['new1', 'new2']
+        for expected_count in (len(ids), None):
+            with self.subTest(expected_count=expected_count):
+                listing, walked, consumed, changes = self.sync(ids, expected_count)
+                self.assertEqual(listing, ids)
+                self.assertEqual(consumed, ids)
+                self.assertEqual(self.ids(changes['added']), ['new1', 'new2'])
+                self.assertEqual(changes['removed'], [])
+                self.assertEqual(changes['reordered'], [])
+
+    def test_removed_entries(self):
+        ids = [video_id for video_id in self.KNOWN if video_id not in ('v7', 'v8')]
+        for expected_count in (len(ids), None):
+            with self.subTest(expected_count=expected_count):
+                listing, walked, consumed, changes = self.sync(ids, expected_count)
+                self.assertEqual(listing, ids)
+                self.assertEqual(consumed, ids)
+                self.assertEqual(changes['added'], [])
+                self.assertEqual(self.ids(changes['removed']), ['v7', 'v8'])
+                self.assertEqual(changes['reordered'], [])
+
+    def test_reordered_entries(self):
+        ids = list(self.KNOWN)
+        ids[0], ids[2] = ids[2], ids[0]
+        for expected_count in (len(ids), None):
+            with self.subTest(expected_count=expected_count):
+                listing, walked, consumed, changes = self.sync(ids, expected_count)
+                self.assertEqual(listing, ids)
+                # With a count the walk stops once v3..v5 are back in stored order
+                self.assertEqual(len(consumed), 6 if expected_count else len(ids))
+                self.assertEqual(changes['added'], [])
+                self.assertEqual(changes['removed'], [])
+                # v2 v1 v0: any two of the three moves explain the swap
+                self.assertEqual(len(changes['reordered']), 2)
+                self.assertLessEqual(set(self.ids(changes['reordered'])), {'v0', 'v1', 'v2'})
+
+    def test_reorder_past_the_stop_run_needs_full_walk(self):
+        ids = list(self.KNOWN)
+        ids[6], ids[8] = ids[8], ids[6]
+        listing, walked, consumed, changes = self.sync(ids, None)
+        self.assertEqual(listing, ids)
+        self.assertEqual(len(changes['reordered']), 2)
+        self.assertLessEqual(set(self.ids(changes['reordered'])), {'v6', 'v7', 'v8'})
+
+    def test_move_to_front_is_one_reorder(self):
+        ids = ['v9'] + self.KNOWN[:9]
+        listing, walked, consumed, changes = self.sync(ids, None)
+        self.assertEqual(listing, ids)
+        self.assertEqual(self.ids(changes['reordered']), ['v9'])
+
+    def test_no_count_walks_full_listing(self):
+        listing, walked, consumed, changes = self.sync(self.KNOWN, None)
+        self.assertEqual(listing, self.KNOWN)
+        self.assertEqual(consumed, self.KNOWN)
+        self.assertEqual(self.ids(walked), self.KNOWN)
+        self.assertEqual(changes, {'added': [], 'removed': [], 'reordered': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
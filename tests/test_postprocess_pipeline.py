@@ -0,0 +1,36 @@
+import unittest
+from services.download_service import DownloadService
+from services.postprocess_pipeline import PostProcessPipeline
+
+
+class AudioArgsTest(unittest.TestCase):
+    """FFmpeg arguments for every audio format the download settings offer."""
+
+    EXPECTED = {
+        "MP3 (128kbps)": ['-vn', '-c:a', 'libmp3lame', '-b:a', '128k'],
+        "MP3 (320kbps)": ['-vn', '-c:a', 'libmp3lame', '-b:a', '320k'],
+        "WAV": ['-vn', '-c:a', 'pcm_s16le'],
+        "M4A": ['-vn', '-c:a', 'aac', '-b:a', '192k'],
+    }
+
+    def setUp(self):
+        # _get_postprocess_spec only reads class attributes; skip the service's threads and databases
+        self.service = DownloadService.__new__(DownloadService)
+
+    def test_every_audio_format_is_covered(self):
+        self.assertEqual(set(DownloadService.AUDIO_FORMATS), set(self.EXPECTED))
+
+    def test_audio_args_per_format(self):
+        for quality_selection, expected in self.EXPECTED.items():
+            with self.subTest(quality_selection=quality_selection):
+                spec = self.service._get_postprocess_spec("Audio Only", quality_selection)
+                self.assertEqual(PostProcessPipeline._audio_args(spec), expected)
+
+    def test_missing_or_empty_quality_uses_default_bitrate(self):
+        for spec in ({'codec': 'm4a'}, {'codec': 'm4a', 'quality': None}, {'codec': 'mp3', 'quality': ''}):
+            with self.subTest(spec=spec):
+                self.assertEqual(PostProcessPipeline._audio_args(spec)[-1], '192k')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import socket
+import unittest
+from services.cancellation import DownloadCancelled
+from services.retry_policy import RetryError, RetryPolicy
+
+
+class YoutubeDLError(Exception):
+    pass
+
+
+class ExtractorError(YoutubeDLError):
+    """Shaped like yt_dlp.utils.ExtractorError: expected marks user-facing errors."""
+
+    def __init__(self, message, expected=False, cause=None):
+        super().__init__(message)
+        self.expected = expected
+        self.cause = cause
+
+
+class DownloadError(YoutubeDLError):
+    """Shaped like yt_dlp.utils.DownloadError: the original error is in exc_info."""
+
+    def __init__(self, message, exc_info=None):
+        super().__init__(message)
+        self.exc_info = exc_info
+
+
+for cls in (YoutubeDLError, ExtractorError, DownloadError):
+    cls.__module__ = 'yt_dlp.utils'
+
+
+def wrapped(error):
+    return DownloadError(f"ERROR: {error}", (type(error), error, None))
+
+
+class ClassifyTest(unittest.TestCase):
+    """Which failures RetryPolicy retries."""
+
+    def setUp(self):
+        self.policy = RetryPolicy()
+
+    def assertClass(self, error, expected):
+        self.assertEqual(self.policy.classify(error), expected, repr(error))
+
+    def test_network_errors_are_transient(self):
+        for error in (socket.timeout("timed out"), ConnectionResetError(), socket.gaierror(-3, "name"),
+                      wrapped(ExtractorError("Unable to download webpage", expected=True,
+                                             cause=ConnectionResetError()))):
+            self.assertClass(error, RetryPolicy.TRANSIENT)
+
+    def test_transient_markers(self):
+        for message in ("HTTP Error 503: Service Unavailable", "HTTP Error 429: Too Many Requests",
+                        "HTTP Error 403: Forbidden"):
+            self.assertClass(wrapped(ExtractorError(message)), RetryPolicy.TRANSIENT)
+
+    def test_expected_extractor_errors_are_permanent(self):
+        for message in ("Premieres in 3 hours", "Sign in to confirm you're not a bot"):
+            self.assertClass(wrapped(ExtractorError(message, expected=True)), RetryPolicy.PERMANENT)
+
+    def test_permanent_markers(self):
+        self.assertClass(wrapped(ExtractorError("Private video")), RetryPolicy.PERMANENT)
+        self.assertClass(DownloadCancelled(), RetryPolicy.PERMANENT)
+
+    def test_unknown_yt_dlp_errors_are_transient(self):
+        self.assertClass(wrapped(ExtractorError("something odd happened")), RetryPolicy.TRANSIENT)
+
+    def test_python_errors_are_permanent(self):
+        for error in (AttributeError("'NoneType' object has no attribute 'get'"), KeyError('url'),
+                      TypeError("bad"), wrapped(KeyError('formats'))):
+            self.assertClass(error, RetryPolicy.PERMANENT)
+
+    def test_run_does_not_retry_permanent_errors(self):
+        calls = []
+
+        def operation():
+            calls.append(1)
+            raise AttributeError("bug")
+
+        with self.assertRaises(RetryError) as raised:
+            self.policy.run(operation)
+        self.assertTrue(raised.exception.permanent)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import os
+import sys
+
+
+class AppPaths:
+    """Utility class for locating per-user application data."""
+    
+    APP_NAME = "YouTubeDownloaderPro"
+    
+    @staticmethod
+    def data_dir():
+        """Return (and create) the directory used for persistent application state."""
+        if sys.platform == "win32":
+            base = os.environ.get("APPDATA") or os.path.expanduser("~")
+        else:
+            base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+        
+        path = os.path.join(base, AppPaths.APP_NAME)
+        os.makedirs(path, exist_ok=True)
+        return path
+    
+    @staticmethod
+    def data_file(name):
+        """Return the full path of a file inside the application data directory."""
+        return os.path.join(AppPaths.data_dir(), name)
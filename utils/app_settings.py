@@ -0,0 +1,58 @@
+import json
+import os
+import threading
+from utils.app_paths import AppPaths
+
+
+class AppSettings:
+    """Small JSON-backed store for user preferences that outlive a session."""
+
+    FILE_NAME = "settings.json"
+
+    DEFAULTS = {
+        'speed_limit': None,  # e.g. "5M"; None = unlimited
+        # Time-of-day overrides, e.g. [{"start": "09:00", "end": "18:00", "limit": "5M"}]
+        'bandwidth_schedule': [],
+        'transcode_workers': 0,  # FFmpeg processes for conversions; 0 = one per CPU core
+        'ffmpeg_threads': 1,  # Threads per FFmpeg job; 0 = let FFmpeg decide
+        'detail_workers': 8,  # Playlist entries resolved in parallel for previews
+        'staging_dir': None,  # Where intermediate files live; None = hidden folder inside each target
+    }
+
+    def __init__(self, path=None):
+        self.path = path or AppPaths.data_file(self.FILE_NAME)
+        self._values = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+        return self.DEFAULTS.get(key, default)
+
+    def set(self, key, value):
+        """Store a value and write the file immediately."""
+        with self._lock:
+            self._values[key] = value
+            self._save()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                values = json.load(f)
+            if isinstance(values, dict):
+                self._values = values
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"AppSettings: Could not read {self.path}: {e}")
+
+    def _save(self):
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._values, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"AppSettings: Could not write {self.path}: {e}")
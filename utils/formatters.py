@@ -28,3 +28,29 @@ class Formatter:
             return f"{count / 1_000:.1f}K views"
         else:
             return f"{count} views"
+
+    @staticmethod
+    def format_bytes(num_bytes):
+        """Format a byte count as a human readable size."""
+        if not num_bytes:
+            return "0 B"
+        
+        size = float(num_bytes)
+        for unit in ("B", "KiB", "MiB", "GiB"):
+            if size < 1024:
+                return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+            size /= 1024
+        return f"{size:.1f} TiB"
+
+    @staticmethod
+    def format_eta(seconds):
+        """Format remaining seconds as an ETA string."""
+        if seconds is None:
+            return "--:--"
+        return Formatter.format_duration(int(seconds)) if seconds >= 1 else "0:00"
+
+    @staticmethod
+    def safe_filename(name):
+        """Make a title safe to use as a file name on Windows and POSIX."""
+        cleaned = "".join("_" if ch in '<>:"/\\|?*' or ord(ch) < 32 else ch for ch in name)
+        return cleaned.strip().rstrip(".") or "video"
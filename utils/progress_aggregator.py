@@ -0,0 +1,84 @@
+import threading
+
+
+class ProgressAggregator:
+    """Coalesces progress updates from download threads and renders them at a fixed frame rate.
+
+    Download threads call update()/remove() as often as they like; only the
+    latest state per key is kept. A Tk after() loop renders the keys that
+    changed since the last frame, so the event loop sees at most one batch
+    of widget updates per frame. Status values may be strings or zero-argument
+    callables, which are only formatted when actually rendered.
+    """
+
+    def __init__(self, widget, render_callback, fps=10):
+        self.widget = widget
+        self.render_callback = render_callback  # Called as (key, percentage, status); status None = removed
+        self.interval_ms = max(1, int(1000 / fps))
+        self._latest = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._after_id = None
+
+    @staticmethod
+    def resolve_status(status):
+        """Turn a string or deferred status callable into display text."""
+        return status() if callable(status) else status
+
+    def set_fps(self, fps):
+        """Change the render rate; takes effect from the next frame."""
+        self.interval_ms = max(1, int(1000 / fps))
+
+    def update(self, key, percentage=None, status=None):
+        """Record the latest percentage and/or status for a key (thread-safe)."""
+        with self._lock:
+            state = self._latest.get(key)
+            if state is None:
+                state = self._latest[key] = [None, None]
+            if percentage is not None:
+                state[0] = percentage
+            if status is not None:
+                state[1] = status
+            self._dirty.add(key)
+
+    def remove(self, key):
+        """Drop a key; it is rendered once more with status None (thread-safe)."""
+        with self._lock:
+            self._latest[key] = None
+            self._dirty.add(key)
+
+    def clear(self):
+        """Forget all pending state without rendering it."""
+        with self._lock:
+            self._latest.clear()
+            self._dirty.clear()
+
+    def start(self):
+        """Start the render loop on the widget's event loop."""
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.interval_ms, self._render_frame)
+
+    def stop(self):
+        """Stop the render loop."""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _render_frame(self):
+        with self._lock:
+            changed = [(key, self._latest.get(key)) for key in self._dirty]
+            self._dirty.clear()
+            for key, state in changed:
+                if state is None:
+                    self._latest.pop(key, None)
+
+        for key, state in changed:
+            try:
+                if state is None:
+                    self.render_callback(key, None, None)
+                else:
+                    self.render_callback(key, state[0], self.resolve_status(state[1]))
+            except Exception as e:
+                print(f"ProgressAggregator: Error rendering {key}: {e}")
+
+        self._after_id = self.widget.after(self.interval_ms, self._render_frame)